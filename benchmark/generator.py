@@ -0,0 +1,106 @@
+"""
+File Name: generator.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import math
+import numpy as np
+import shapely
+
+from indoorjson3 import Cell, Connection, IndoorSpace, Layer, Rlines
+
+ROOM_WIDTH = 4.0
+ROOM_DEPTH = 5.0
+CORRIDOR_DEPTH = 2.0
+FLOOR_GAP = 3.0
+
+
+def generate_building(floors: int = 1, rooms_per_floor: int = 100, closure_ratio: float = 0.1,
+                      seed: int = 0) -> IndoorSpace:
+    """Synthetic building: every floor is a corridor with a row of rooms on each side.
+
+    The corridor is split into one segment per pair of facing rooms. Each
+    room has a door, as a connection pair, to its segment, and neighbouring
+    segments connect both ways. Segment 0 is a staircase to the floor above.
+    Floors are laid out side by side in y, each is a Layer, and every segment
+    has an Rlines. ``closure_ratio`` of the in/out door pairs on a segment are
+    closed.
+    """
+    rng = np.random.default_rng(seed)
+    pairs = max(1, math.ceil(rooms_per_floor / 2))
+    floor_height = 2 * ROOM_DEPTH + CORRIDOR_DEPTH + FLOOR_GAP
+
+    # Per floor: segments 0..pairs-1, then rooms below and above the corridor.
+    column = np.tile(np.arange(pairs), 3)
+    row = np.repeat(np.arange(3), pairs)
+    floor = np.repeat(np.arange(floors), 3 * pairs)
+    column, row = np.tile(column, floors), np.tile(row, floors)
+    x0 = column * ROOM_WIDTH
+    base = floor * floor_height
+    y0 = base + np.choose(row, [ROOM_DEPTH, 0.0, ROOM_DEPTH + CORRIDOR_DEPTH])
+    y1 = y0 + np.choose(row, [CORRIDOR_DEPTH, ROOM_DEPTH, ROOM_DEPTH])
+    spaces = shapely.box(x0, y0, x0 + ROOM_WIDTH, y1)
+    centers = np.column_stack((x0 + ROOM_WIDTH / 2, (y0 + y1) / 2))
+    nodes = shapely.points(centers)
+    ids = [f'f{f}-{"s" if r == 0 else "r"}{c if r < 2 else c + pairs}'
+           for f, r, c in zip(floor.tolist(), row.tolist(), column.tolist())]
+    kinds = ['corridor' if r == 0 else 'room' for r in row.tolist()]
+    cells = [Cell(cell_id, {'type': kind, 'floor': f}, space, node)
+             for cell_id, kind, f, space, node in zip(ids, kinds, floor.tolist(), spaces, nodes)]
+
+    # Undirected links as (a, b, bound endpoints); each becomes two connections.
+    links = []
+    for f in range(floors):
+        start = f * 3 * pairs
+        for c in range(pairs):
+            segment = start + c
+            x = c * ROOM_WIDTH + ROOM_WIDTH / 2
+            wall = f * floor_height + ROOM_DEPTH
+            links.append((start + pairs + c, segment, (x - 0.5, wall, x + 0.5, wall)))
+            wall += CORRIDOR_DEPTH
+            links.append((start + 2 * pairs + c, segment, (x - 0.5, wall, x + 0.5, wall)))
+            if c + 1 < pairs:
+                x = (c + 1) * ROOM_WIDTH
+                links.append((segment, segment + 1, (x, wall - CORRIDOR_DEPTH, x, wall)))
+        if f + 1 < floors:
+            y = (f + 1) * floor_height - FLOOR_GAP / 2
+            links.append((start, start + 3 * pairs, (0.0, y, ROOM_WIDTH / 2, y)))
+    a = np.array([link[0] for link in links] + [link[1] for link in links])
+    b = np.array([link[1] for link in links] + [link[0] for link in links])
+    bound_coordinates = np.array([link[2] for link in links] * 2).reshape(-1, 2, 2)
+    bounds = shapely.linestrings(bound_coordinates)
+    edges = shapely.linestrings(np.stack((centers[a], centers[b]), axis=1))
+    connections = [Connection(f'{ids[s]}>{ids[t]}', {'type': 'door'}, ids[s], ids[t], bound, edge)
+                   for s, t, bound, edge in zip(a.tolist(), b.tolist(), bounds, edges)]
+
+    ins = {}
+    outs = {}
+    for connection in connections:
+        ins.setdefault(connection.target, []).append(connection.id)
+        outs.setdefault(connection.source, []).append(connection.id)
+    rlineses = []
+    for cell_id, kind in zip(ids, kinds):
+        if kind != 'corridor':
+            continue
+        pairs_in_out = [[i, o] for i in ins.get(cell_id, []) for o in outs.get(cell_id, [])
+                        if i.split('>')[0] != o.split('>')[1]]
+        closed = rng.random(len(pairs_in_out)) < closure_ratio
+        rlineses.append(Rlines(f'rlines-{cell_id}', cell_id, ins.get(cell_id, []), outs.get(cell_id, []),
+                               [pair for pair, close in zip(pairs_in_out, closed.tolist()) if close]))
+
+    layers = [Layer(f'floor-{f}', ids[f * 3 * pairs:(f + 1) * 3 * pairs]) for f in range(floors)]
+    return IndoorSpace.from_features({'name': 'synthetic', 'floors': floors}, cells, connections, layers, rlineses)
+
+
+def generate_cells(cell_count: int, rooms_per_floor: int = 200, closure_ratio: float = 0.1,
+                   seed: int = 0) -> IndoorSpace:
+    """Synthetic building with about ``cell_count`` cells, adding floors of ``rooms_per_floor`` rooms."""
+    cells_per_floor = 3 * max(1, math.ceil(rooms_per_floor / 2))
+    floors = max(1, round(cell_count / cells_per_floor))
+    if floors == 1:
+        rooms_per_floor = max(2, 2 * round(cell_count / 3))
+    return generate_building(floors, rooms_per_floor, closure_ratio, seed)
@@ -0,0 +1,50 @@
+"""
+File Name: ingest.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import time
+from shapely.geometry import Point, LineString, Polygon
+
+from indoorjson3 import Cell, Connection, IndoorSpace
+
+
+def build_corridor(cell_count: int):
+    cells = []
+    connections = []
+    for i in range(cell_count):
+        space = Polygon([(i, 0), (i + 1, 0), (i + 1, 1), (i, 1), (i, 0)])
+        cells.append(Cell(f'c{i}', {}, space, Point(i + 0.5, 0.5)))
+    for i in range(cell_count - 1):
+        bound = LineString([(i + 1, 0), (i + 1, 1)])
+        edge = LineString([(i + 0.5, 0.5), (i + 1.5, 0.5)])
+        connections.append(Connection(f'conn{i}-{i + 1}', {}, f'c{i}', f'c{i + 1}', bound, edge))
+        connections.append(Connection(f'conn{i + 1}-{i}', {}, f'c{i + 1}', f'c{i}', bound, edge))
+    return cells, connections
+
+
+def time_ingest(cell_count: int) -> float:
+    cells, connections = build_corridor(cell_count)
+    start = time.perf_counter()
+    indoor_space = IndoorSpace()
+    for cell in cells:
+        indoor_space.add_cell(cell)
+    for connection in connections:
+        indoor_space.add_connection(connection)
+    for connection in connections:
+        indoor_space.get_connection_from_id(connection.id)
+        indoor_space.get_cell_from_id(connection.source)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+
+    print(f"{'cells':>10} {'connections':>12} {'seconds':>10} {'us/item':>10}")
+    for cell_count in (1000, 2000, 4000, 8000, 16000, 32000, 64000):
+        elapsed = time_ingest(cell_count)
+        items = cell_count + 2 * (cell_count - 1)
+        print(f"{cell_count:>10} {2 * (cell_count - 1):>12} {elapsed:>10.4f} {elapsed / items * 1e6:>10.3f}")
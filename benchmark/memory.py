@@ -0,0 +1,67 @@
+"""
+File Name: memory.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import gc
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+from indoorjson3 import IndoorSpace, deserialization, serialization
+from benchmark.ingest import build_corridor
+
+
+def write_building(filepath: str, cell_count: int):
+    cells, connections = build_corridor(cell_count)
+    indoor_space = IndoorSpace()
+    for cell in cells:
+        indoor_space.add_cell(cell)
+    for connection in connections:
+        indoor_space.add_connection(connection)
+    serialization(filepath, indoor_space)
+
+
+def resident_bytes() -> int:
+    # GEOS allocates geometries outside the Python allocator, so measure RSS rather than tracemalloc.
+    with open('/proc/self/statm') as file:
+        return int(file.read().split()[1]) * resource.getpagesize()
+
+
+def measure(filepath: str, lazy: bool, queue):
+    gc.collect()
+    before = resident_bytes()
+    start = time.perf_counter()
+    indoor_space = deserialization(filepath, lazy=lazy)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained = resident_bytes() - before
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 - before
+    queue.put((elapsed, retained, peak, len(indoor_space.cells)))
+
+
+if __name__ == "__main__":
+
+    cell_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = os.path.join(directory, 'building.json')
+        write_building(filepath, cell_count)
+        print(f"synthetic building: {cell_count} cells, {os.path.getsize(filepath) / 1e6:.1f} MB on disk")
+        print(f"{'mode':>6} {'seconds':>9} {'retained MB':>12} {'peak MB':>9} {'B/cell':>8}")
+        for lazy in (False, True):
+            # Each mode runs in a fresh process so RSS is not polluted by the previous run.
+            queue = context.Queue()
+            process = context.Process(target=measure, args=(filepath, lazy, queue))
+            process.start()
+            elapsed, retained, peak, _ = queue.get()
+            process.join()
+            print(f"{'lazy' if lazy else 'eager':>6} {elapsed:>9.3f} {retained / 1e6:>12.1f} {peak / 1e6:>9.1f} "
+                  f"{retained / cell_count:>8.0f}")
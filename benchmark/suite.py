@@ -0,0 +1,188 @@
+"""
+File Name: suite.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import shapely
+from typing import Callable, Dict, List, Optional, Tuple
+
+from indoorjson3 import (IndoorSpace, deserialization, dump_snapshot, graph_figure, hypergraph_figure,
+                         load_snapshot, serialization)
+
+from benchmark.generator import generate_cells
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+
+def _fresh(space: IndoorSpace) -> IndoorSpace:
+    return IndoorSpace.from_features(space.properties, space.cells, space.connections, space.layers, space.rlineses)
+
+
+def _routed(space: IndoorSpace) -> IndoorSpace:
+    space = _fresh(space)
+    space.get_routing_graph()
+    return space
+
+
+def _add_features(space: IndoorSpace):
+    built = IndoorSpace()
+    for cell in space.cells:
+        built.add_cell(cell)
+    for connection in space.connections:
+        built.add_connection(connection)
+
+
+def _shortest_paths(space: IndoorSpace):
+    ids = [space.cells[i].id for i in np.random.default_rng(0).integers(len(space.cells), size=20).tolist()]
+    for source, target in zip(ids[::2], ids[1::2]):
+        space.shortest_path(source, target)
+
+
+def _locate(space: IndoorSpace):
+    bounds = space.get_cell_bounds()
+    points = (bounds[:, :2] + bounds[:, 2:]) / 2
+    space.locate_cells(points[::max(1, len(points) // 10000)])
+
+
+# Each case maps a prepared input to a setup (run untimed) and the timed call.
+# Setups return the argument of the timed call; ``max_cells`` skips sizes a case is too slow for.
+CASES: Dict[str, Tuple[Callable, Callable, Optional[int]]] = {
+    'add_cell/add_connection': (lambda ctx: ctx['space'], _add_features, None),
+    'get_incident_matrix': (lambda ctx: _fresh(ctx['space']), lambda space: space.get_incident_matrix(), None),
+    'get_hypergraph': (lambda ctx: _fresh(ctx['space']), lambda space: space.get_hypergraph(), None),
+    'get_routing_graph': (lambda ctx: _fresh(ctx['space']), lambda space: space.get_routing_graph(), None),
+    'shortest_path': (lambda ctx: _routed(ctx['space']), _shortest_paths, None),
+    'locate_cells': (lambda ctx: _fresh(ctx['space']), _locate, None),
+    'serialization': (lambda ctx: ctx, lambda ctx: serialization(ctx['scratch'], ctx['space']), None),
+    'serialization.binary': (lambda ctx: ctx, lambda ctx: serialization(ctx['scratch'] + '.ij3b', ctx['space']),
+                             None),
+    'deserialization': (lambda ctx: ctx['json'], deserialization, None),
+    'deserialization.streaming': (lambda ctx: ctx['json'], lambda path: deserialization(path, streaming=True),
+                                  None),
+    'deserialization.lazy': (lambda ctx: ctx['json'], lambda path: deserialization(path, lazy=True), None),
+    'deserialization.binary': (lambda ctx: ctx['binary'], deserialization, None),
+    'load_snapshot': (lambda ctx: ctx['snapshot'], load_snapshot, None),
+    'graph_figure': (lambda ctx: ctx['space'], graph_figure, 200000),
+    'hypergraph_figure': (lambda ctx: _fresh(ctx['space']), hypergraph_figure, 200000),
+}
+
+
+def resident_bytes() -> int:
+    with open('/proc/self/statm') as file:
+        return int(file.read().split()[1]) * resource.getpagesize()
+
+
+def measure(setup: Callable, call: Callable, ctx: Dict, repeat: int) -> Dict:
+    """Best wall time over ``repeat`` runs, then one traced run for peak Python memory and RSS growth.
+
+    GEOS allocates outside the Python allocator, so the RSS growth is reported next to the tracemalloc peak.
+    """
+    times = []
+    for _ in range(repeat):
+        argument = setup(ctx)
+        gc.collect()
+        start = time.perf_counter()
+        call(argument)
+        times.append(time.perf_counter() - start)
+    argument = setup(ctx)
+    gc.collect()
+    before = resident_bytes()
+    tracemalloc.start()
+    call(argument)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'seconds': min(times), 'mean_seconds': sum(times) / len(times), 'repeat': repeat,
+            'peak_python_bytes': peak, 'rss_growth_bytes': max(0, resident_bytes() - before)}
+
+
+def run(sizes=DEFAULT_SIZES, cases: Optional[List[str]] = None, repeat: int = 3, log=print) -> Dict:
+    selected = list(CASES) if not cases else cases
+    unknown = set(selected) - set(CASES)
+    if unknown:
+        raise ValueError(f'Unknown benchmark cases: {sorted(unknown)}')
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            space = generate_cells(size)
+            ctx = {'space': space, 'scratch': os.path.join(directory, 'scratch.json'),
+                   'json': os.path.join(directory, f'{size}.json'),
+                   'binary': os.path.join(directory, f'{size}.ij3b'),
+                   'snapshot': os.path.join(directory, f'{size}.ij3s')}
+            serialization(ctx['json'], space)
+            serialization(ctx['binary'], space)
+            dump_snapshot(ctx['snapshot'], space)
+            for name in selected:
+                setup, call, max_cells = CASES[name]
+                record = {'case': name, 'cells': len(space.cells), 'connections': len(space.connections)}
+                if max_cells is not None and len(space.cells) > max_cells:
+                    record['skipped'] = True
+                else:
+                    record.update(measure(setup, call, ctx, repeat))
+                    log(f"{name:>28} {len(space.cells):>9} {record['seconds']:>10.4f}s "
+                        f"{record['peak_python_bytes'] / 1e6:>9.1f}MB {record['rss_growth_bytes'] / 1e6:>9.1f}MB")
+                results.append(record)
+    return {'environment': environment(), 'results': results}
+
+
+def environment() -> Dict:
+    return {'python': sys.version.split()[0], 'platform': platform.platform(), 'numpy': np.__version__,
+            'shapely': shapely.__version__, 'cpus': os.cpu_count(),
+            'date': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds')}
+
+
+def compare(current: Dict, baseline: Dict, threshold: float = 1.2) -> List[Dict]:
+    """Time ratios against a baseline run for every case and size both measured; ``regression`` above ``threshold``."""
+    previous = {(r['case'], r['cells']): r for r in baseline['results'] if not r.get('skipped')}
+    rows = []
+    for record in current['results']:
+        old = previous.get((record['case'], record['cells']))
+        if old is None or record.get('skipped'):
+            continue
+        ratio = record['seconds'] / old['seconds'] if old['seconds'] else float('inf')
+        rows.append({'case': record['case'], 'cells': record['cells'], 'baseline_seconds': old['seconds'],
+                     'seconds': record['seconds'], 'ratio': ratio, 'regression': ratio > threshold})
+    return rows
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description='Time and measure memory of the indoorjson3 hot paths.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help='approximate cell counts of the synthetic buildings, up to 1000000')
+    parser.add_argument('--cases', nargs='+', choices=sorted(CASES), help='cases to run, all by default')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default='benchmark-results.json')
+    parser.add_argument('--baseline', help='earlier results file to compare against')
+    parser.add_argument('--threshold', type=float, default=1.2, help='slowdown ratio reported as a regression')
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.cases, args.repeat)
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+    print(f"results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            rows = compare(report, json.load(file), args.threshold)
+        print(f"{'case':>28} {'cells':>9} {'baseline':>10} {'current':>10} {'ratio':>7}")
+        for row in rows:
+            print(f"{row['case']:>28} {row['cells']:>9} {row['baseline_seconds']:>10.4f} {row['seconds']:>10.4f} "
+                  f"{row['ratio']:>7.2f}{'  REGRESSION' if row['regression'] else ''}")
+        if any(row['regression'] for row in rows):
+            sys.exit(1)
@@ -1,7 +1,19 @@
+from .aio import *
+from .binary import *
+from .bulk import *
 from .cell import *
 from .connection import *
+from .geometry import *
+from .incidence import *
 from .indoorspace import *
+from .instrumentation import *
+from .landmarks import *
 from .layer import *
 from .rlines import *
+from .routing import *
 from .serialization import *
+from .snapshot import *
+from .spatial import *
+from .tiles import *
+from .view import *
 from .visualization import *
\ No newline at end of file
@@ -0,0 +1,147 @@
+"""
+File Name: aio.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import asyncio
+import gzip
+import io
+import os
+import time
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Iterable, Optional, Union
+
+from indoorjson3.binary import BINARY_MAGIC, BINARY_SUFFIX, dump_binary, load_binary
+from indoorjson3.bulk import LoadResult, adopt_sections, building_files
+from indoorjson3.indoorspace import IndoorSpace, registered_sections
+from indoorjson3.landmarks import LandmarkIndex, landmark_path
+from indoorjson3.serialization import serialization
+
+_GZIP_MAGIC = b'\x1f\x8b'
+
+
+async def async_serialization(filepath: Union[str, os.PathLike], indoorspace: IndoorSpace, indent: Optional[int] = 4,
+                              fmt: Optional[str] = None, executor: Optional[Executor] = None):
+    """Write ``indoorspace`` like ``serialization`` without blocking the event loop.
+
+    The file is streamed on ``executor`` (the loop's default thread pool when
+    None) into a temporary file next to ``filepath``, which then replaces it
+    in one step. Memory stays bounded as in ``serialization``, and a failed
+    or cancelled call leaves no partial file behind. Do not modify
+    ``indoorspace`` until the call returns.
+    """
+    loop = asyncio.get_running_loop()
+    filepath = os.fspath(filepath)
+    if fmt is None:
+        fmt = 'binary' if filepath.endswith(BINARY_SUFFIX) else 'json'
+    directory, name = os.path.split(os.path.abspath(filepath))
+    # Keeping the target's name as the suffix keeps its .gz compression.
+    temporary = os.path.join(directory, f'.{uuid.uuid4().hex}.{name}')
+    future = loop.run_in_executor(executor, _serialize_to, temporary, indoorspace, indent, fmt)
+    try:
+        # A running write cannot be interrupted, so on cancellation its file is removed once it finishes.
+        await asyncio.shield(future)
+    except asyncio.CancelledError:
+        future.add_done_callback(lambda _: _discard(temporary))
+        raise
+    try:
+        os.replace(temporary, filepath)
+    except BaseException:
+        _discard(temporary)
+        raise
+
+
+async def async_deserialization(filepath: Union[str, os.PathLike], lazy: bool = False, landmarks: bool = False,
+                                executor: Optional[Executor] = None, strict: bool = False,
+                                trusted: bool = False) -> IndoorSpace:
+    """Read an IndoorJSON file like ``deserialization`` without blocking the event loop.
+
+    The file is read on the default thread pool and parsed on ``executor``.
+    With a ProcessPoolExecutor the worker sends the building back as a binary
+    container, which is decoded on the thread pool. Cancellation takes effect
+    between these steps; a step already running finishes and its result is
+    dropped.
+    """
+    loop = asyncio.get_running_loop()
+    filepath = os.fspath(filepath)
+    data = await loop.run_in_executor(None, _read_bytes, filepath)
+    if isinstance(executor, ProcessPoolExecutor):
+        container = await loop.run_in_executor(executor, _container_from_bytes, data, registered_sections(),
+                                               strict, trusted)
+        indoorspace = await loop.run_in_executor(None, _parse_bytes, container, lazy, strict, trusted)
+    else:
+        indoorspace = await loop.run_in_executor(executor, _parse_bytes, data, lazy, strict, trusted)
+    if landmarks and os.path.exists(landmark_path(filepath)):
+        indoorspace.set_landmark_index(await loop.run_in_executor(None, LandmarkIndex.load, landmark_path(filepath)))
+    return indoorspace
+
+
+async def async_load_buildings(paths: Union[str, os.PathLike, Iterable[str]], concurrency: int = 8, lazy: bool = False,
+                               executor: Optional[Executor] = None, strict: bool = False,
+                               trusted: bool = False) -> Dict[str, LoadResult]:
+    """Load many files concurrently, at most ``concurrency`` at a time, keyed by path in input order.
+
+    Errors are recorded per file as in ``load_buildings``; cancelling the call
+    cancels every load still pending.
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = building_files(os.fspath(paths))
+    paths = list(paths)
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def load(path: str) -> LoadResult:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                indoorspace = await async_deserialization(path, lazy=lazy, executor=executor, strict=strict,
+                                                          trusted=trusted)
+            except Exception as error:
+                return LoadResult(path, error=f'{type(error).__name__}: {error}',
+                                  parse_seconds=time.perf_counter() - start)
+            return LoadResult(path, indoorspace, parse_seconds=time.perf_counter() - start)
+
+    results = await asyncio.gather(*(load(path) for path in paths))
+    return dict(zip(paths, results))
+
+
+def _serialize_to(filepath: str, indoorspace: IndoorSpace, indent: Optional[int], fmt: str):
+    try:
+        serialization(filepath, indoorspace, indent, fmt)
+    except BaseException:
+        _discard(filepath)
+        raise
+
+
+def _discard(filepath: str):
+    try:
+        os.remove(filepath)
+    except FileNotFoundError:
+        pass
+
+
+def _read_bytes(filepath: str) -> bytes:
+    with open(filepath, 'rb') as file:
+        return file.read()
+
+
+def _parse_bytes(data: bytes, lazy: bool = False, strict: bool = False, trusted: bool = False) -> IndoorSpace:
+    if data.startswith(BINARY_MAGIC):
+        return load_binary(data, lazy=lazy, strict=strict, trusted=trusted)
+    if data.startswith(_GZIP_MAGIC):
+        data = gzip.decompress(data)
+    return IndoorSpace.from_json(data.decode('utf-8'), lazy=lazy, strict=strict, trusted=trusted)
+
+
+def _container_from_bytes(data: bytes, sections: Dict[str, type], strict: bool = False,
+                          trusted: bool = False) -> bytes:
+    adopt_sections(sections)
+    if data.startswith(BINARY_MAGIC):
+        return data
+    buffer = io.BytesIO()
+    dump_binary(buffer, _parse_bytes(data, strict=strict, trusted=trusted))
+    return buffer.getvalue()
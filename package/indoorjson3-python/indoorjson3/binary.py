@@ -0,0 +1,236 @@
+"""
+File Name: binary.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import json
+import os
+import struct
+import numpy as np
+import shapely
+from typing import BinaryIO, Dict, List, Tuple, Union
+
+from indoorjson3.cell import Cell
+from indoorjson3.connection import Connection
+from indoorjson3.indoorspace import FEATURE_TYPES, IndoorSpace
+from indoorjson3.instrumentation import timed_stage
+from indoorjson3.layer import Layer
+from indoorjson3.rlines import Rlines
+
+BINARY_MAGIC = b'IJ3B'
+BINARY_VERSION = 1
+BINARY_SUFFIX = '.ij3b'
+
+# Fixed header: magic, version, table-of-contents length. The JSON table of
+# contents follows, then every section as a raw little-endian array aligned
+# to 8 bytes so it can be viewed in place with np.frombuffer.
+_HEADER = struct.Struct('<4sIQ')
+_ALIGNMENT = 8
+
+
+def is_binary(filepath: Union[str, os.PathLike]) -> bool:
+    with open(filepath, 'rb') as file:
+        return file.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+
+def dump_binary(filepath: Union[str, os.PathLike, BinaryIO], indoorspace: IndoorSpace):
+    with timed_stage('binary.encode', len(indoorspace.cells) + len(indoorspace.connections)):
+        sections = encode_sections(indoorspace)
+    if isinstance(filepath, (str, os.PathLike)):
+        with open(filepath, 'wb') as file:
+            write_container(file, sections)
+    else:
+        write_container(filepath, sections)
+
+
+def load_binary(filepath: Union[str, os.PathLike, bytes, BinaryIO], lazy: bool = False,
+                strict: bool = False, trusted: bool = False) -> IndoorSpace:
+    if isinstance(filepath, (str, os.PathLike)):
+        with open(filepath, 'rb') as file:
+            buffer = file.read()
+    elif isinstance(filepath, (bytes, bytearray, memoryview)):
+        buffer = filepath
+    else:
+        buffer = filepath.read()
+    with timed_stage('binary.decode', len(buffer), lazy=lazy):
+        return decode_sections(read_container(buffer), lazy, strict, trusted)
+
+
+def write_container(file: BinaryIO, sections: Dict[str, np.ndarray], magic: bytes = BINARY_MAGIC):
+    toc = {}
+    offset = 0
+    for name, array in sections.items():
+        toc[name] = [offset, array.dtype.str, len(array)]
+        offset += _aligned(array.nbytes)
+    toc_bytes = json.dumps(toc, separators=(',', ':')).encode('utf-8')
+    file.write(_HEADER.pack(magic, BINARY_VERSION, len(toc_bytes)))
+    file.write(toc_bytes)
+    file.write(b'\0' * (_data_start(len(toc_bytes)) - _HEADER.size - len(toc_bytes)))
+    for array in sections.values():
+        file.write(np.ascontiguousarray(array).tobytes())
+        file.write(b'\0' * (_aligned(array.nbytes) - array.nbytes))
+
+
+def read_container(buffer, magic: bytes = BINARY_MAGIC) -> Dict[str, np.ndarray]:
+    found, version, toc_length = _HEADER.unpack_from(buffer, 0)
+    if found != magic:
+        raise ValueError('Not a binary IndoorJSON file')
+    if version > BINARY_VERSION:
+        raise ValueError(f'Unsupported binary IndoorJSON version {version}')
+    toc = json.loads(bytes(buffer[_HEADER.size:_HEADER.size + toc_length]))
+    start = _data_start(toc_length)
+    return {name: np.frombuffer(buffer, dtype=np.dtype(dtype), count=count, offset=start + offset)
+            for name, (offset, dtype, count) in toc.items()}
+
+
+def pack_blobs(blobs: List[bytes]) -> Tuple[np.ndarray, np.ndarray]:
+    offsets = np.zeros(len(blobs) + 1, dtype=np.int64)
+    np.cumsum([len(blob) for blob in blobs], out=offsets[1:])
+    return offsets, np.frombuffer(b''.join(blobs), dtype=np.uint8)
+
+
+def unpack_blobs(offsets: np.ndarray, data: np.ndarray) -> List[bytes]:
+    data = data.tobytes()
+    bounds = offsets.tolist()
+    return [data[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def unpack_strings(offsets: np.ndarray, data: np.ndarray) -> List[str]:
+    data = data.tobytes()
+    if not data.isascii():
+        return [blob.decode('utf-8') for blob in unpack_blobs(offsets, np.frombuffer(data, dtype=np.uint8))]
+    # One character per byte, so the byte offsets slice the decoded text directly.
+    text = data.decode('ascii')
+    bounds = offsets.tolist()
+    return [text[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def _aligned(size: int) -> int:
+    return (size + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def _data_start(toc_length: int) -> int:
+    return _aligned(_HEADER.size + toc_length)
+
+
+def _json_bytes(value) -> np.ndarray:
+    return np.frombuffer(json.dumps(value, ensure_ascii=False).encode('utf-8'), dtype=np.uint8)
+
+
+def _encode_records(records: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+    # Each record is followed by a comma so the whole column decodes with a single json.loads.
+    return pack_blobs([json.dumps(record, ensure_ascii=False).encode('utf-8') + b',' for record in records])
+
+
+def _decode_records(offsets: np.ndarray, data: np.ndarray) -> List[Dict]:
+    if len(offsets) <= 1:
+        return []
+    return json.loads(b'[' + data.tobytes()[:-1] + b']')
+
+
+def encode_sections(indoorspace: IndoorSpace) -> Dict[str, np.ndarray]:
+    strings: Dict[str, int] = {}
+
+    def intern(values) -> np.ndarray:
+        return np.fromiter((strings.setdefault(value, len(strings)) for value in values), dtype=np.int32)
+
+    cells = indoorspace.cells
+    connections = indoorspace.connections
+    sections = {
+        'properties': _json_bytes(indoorspace.properties),
+        'cells.id': intern(cell.id for cell in cells),
+        'connections.id': intern(connection.id for connection in connections),
+        'connections.fr': intern(connection.source for connection in connections),
+        'connections.to': intern(connection.target for connection in connections),
+    }
+    for prefix, features, fields in (('cells', cells, ('space', 'node')),
+                                     ('connections', connections, ('bound', 'edge'))):
+        offsets, data = _encode_records([feature.properties for feature in features])
+        sections[f'{prefix}.properties.offsets'] = offsets
+        sections[f'{prefix}.properties.data'] = data
+        for field in fields:
+            geometries = np.array([getattr(feature, field) for feature in features], dtype=object)
+            offsets, data = pack_blobs(list(shapely.to_wkb(geometries)))
+            sections[f'{prefix}.{field}.offsets'] = offsets
+            sections[f'{prefix}.{field}.data'] = data
+    sections['layers'] = _json_bytes([layer.to_json() for layer in indoorspace.layers])
+    sections['rlineses'] = _json_bytes([rlines.to_json() for rlines in indoorspace.rlineses])
+    if indoorspace.extensions:
+        sections['extensions'] = _json_bytes({key: [feature.to_json() for feature in features]
+                                              for key, features in indoorspace.extensions.items()})
+    sections['strings.offsets'], sections['strings.data'] = pack_blobs([value.encode('utf-8') for value in strings])
+    return sections
+
+
+def decode_sections(sections: Dict[str, np.ndarray], lazy: bool = False, strict: bool = False,
+                    trusted: bool = False) -> IndoorSpace:
+    """Build an IndoorSpace from container sections.
+
+    Ids and endpoints come from the string table and geometries from WKB, so
+    only the property records need checking, once per column; ``trusted=True``
+    skips that too. Features are then created without per-object checks, and
+    connections are linked to their cells from the endpoint columns in bulk.
+    """
+    strings = unpack_strings(sections['strings.offsets'], sections['strings.data'])
+
+    def column(name: str) -> List:
+        return [strings[i] for i in sections[name].tolist()]
+
+    def geometries(name: str) -> List:
+        blobs = unpack_blobs(sections[f'{name}.offsets'], sections[f'{name}.data'])
+        if lazy:
+            return blobs
+        return list(shapely.from_wkb(np.array(blobs, dtype=object)))
+
+    def records(prefix: str) -> List[Dict]:
+        values = _decode_records(sections[f'{prefix}.properties.offsets'], sections[f'{prefix}.properties.data'])
+        if not trusted and not all(isinstance(value, dict) for value in values):
+            raise TypeError('properties must be a dictionary')
+        return values
+
+    connection_ids, sources, targets = column('connections.id'), column('connections.fr'), column('connections.to')
+    indoorspace = IndoorSpace.from_features(
+        json.loads(sections['properties'].tobytes()),
+        [Cell.from_raw(*fields) for fields in zip(column('cells.id'), records('cells'),
+                                                  geometries('cells.space'), geometries('cells.node'))],
+        [Connection.from_raw(*fields) for fields in zip(connection_ids, records('connections'), sources, targets,
+                                                        geometries('connections.bound'),
+                                                        geometries('connections.edge'))],
+        Layer.from_json_batch(json.loads(sections['layers'].tobytes()), lazy, trusted),
+        Rlines.from_json_batch(json.loads(sections['rlineses'].tobytes()), lazy, trusted),
+        links=_link(connection_ids, sources, targets))
+    for key, features in decode_extensions(sections, lazy, strict, trusted).items():
+        indoorspace.get_section(key).extend(features)
+    return indoorspace
+
+
+def _link(connection_ids: List[str], sources: List[str], targets: List[str]) -> Tuple[Dict, Dict]:
+    """Incoming and outgoing connection ids per cell id, as IndoorSpace would link them one by one."""
+    ins: Dict[str, List[str]] = {}
+    outs: Dict[str, List[str]] = {}
+    for connection_id, source, target in zip(connection_ids, sources, targets):
+        ins.setdefault(target, []).append(connection_id)
+        if source != target:
+            outs.setdefault(source, []).append(connection_id)
+    return ins, outs
+
+
+def decode_extensions(sections: Dict[str, np.ndarray], lazy: bool = False, strict: bool = False,
+                      trusted: bool = False) -> Dict[str, List]:
+    """Features of the registered extension sections in a container.
+
+    Unregistered sections are skipped, or rejected with ``strict=True``, as in ``IndoorSpace.from_json``.
+    """
+    if 'extensions' not in sections:
+        return {}
+    extensions = {}
+    for key, items in json.loads(sections['extensions'].tobytes()).items():
+        if key in FEATURE_TYPES:
+            extensions[key] = FEATURE_TYPES[key].from_json_batch(items, lazy, trusted)
+        elif strict:
+            raise ValueError(f'Unknown IndoorJSON section: {key}')
+    return extensions
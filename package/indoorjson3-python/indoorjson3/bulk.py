@@ -0,0 +1,169 @@
+"""
+File Name: bulk.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from indoorjson3.binary import BINARY_SUFFIX, dump_binary, is_binary, load_binary
+from indoorjson3.indoorspace import FEATURE_TYPES, IndoorSpace, registered_sections
+from indoorjson3.serialization import deserialization
+
+BUILDING_SUFFIXES = ('.json', '.json.gz', BINARY_SUFFIX)
+
+
+class LoadResult:
+    """Outcome of loading one file: the IndoorSpace, or the error that stopped it, and how long it took.
+
+    A result may hold the worker's binary container instead of the
+    IndoorSpace; it is decoded in the calling process on first access of
+    ``indoorspace``.
+    """
+
+    __slots__ = ('__path', '__indoorspace', '__error', '__parse_seconds', '__decode_seconds', '__payload', '__lazy')
+
+    def __init__(self, path: str, indoorspace: Optional[IndoorSpace] = None, error: Optional[str] = None,
+                 parse_seconds: float = 0.0, decode_seconds: float = 0.0, payload: Optional[bytes] = None,
+                 lazy: bool = False):
+        self.__path: str = path
+        self.__indoorspace: Optional[IndoorSpace] = indoorspace
+        self.__error: Optional[str] = error
+        self.__parse_seconds: float = parse_seconds
+        self.__decode_seconds: float = decode_seconds
+        self.__payload: Optional[bytes] = payload
+        self.__lazy: bool = lazy
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    @property
+    def indoorspace(self) -> Optional[IndoorSpace]:
+        if self.__payload is not None:
+            start = time.perf_counter()
+            # The worker already decoded this container once, so the checks are not repeated.
+            self.__indoorspace = load_binary(self.__payload, lazy=self.__lazy, trusted=True)
+            self.__payload = None
+            self.__decode_seconds += time.perf_counter() - start
+        return self.__indoorspace
+
+    @property
+    def error(self) -> Optional[str]:
+        return self.__error
+
+    @property
+    def ok(self) -> bool:
+        return self.__error is None
+
+    @property
+    def decoded(self) -> bool:
+        """False while the IndoorSpace is still held as the worker's binary container."""
+        return self.__payload is None
+
+    @property
+    def parse_seconds(self) -> float:
+        """Time spent reading, parsing and checking the file, in the worker process."""
+        return self.__parse_seconds
+
+    @property
+    def decode_seconds(self) -> float:
+        """Time spent rebuilding the IndoorSpace from the worker's output, in the calling process."""
+        return self.__decode_seconds
+
+    @property
+    def seconds(self) -> float:
+        return self.__parse_seconds + self.__decode_seconds
+
+
+def building_files(directory: str, suffixes: Iterable[str] = BUILDING_SUFFIXES) -> List[str]:
+    """IndoorJSON files directly inside ``directory``, sorted by name."""
+    suffixes = tuple(suffixes)
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                  if name.endswith(suffixes) and os.path.isfile(os.path.join(directory, name)))
+
+
+def load_buildings(paths: Union[str, os.PathLike, Iterable[str]], processes: Optional[int] = None,
+                   lazy: bool = False, streaming: bool = False, strict: bool = False, trusted: bool = False,
+                   defer: bool = True) -> Dict[str, LoadResult]:
+    """Deserialize many IndoorJSON files in parallel, keyed by path in input order.
+
+    ``paths`` is a list of files or a directory to scan. ``lazy``,
+    ``streaming``, ``strict`` and ``trusted`` are as in ``deserialization``.
+    Workers parse and check each file and hand it back as a binary container,
+    which decodes faster than the JSON text and far faster than unpickling
+    the objects. That decode is the only serial step, so by default
+    (``defer=True``) each result runs it on first access of
+    ``LoadResult.indoorspace`` rather than before this call returns. A file
+    that fails to load records its error and does not stop the others.
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = building_files(os.fspath(paths))
+    paths = list(paths)
+    results: Dict[str, LoadResult] = {}
+    processes = processes or os.cpu_count() or 1
+
+    if processes == 1 or len(paths) < 2:
+        for path in paths:
+            start = time.perf_counter()
+            try:
+                indoorspace = deserialization(path, streaming=streaming, lazy=lazy, strict=strict, trusted=trusted)
+            except Exception as error:
+                results[path] = LoadResult(path, error=_describe(error), parse_seconds=time.perf_counter() - start)
+            else:
+                results[path] = LoadResult(path, indoorspace, parse_seconds=time.perf_counter() - start)
+        return results
+
+    with ProcessPoolExecutor(min(processes, len(paths))) as executor:
+        sections = registered_sections()
+        futures = [(path, executor.submit(_load_payload, path, lazy, streaming, strict, trusted, sections))
+                   for path in paths]
+        for path, future in futures:
+            try:
+                payload, error, parse_seconds = future.result()
+            except Exception as failure:
+                results[path] = LoadResult(path, error=_describe(failure))
+                continue
+            if error is not None:
+                results[path] = LoadResult(path, error=error, parse_seconds=parse_seconds)
+                continue
+            result = results[path] = LoadResult(path, parse_seconds=parse_seconds, payload=payload, lazy=lazy)
+            if not defer:
+                result.indoorspace  # decoded now rather than on first use
+    return results
+
+
+def _load_payload(path: str, lazy: bool, streaming: bool, strict: bool, trusted: bool,
+                  sections: Dict[str, type]) -> Tuple[Optional[bytes], Optional[str], float]:
+    start = time.perf_counter()
+    adopt_sections(sections)
+    try:
+        if is_binary(path):
+            with open(path, 'rb') as file:
+                payload = file.read()
+            # Decoding here raises what a sequential load would, so the caller's decode can trust the payload.
+            load_binary(payload, lazy=lazy, strict=strict, trusted=trusted)
+        else:
+            buffer = io.BytesIO()
+            dump_binary(buffer, deserialization(path, streaming=streaming, strict=strict, trusted=trusted))
+            payload = buffer.getvalue()
+    except Exception as error:
+        return None, _describe(error), time.perf_counter() - start
+    return payload, None, time.perf_counter() - start
+
+
+def adopt_sections(sections: Dict[str, type]):
+    """Register the parent's extension sections in a worker; spawned workers do not inherit them."""
+    for key, feature_type in sections.items():
+        FEATURE_TYPES.setdefault(key, feature_type)
+
+
+def _describe(error: BaseException) -> str:
+    return f'{type(error).__name__}: {error}'
@@ -9,10 +9,14 @@ Create Date: 2024/3/14
 
 import json
 from functools import wraps
-from typing import Dict
+from typing import Dict, List, Union
+from shapely import from_wkt
 from shapely.wkt import loads
 from shapely.geometry.base import BaseGeometry
 
+from indoorjson3.geometry import parse_geometry
+from indoorjson3.instrumentation import timed_stage
+
 
 def type_check(func):
     @wraps(func)
@@ -29,8 +33,26 @@ def type_check(func):
     return wrapper
 
 
+def raw_type_check(func):
+    @wraps(func)
+    def wrapper(cls, cell_id: str, properties: Dict, space: Union[str, bytes], node: Union[str, bytes],
+                *args, **kwargs):
+        if not isinstance(cell_id, str):
+            raise TypeError("cell_id must be a string")
+        if not isinstance(properties, dict):
+            raise TypeError("properties must be a dictionary")
+        if not isinstance(space, (str, bytes, BaseGeometry)):
+            raise TypeError("space must be WKT, WKB or a BaseGeometry instance")
+        if not isinstance(node, (str, bytes, BaseGeometry)):
+            raise TypeError("node must be WKT, WKB or a BaseGeometry instance")
+        return func(cls, cell_id, properties, space, node, *args, **kwargs)
+    return wrapper
+
+
 class Cell:
 
+    __slots__ = ('__id', '__properties', '__space', '__node')
+
     @type_check
     def __init__(self, cell_id: str, properties: Dict, space: BaseGeometry, node: BaseGeometry):
         self.__id: str = cell_id
@@ -48,28 +70,55 @@ class Cell:
 
     @property
     def space(self) -> BaseGeometry:
+        if not isinstance(self.__space, BaseGeometry):
+            self.__space = parse_geometry(self.__space)
         return self.__space
 
     @property
     def node(self) -> BaseGeometry:
+        if not isinstance(self.__node, BaseGeometry):
+            self.__node = parse_geometry(self.__node)
         return self.__node
 
     def to_json(self) -> Dict:
-        result = {}
-        for key, value in self.__dict__.items():
-            json_key = key.split('__')[-1]
-            if isinstance(value, BaseGeometry):
-                result[json_key] = value.wkt
-            elif json_key == 'id':
-                json_key = '$id'
-                result[json_key] = value
-            else:
-                result[json_key] = value
-        return result
+        return {'$id': self.__id, 'properties': self.__properties, 'space': self.space.wkt, 'node': self.node.wkt}
+
+    @classmethod
+    def from_raw(cls, cell_id: str, properties: Dict, space: Union[str, bytes], node: Union[str, bytes]) -> 'Cell':
+        """Create a Cell without type checks; WKT/WKB geometry is parsed on first access."""
+        cell = cls.__new__(cls)
+        cell.__id = cell_id
+        cell.__properties = properties
+        cell.__space = space
+        cell.__node = node
+        return cell
 
     @classmethod
-    def from_json(cls, json_dict: Dict) -> 'Cell':
+    @raw_type_check
+    def from_unparsed(cls, cell_id: str, properties: Dict, space: Union[str, bytes],
+                      node: Union[str, bytes]) -> 'Cell':
+        """Like ``from_raw``, but with the same checks as the constructor; only geometry parsing is deferred."""
+        return cls.from_raw(cell_id, properties, space, node)
+
+    @classmethod
+    def from_json(cls, json_dict: Dict, lazy: bool = False, trusted: bool = False) -> 'Cell':
+        if lazy:
+            create = cls.from_raw if trusted else cls.from_unparsed
+            return create(json_dict['$id'], json_dict['properties'], json_dict['space'], json_dict['node'])
         json_dict['cell_id'] = json_dict.pop('$id')
         json_dict['space'] = loads(json_dict['space'])
         json_dict['node'] = loads(json_dict['node'])
         return cls(**json_dict)
+
+    @classmethod
+    def from_json_batch(cls, json_dicts: List[Dict], lazy: bool = False, trusted: bool = False) -> List['Cell']:
+        """Decode many cells at once; ``trusted=True`` skips the per-object type checks."""
+        if lazy:
+            return [cls.from_json(json_dict, lazy=True, trusted=trusted) for json_dict in json_dicts]
+        with timed_stage('cells.wkt', 2 * len(json_dicts)):
+            spaces = from_wkt([json_dict['space'] for json_dict in json_dicts])
+            nodes = from_wkt([json_dict['node'] for json_dict in json_dicts])
+        create = cls.from_raw if trusted else cls
+        with timed_stage('cells.construct', len(json_dicts), type_check=not trusted):
+            return [create(json_dict['$id'], json_dict['properties'], space, node)
+                for json_dict, space, node in zip(json_dicts, spaces, nodes)]
@@ -9,10 +9,14 @@ Create Date: 2024/3/14
 
 import json
 from functools import wraps
-from typing import Dict
+from typing import Dict, List, Union
+from shapely import from_wkt
 from shapely.wkt import loads
 from shapely.geometry.base import BaseGeometry
 
+from indoorjson3.geometry import parse_geometry
+from indoorjson3.instrumentation import timed_stage
+
 
 def type_check(func):
     @wraps(func)
@@ -34,8 +38,30 @@ def type_check(func):
     return wrapper
 
 
+def raw_type_check(func):
+    @wraps(func)
+    def wrapper(cls, connection_id: str, properties: dict, fr: str, to: str,
+                bound: Union[str, bytes], edge: Union[str, bytes], *args, **kwargs):
+        if not isinstance(connection_id, str):
+            raise TypeError("connection_id must be a string")
+        if not isinstance(properties, dict):
+            raise TypeError("properties must be a dictionary")
+        if not isinstance(fr, str):
+            raise TypeError("source must be a string")
+        if not isinstance(to, str):
+            raise TypeError("target must be a string")
+        if not isinstance(bound, (str, bytes, BaseGeometry)):
+            raise TypeError("bound must be WKT, WKB or a BaseGeometry instance")
+        if not isinstance(edge, (str, bytes, BaseGeometry)):
+            raise TypeError("edge must be WKT, WKB or a BaseGeometry instance")
+        return func(cls, connection_id, properties, fr, to, bound, edge, *args, **kwargs)
+    return wrapper
+
+
 class Connection:
 
+    __slots__ = ('__id', '__properties', '__fr', '__to', '__bound', '__edge')
+
     @type_check
     def __init__(self, connections_id: str, properties: Dict, fr: str, to: str,
                  bound: BaseGeometry, edge: BaseGeometry):
@@ -64,28 +90,61 @@ class Connection:
 
     @property
     def bound(self) -> BaseGeometry:
+        if not isinstance(self.__bound, BaseGeometry):
+            self.__bound = parse_geometry(self.__bound)
         return self.__bound
 
     @property
     def edge(self) -> BaseGeometry:
+        if not isinstance(self.__edge, BaseGeometry):
+            self.__edge = parse_geometry(self.__edge)
         return self.__edge
 
     def to_json(self) -> Dict:
-        result = {}
-        for key, value in self.__dict__.items():
-            json_key = key.split('__')[-1]
-            if isinstance(value, BaseGeometry):
-                result[json_key] = value.wkt
-            elif json_key == 'id':
-                json_key = '$id'
-                result[json_key] = value
-            else:
-                result[json_key] = value
-        return result
+        return {'$id': self.__id, 'properties': self.__properties, 'fr': self.__fr, 'to': self.__to,
+                'bound': self.bound.wkt, 'edge': self.edge.wkt}
+
+    @classmethod
+    def from_raw(cls, connection_id: str, properties: Dict, fr: str, to: str,
+                 bound: Union[str, bytes], edge: Union[str, bytes]) -> 'Connection':
+        """Create a Connection without type checks; WKT/WKB geometry is parsed on first access."""
+        connection = cls.__new__(cls)
+        connection.__id = connection_id
+        connection.__properties = properties
+        connection.__fr = fr
+        connection.__to = to
+        connection.__bound = bound
+        connection.__edge = edge
+        return connection
+
+    @classmethod
+    @raw_type_check
+    def from_unparsed(cls, connection_id: str, properties: Dict, fr: str, to: str,
+                      bound: Union[str, bytes], edge: Union[str, bytes]) -> 'Connection':
+        """Like ``from_raw``, but with the same checks as the constructor; only geometry parsing is deferred."""
+        return cls.from_raw(connection_id, properties, fr, to, bound, edge)
 
     @classmethod
-    def from_json(cls, json_dict: Dict) -> 'Connection':
+    def from_json(cls, json_dict: Dict, lazy: bool = False, trusted: bool = False) -> 'Connection':
+        if lazy:
+            create = cls.from_raw if trusted else cls.from_unparsed
+            return create(json_dict['$id'], json_dict['properties'], json_dict['fr'], json_dict['to'],
+                          json_dict['bound'], json_dict['edge'])
         json_dict['connection_id'] = json_dict.pop('$id')
         json_dict['bound'] = loads(json_dict['bound'])
         json_dict['edge'] = loads(json_dict['edge'])
         return cls(**json_dict)
+
+    @classmethod
+    def from_json_batch(cls, json_dicts: List[Dict], lazy: bool = False,
+                        trusted: bool = False) -> List['Connection']:
+        """Decode many connections at once; ``trusted=True`` skips the per-object type checks."""
+        if lazy:
+            return [cls.from_json(json_dict, lazy=True, trusted=trusted) for json_dict in json_dicts]
+        with timed_stage('connections.wkt', 2 * len(json_dicts)):
+            bounds = from_wkt([json_dict['bound'] for json_dict in json_dicts])
+            edges = from_wkt([json_dict['edge'] for json_dict in json_dicts])
+        create = cls.from_raw if trusted else cls
+        with timed_stage('connections.construct', len(json_dicts), type_check=not trusted):
+            return [create(json_dict['$id'], json_dict['properties'], json_dict['fr'], json_dict['to'], bound, edge)
+                for json_dict, bound, edge in zip(json_dicts, bounds, edges)]
@@ -0,0 +1,78 @@
+"""
+File Name: geometry.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import numpy as np
+import shapely
+from typing import Iterable, Union
+from shapely.geometry.base import BaseGeometry
+
+
+def parse_geometry(raw: Union[str, bytes]) -> BaseGeometry:
+    if isinstance(raw, str):
+        return shapely.from_wkt(raw)
+    return shapely.from_wkb(raw)
+
+
+class GeometryArray:
+    """Growable contiguous array of Shapely geometries.
+
+    The array holds references to the same geometry objects as the owning
+    cells or connections, position for position, so bulk queries run as a
+    single vectorized Shapely call instead of a Python loop over features.
+    """
+
+    def __init__(self, capacity: int = 16):
+        self.__values: np.ndarray = np.empty(max(capacity, 1), dtype=object)
+        self.__size: int = 0
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def __getitem__(self, index):
+        return self.values[index]
+
+    @property
+    def values(self) -> np.ndarray:
+        return self.__values[:self.__size]
+
+    def append(self, geometry: BaseGeometry):
+        if self.__size == len(self.__values):
+            grown = np.empty(2 * len(self.__values), dtype=object)
+            grown[:self.__size] = self.__values
+            self.__values = grown
+        self.__values[self.__size] = geometry
+        self.__size += 1
+
+    def pop(self, index: int) -> BaseGeometry:
+        geometry = self.__values[index]
+        self.__values[index:self.__size - 1] = self.__values[index + 1:self.__size]
+        self.__size -= 1
+        self.__values[self.__size] = None
+        return geometry
+
+    def area(self) -> np.ndarray:
+        return shapely.area(self.values)
+
+    def length(self) -> np.ndarray:
+        return shapely.length(self.values)
+
+    def bounds(self) -> np.ndarray:
+        return shapely.bounds(self.values)
+
+    def centroid(self) -> np.ndarray:
+        centroids = shapely.centroid(self.values)
+        return np.column_stack((shapely.get_x(centroids), shapely.get_y(centroids)))
+
+    @classmethod
+    def from_geometries(cls, geometries: Iterable[BaseGeometry]) -> 'GeometryArray':
+        values = list(geometries)
+        instance = cls(len(values))
+        instance.__values[:len(values)] = values
+        instance.__size = len(values)
+        return instance
@@ -0,0 +1,87 @@
+"""
+File Name: incidence.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import numpy as np
+from typing import Tuple
+
+
+class IncidenceMatrix:
+    """Sparse cell x connection incidence matrix stored in CSR layout.
+
+    Row i lists the connections touching cell i; the value is 1 where the
+    cell is the source of the connection and -1 where it is the target.
+    """
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, shape: Tuple[int, int]):
+        self.__indptr: np.ndarray = indptr
+        self.__indices: np.ndarray = indices
+        self.__data: np.ndarray = data
+        self.__shape: Tuple[int, int] = shape
+
+    @property
+    def indptr(self) -> np.ndarray:
+        return self.__indptr
+
+    @property
+    def indices(self) -> np.ndarray:
+        return self.__indices
+
+    @property
+    def data(self) -> np.ndarray:
+        return self.__data
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.__shape
+
+    @property
+    def nnz(self) -> int:
+        return len(self.__data)
+
+    @property
+    def T(self) -> 'IncidenceMatrix':
+        return self.transpose()
+
+    def row(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        start, end = self.__indptr[i], self.__indptr[i + 1]
+        return self.__indices[start:end], self.__data[start:end]
+
+    def transpose(self) -> 'IncidenceMatrix':
+        rows = np.repeat(np.arange(self.__shape[0], dtype=np.int64), np.diff(self.__indptr))
+        return self.from_coo(self.__indices, rows, self.__data, (self.__shape[1], self.__shape[0]))
+
+    def toarray(self, dtype=int) -> np.ndarray:
+        dense = np.zeros(self.__shape, dtype=dtype)
+        rows = np.repeat(np.arange(self.__shape[0], dtype=np.int64), np.diff(self.__indptr))
+        dense[rows, self.__indices] = self.__data
+        return dense
+
+    def to_scipy(self):
+        from scipy.sparse import csr_matrix
+        return csr_matrix((self.__data, self.__indices, self.__indptr), shape=self.__shape)
+
+    @classmethod
+    def from_coo(cls, rows: np.ndarray, cols: np.ndarray, data: np.ndarray,
+                 shape: Tuple[int, int]) -> 'IncidenceMatrix':
+        order = np.lexsort((cols, rows))
+        indptr = np.zeros(shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=shape[0]), out=indptr[1:])
+        return cls(indptr, np.asarray(cols, dtype=np.int64)[order], np.asarray(data, dtype=np.int8)[order], shape)
+
+    @classmethod
+    def from_endpoints(cls, sources: np.ndarray, targets: np.ndarray, cell_count: int) -> 'IncidenceMatrix':
+        """Build the matrix in one pass from per-connection source and target cell positions."""
+        connection_count = len(sources)
+        columns = np.arange(connection_count, dtype=np.int64)
+        loops = sources == targets
+        rows = np.concatenate((sources[~loops], targets))
+        cols = np.concatenate((columns[~loops], columns))
+        data = np.concatenate((np.ones(connection_count - int(loops.sum()), dtype=np.int8),
+                               np.full(connection_count, -1, dtype=np.int8)))
+        return cls.from_coo(rows, cols, data, (cell_count, connection_count))
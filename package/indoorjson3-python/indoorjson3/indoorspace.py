@@ -11,9 +11,71 @@ import json
 import numpy as np
 from indoorjson3.cell import Cell
 from indoorjson3.connection import Connection
+from indoorjson3.geometry import GeometryArray
+from indoorjson3.incidence import IncidenceMatrix
+from indoorjson3.instrumentation import timed_stage
 from indoorjson3.layer import Layer
 from indoorjson3.rlines import Rlines
-from typing import List, Dict
+from indoorjson3.routing import RoutingGraph, build_transition_graph, connection_weights, distance_matrix
+from indoorjson3.spatial import SpatialIndex
+from typing import Any, List, Dict, Iterable, Iterator, Optional, Set, Tuple
+
+FEATURE_TYPES = {'cells': Cell, 'connections': Connection, 'layers': Layer, 'rlineses': Rlines}
+BUILTIN_SECTIONS = ('properties', 'cells', 'connections', 'layers', 'rlineses')
+CELL_GEOMETRY_FIELDS = ('space', 'node')
+CONNECTION_GEOMETRY_FIELDS = ('bound', 'edge')
+
+
+def register_section(key: str, feature_type: type):
+    """Decode the top-level ``key`` array with ``feature_type.from_json_batch(items, lazy, trusted)``.
+
+    Features of an extension section are kept in file order, read back with
+    ``IndoorSpace.get_section`` and written out again through their ``to_json``.
+    """
+    if key in BUILTIN_SECTIONS:
+        raise ValueError(f'Section {key} is built in')
+    FEATURE_TYPES[key] = feature_type
+
+
+def unregister_section(key: str):
+    if key in BUILTIN_SECTIONS or key not in FEATURE_TYPES:
+        raise ValueError(f'Section {key} is not a registered extension')
+    del FEATURE_TYPES[key]
+
+
+def registered_sections() -> Dict[str, type]:
+    """Extension sections and their feature types, to register again in worker processes."""
+    return {key: feature_type for key, feature_type in FEATURE_TYPES.items() if key not in BUILTIN_SECTIONS}
+
+
+def decode_json_items(items: Iterable[Tuple[str, Any]], batch_size: int = 4096, lazy: bool = False,
+                      strict: bool = False, trusted: bool = False,
+                      keys: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, Any]]:
+    """Turn ``(key, element)`` pairs into ``(key, feature)`` pairs, decoding geometries in batches.
+
+    ``keys`` are the document's top-level keys, which ``strict`` also checks
+    once ``items`` is exhausted: an empty array yields no pair to check.
+    """
+    batch_key = None
+    batch: List[Dict] = []
+    for key, value in items:
+        if key in FEATURE_TYPES:
+            if key != batch_key or len(batch) >= batch_size:
+                if batch:
+                    yield from ((batch_key, feature)
+                                for feature in FEATURE_TYPES[batch_key].from_json_batch(batch, lazy, trusted))
+                batch_key, batch = key, []
+            batch.append(value)
+        elif key == 'properties':
+            yield key, value
+        elif strict:
+            raise ValueError(f'Unknown IndoorJSON section: {key}')
+    if batch:
+        yield from ((batch_key, feature) for feature in FEATURE_TYPES[batch_key].from_json_batch(batch, lazy, trusted))
+    if strict and keys is not None:
+        for key in keys:
+            if key != 'properties' and key not in FEATURE_TYPES:
+                raise ValueError(f'Unknown IndoorJSON section: {key}')
 
 
 class IndoorSpace:
@@ -24,7 +86,25 @@ class IndoorSpace:
         self._connections: List[Connection] = []
         self._layers: List[Layer] = []
         self._rlineses: List[Rlines] = []
+        self._extensions: Dict[str, List] = {}
         self._hypergraph: Dict = {}
+        self._cell_index: Dict[str, int] = {}
+        self._connection_index: Dict[str, int] = {}
+        self._ins: Dict[str, List[str]] = {}
+        self._outs: Dict[str, List[str]] = {}
+        self._cell_rlineses: Dict[str, List[Rlines]] = {}
+        # Source and target cell positions as rows of a buffer that doubles when full;
+        # the first len(self._connections) columns are in use.
+        self._endpoints: Optional[np.ndarray] = None
+        self._incidence: Optional[IncidenceMatrix] = None
+        self._hypergraph_valid: bool = False
+        self._dirty_cells: Set[str] = set()
+        self._dirty_connections: Set[str] = set()
+        self._geometries: Dict[str, GeometryArray] = {}
+        self._spatial_index: Optional[SpatialIndex] = None
+        self._routing_graphs: Dict[Tuple[Optional[str], bool], RoutingGraph] = {}
+        self._transition_graphs: Dict[Optional[str], RoutingGraph] = {}
+        self._revision: int = 0
 
     @property
     def properties(self) -> Dict:
@@ -46,138 +126,490 @@ class IndoorSpace:
     def rlineses(self) -> List[Rlines]:
         return self._rlineses
 
+    @property
+    def extensions(self) -> Dict[str, List]:
+        """Features of registered extension sections, keyed by section."""
+        return self._extensions
+
     @property
     def hypergraph(self) -> Dict:
         return self._hypergraph
 
+    @property
+    def revision(self) -> int:
+        """Counter bumped whenever cells, connections or Rlines change; views use it to notice stale indexes."""
+        return self._revision
+
+    def get_section(self, key: str) -> List:
+        """Features of a built-in or registered extension section; extension lists may be appended to."""
+        if key not in FEATURE_TYPES:
+            raise ValueError(f'Unknown IndoorJSON section: {key}')
+        if key in BUILTIN_SECTIONS:
+            return getattr(self, f'_{key}')
+        return self._extensions.setdefault(key, [])
+
     def set_properties(self, properties: Dict):
         self._properties = properties
 
     def add_cell(self, cell: Cell):
-        if cell.id not in [c.id for c in self._cells]:
+        if cell.id not in self._cell_index:
+            self._cell_index[cell.id] = len(self._cells)
             self._cells.append(cell)
+            self._invalidate_derived()
+            for field in CELL_GEOMETRY_FIELDS:
+                if field in self._geometries:
+                    self._geometries[field].append(getattr(cell, field))
+            if self._hypergraph_valid:
+                self._hypergraph['hyperEdges'].append(None)
+                self._dirty_cells.add(cell.id)
         else:
             raise ValueError('Cell id already exists')
 
     def add_connection(self, connection: Connection):
-        if connection.id not in [c.id for c in self._connections]:
-            if connection.source in [
-                    c.id for c in self._cells
-            ] and connection.target in [c.id for c in self._cells]:
+        if connection.id not in self._connection_index:
+            source_exists = connection.source in self._cell_index
+            target_exists = connection.target in self._cell_index
+            if source_exists and target_exists:
+                self._connection_index[connection.id] = len(self._connections)
                 self._connections.append(connection)
-            elif connection.source not in [
-                    c.id for c in self._cells
-            ] and connection.target in [c.id for c in self._cells]:
+                self._link_connection(connection)
+                if self._endpoints is not None:
+                    self._append_endpoints(self._cell_index[connection.source], self._cell_index[connection.target])
+                self._invalidate_derived()
+                for field in CONNECTION_GEOMETRY_FIELDS:
+                    if field in self._geometries:
+                        self._geometries[field].append(getattr(connection, field))
+                if self._hypergraph_valid:
+                    self._hypergraph['hyperNodes'].append(None)
+                    self._dirty_connections.add(connection.id)
+                    self._dirty_cells.update((connection.source, connection.target))
+            elif not source_exists and target_exists:
                 raise ValueError('Source cell does not exist')
-            elif connection.source in [
-                    c.id for c in self._cells
-            ] and connection.target not in [c.id for c in self._cells]:
+            elif source_exists and not target_exists:
                 raise ValueError('Target cell does not exist')
             else:
                 raise ValueError('Source and target cell do not exist')
         else:
             raise ValueError('Connection id already exists')
 
+    def remove_cell(self, cell_id: str) -> Cell:
+        if cell_id not in self._cell_index:
+            raise ValueError('Cell id does not exist')
+        if self._ins.get(cell_id) or self._outs.get(cell_id):
+            raise ValueError('Cell is still referenced by connections')
+        index = self._cell_index.pop(cell_id)
+        cell = self._cells.pop(index)
+        for i in range(index, len(self._cells)):
+            self._cell_index[self._cells[i].id] = i
+        self._ins.pop(cell_id, None)
+        self._outs.pop(cell_id, None)
+        if self._endpoints is not None:
+            # Removals write a new buffer, so arrays handed out earlier keep their values.
+            endpoints = self._endpoints[:, :len(self._connections)]
+            self._endpoints = np.where(endpoints > index, endpoints - 1, endpoints)
+        self._invalidate_derived()
+        for field in CELL_GEOMETRY_FIELDS:
+            if field in self._geometries:
+                self._geometries[field].pop(index)
+        if self._hypergraph_valid:
+            self._hypergraph['hyperEdges'].pop(index)
+            self._dirty_cells.discard(cell_id)
+        return cell
+
+    def remove_connection(self, connection_id: str) -> Connection:
+        if connection_id not in self._connection_index:
+            raise ValueError('Connection id does not exist')
+        index = self._connection_index.pop(connection_id)
+        connection = self._connections.pop(index)
+        for i in range(index, len(self._connections)):
+            self._connection_index[self._connections[i].id] = i
+        self._unlink_connection(connection)
+        if self._endpoints is not None:
+            self._endpoints = np.delete(self._endpoints[:, :len(self._connections) + 1], index, axis=1)
+        self._invalidate_derived()
+        for field in CONNECTION_GEOMETRY_FIELDS:
+            if field in self._geometries:
+                self._geometries[field].pop(index)
+        if self._hypergraph_valid:
+            self._hypergraph['hyperNodes'].pop(index)
+            self._dirty_connections.discard(connection_id)
+            self._dirty_cells.update((connection.source, connection.target))
+        return connection
+
     def set_layers(self, layers: Layer):
         self._layers.append(layers)
 
     def set_rlineses(self, rlineses: Rlines):
         self._rlineses.append(rlineses)
+        self._cell_rlineses.setdefault(rlineses.cell, []).append(rlineses)
+        self._dirty_cells.add(rlineses.cell)
+        self._transition_graphs = {}
+        self._revision += 1
 
-    def get_incident_matrix(self):
-        cells = self.cells
-        connections = self.connections
-        incident_matrix = np.zeros((len(cells), len(connections)), dtype=int)
-        for j, connection in enumerate(connections):
-            source = self.get_cell_from_id(connection.source)
-            target = self.get_cell_from_id(connection.target)
-            source_index = cells.index(source)
-            target_index = cells.index(target)
-            incident_matrix[source_index, j] = 1
-            incident_matrix[target_index, j] = -1
-        return incident_matrix
-
-    def get_hypergraph_incidence_matrix(self):
+    def remove_rlines(self, rlines_id: str) -> Rlines:
+        for i, rlines in enumerate(self._rlineses):
+            if rlines.id == rlines_id:
+                del self._rlineses[i]
+                group = self._cell_rlineses[rlines.cell]
+                group.remove(rlines)
+                if not group:
+                    del self._cell_rlineses[rlines.cell]
+                self._dirty_cells.add(rlines.cell)
+                self._transition_graphs = {}
+                self._revision += 1
+                return rlines
+        raise ValueError('Rlines id does not exist')
+
+    def get_layer(self, layer_id: str) -> Optional[Layer]:
+        for layer in self._layers:
+            if layer.id == layer_id:
+                return layer
+        return None
+
+    def get_layer_view(self, layer_id: str) -> 'LayerView':
+        """Zero-copy view of the cells and connections of one layer."""
+        # view wraps this class, so it can only be imported once this module has loaded.
+        from indoorjson3.view import LayerView
+        layer = self.get_layer(layer_id)
+        if layer is None:
+            raise ValueError('Layer id does not exist')
+        return LayerView(self, layer)
+
+    def get_cell_positions(self, cell_ids: Iterable[str]) -> np.ndarray:
+        """Positions of the given cells in ``cells``, skipping ids that do not exist."""
+        index = self._cell_index
+        return np.fromiter((index[cell_id] for cell_id in cell_ids if cell_id in index), dtype=np.int64)
+
+    def get_connection_endpoints(self) -> Tuple[np.ndarray, np.ndarray]:
+        count = len(self._connections)
+        if self._endpoints is None:
+            cell_index = self._cell_index
+            self._endpoints = np.empty((2, max(count, 16)), dtype=np.int64)
+            self._endpoints[0, :count] = np.fromiter((cell_index[c.source] for c in self._connections),
+                                                     dtype=np.int64, count=count)
+            self._endpoints[1, :count] = np.fromiter((cell_index[c.target] for c in self._connections),
+                                                     dtype=np.int64, count=count)
+        return self._endpoints[0, :count], self._endpoints[1, :count]
+
+    def _append_endpoints(self, source: int, target: int):
+        # Called after the connection is appended, so its column is the last one in use.
+        count = len(self._connections)
+        if count > self._endpoints.shape[1]:
+            grown = np.empty((2, max(2 * self._endpoints.shape[1], 16)), dtype=np.int64)
+            grown[:, :count - 1] = self._endpoints[:, :count - 1]
+            self._endpoints = grown
+        self._endpoints[0, count - 1] = source
+        self._endpoints[1, count - 1] = target
+
+    def get_incident_matrix(self, dense: bool = False):
+        if self._incidence is None:
+            with timed_stage('indoorspace.incidence', len(self._connections)):
+                sources, targets = self.get_connection_endpoints()
+                self._incidence = IncidenceMatrix.from_endpoints(sources, targets, len(self._cells))
+        if dense:
+            return self._incidence.toarray()
+        return self._incidence
+
+    def get_hypergraph_incidence_matrix(self, dense: bool = False):
+        if dense:
+            return self.get_incident_matrix(dense=True).T
         return self.get_incident_matrix().T
 
+    def get_geometry_array(self, field: str) -> GeometryArray:
+        if field not in self._geometries:
+            if field in CELL_GEOMETRY_FIELDS:
+                features = self._cells
+            elif field in CONNECTION_GEOMETRY_FIELDS:
+                features = self._connections
+            else:
+                raise ValueError(f'Unknown geometry field: {field}')
+            self._geometries[field] = GeometryArray.from_geometries(getattr(f, field) for f in features)
+        return self._geometries[field]
+
+    def get_cell_areas(self) -> np.ndarray:
+        return self.get_geometry_array('space').area()
+
+    def get_cell_bounds(self) -> np.ndarray:
+        return self.get_geometry_array('space').bounds()
+
+    def get_cell_centroids(self) -> np.ndarray:
+        return self.get_geometry_array('space').centroid()
+
+    def get_connection_centroids(self) -> np.ndarray:
+        return self.get_geometry_array('bound').centroid()
+
+    def get_connection_lengths(self) -> np.ndarray:
+        return self.get_geometry_array('edge').length()
+
+    def get_spatial_index(self) -> SpatialIndex:
+        if self._spatial_index is None:
+            self._spatial_index = SpatialIndex(self.get_geometry_array('space').values,
+                                               self.get_geometry_array('bound').values)
+        return self._spatial_index
+
+    def locate_cells(self, points: np.ndarray) -> List[Optional[Cell]]:
+        return [self._cells[i] if i >= 0 else None for i in self.get_spatial_index().locate_points(points)]
+
+    def locate_cell(self, x: float, y: float) -> Optional[Cell]:
+        return self.locate_cells(np.array([[x, y]]))[0]
+
+    def get_routing_graph(self, weight: Optional[str] = None, directed: bool = True) -> RoutingGraph:
+        key = (weight, directed)
+        if key not in self._routing_graphs:
+            with timed_stage('indoorspace.routing_graph', len(self._connections), weight=weight, directed=directed):
+                sources, targets = self.get_connection_endpoints()
+                lengths = self.get_connection_lengths() if weight is None else None
+                weights = connection_weights(self._connections, lengths, weight)
+                self._routing_graphs[key] = RoutingGraph.from_endpoints(sources, targets, weights,
+                                                                        len(self._cells), directed)
+        return self._routing_graphs[key]
+
+    def shortest_path(self, source_id: str, target_id: str, weight: Optional[str] = None,
+                      directed: bool = True) -> Tuple[float, List[str]]:
+        graph = self.get_routing_graph(weight, directed)
+        distance, nodes, _ = graph.shortest_path(self._cell_index[source_id], self._cell_index[target_id])
+        return distance, [self._cells[i].id for i in nodes]
+
+    def shortest_distances(self, source_id: str, target_ids: Optional[Iterable[str]] = None,
+                           weight: Optional[str] = None, directed: bool = True) -> Dict[str, float]:
+        dist = self.get_routing_graph(weight, directed).shortest_distances(self._cell_index[source_id])
+        if target_ids is None:
+            return {self._cells[i].id: d for i, d in dist.items()}
+        return {target_id: dist.get(self._cell_index[target_id], np.inf) for target_id in target_ids}
+
+    def nearest_reachable_cells(self, source_id: str, k: int, weight: Optional[str] = None,
+                                directed: bool = True) -> List[Tuple[str, float]]:
+        nearest = self.get_routing_graph(weight, directed).nearest(self._cell_index[source_id], k)
+        return [(self._cells[i].id, d) for i, d in nearest]
+
+    def build_landmark_index(self, count: int = 16, weight: Optional[str] = None, directed: bool = True,
+                             processes: Optional[int] = None) -> 'LandmarkIndex':
+        """Precompute ALT landmarks for a routing graph and use them for its point-to-point queries."""
+        # landmarks persists through the binary container, which itself imports this module.
+        from indoorjson3.landmarks import LandmarkIndex
+        graph = self.get_routing_graph(weight, directed)
+        index = LandmarkIndex.build(graph, count, processes=processes,
+                                    metadata={'weight': weight, 'directed': directed})
+        graph.set_landmarks(index)
+        return index
+
+    def set_landmark_index(self, index: 'LandmarkIndex'):
+        graph = self.get_routing_graph(index.metadata.get('weight'), index.metadata.get('directed', True))
+        if not index.matches(graph):
+            raise ValueError('Landmark index was built for a different routing graph')
+        graph.set_landmarks(index)
+
+    def get_distance_matrix(self, source_ids: Optional[Iterable[str]] = None,
+                            target_ids: Optional[Iterable[str]] = None, weight: Optional[str] = None,
+                            directed: bool = True, processes: Optional[int] = None,
+                            out: Optional[str] = None) -> np.ndarray:
+        """Network distances from sources (rows) to targets (columns), all cells by default.
+
+        Searches run across ``processes`` worker processes; ``out`` names a file
+        the matrix is written to as a memory map for very large outputs.
+        """
+        sources = range(len(self._cells)) if source_ids is None else [self._cell_index[i] for i in source_ids]
+        targets = None if target_ids is None else [self._cell_index[i] for i in target_ids]
+        return distance_matrix(self.get_routing_graph(weight, directed), sources, targets, processes, out)
+
+    def get_transition_graph(self, weight: Optional[str] = None) -> RoutingGraph:
+        if weight not in self._transition_graphs:
+            index = self._connection_index
+            closures = np.array([(index[pair[0]], index[pair[1]]) for rlines in self._rlineses
+                                 for pair in rlines.closure if pair[0] in index and pair[1] in index],
+                                dtype=np.int64).reshape(-1, 2)
+            door_weights = None if weight is None else connection_weights(self._connections, None, weight)
+            sources, targets = self.get_connection_endpoints()
+            self._transition_graphs[weight] = build_transition_graph(
+                sources, targets, self.get_connection_centroids(), self.get_geometry_array('node').centroid(),
+                closures, door_weights)
+        return self._transition_graphs[weight]
+
+    def shortest_rlines_path(self, source_id: str, target_id: str,
+                             weight: Optional[str] = None) -> Tuple[float, List[str], List[str]]:
+        """Shortest cell path that never takes a door-to-door transition listed in an Rlines closure.
+
+        Returns the distance, the visited cell ids and the connection ids passed through.
+        """
+        source, target = self._cell_index[source_id], self._cell_index[target_id]
+        if source == target:
+            return 0.0, [source_id], []
+        door_count = len(self._connections)
+        graph = self.get_transition_graph(weight)
+        distance, nodes, _ = graph.shortest_path(door_count + source, door_count + len(self._cells) + target)
+        doors = [self._connections[i] for i in nodes[1:-1]]
+        if not doors:
+            return distance, [], []
+        return distance, [source_id] + [door.target for door in doors], [door.id for door in doors]
+
+    def shortest_door_path(self, source_id: str, target_id: str,
+                           weight: Optional[str] = None) -> Tuple[float, List[str]]:
+        graph = self.get_transition_graph(weight)
+        distance, nodes, _ = graph.shortest_path(self._connection_index[source_id], self._connection_index[target_id])
+        return distance, [self._connections[i].id for i in nodes]
+
     def get_hypergraph(self):
-        cells = self.cells
-        connections = self.connections
-        rlineses = self.rlineses
         hypergraph = self._hypergraph
-        hypergraph['hyperNodes'] = []
-        hypergraph['hyperEdges'] = []
-        incident_matrix = self.get_incident_matrix()
-        incident_matrix_transpose = incident_matrix.T
-
-        for hyperNode in connections:
-            hypergraph['hyperNodes'].append(hyperNode.to_json())
-
-        for j in range(incident_matrix_transpose.shape[1]):
-            hyperEdge = {}
-            inner_edge_id = {'ins': [], 'outs': []}
-            for i in range(incident_matrix_transpose.shape[0]):
-                if incident_matrix_transpose[i, j] != 0:
-                    if incident_matrix_transpose[i, j] == -1:
-                        inner_edge_ins_id = connections[i].id
-                        inner_edge_id['ins'].append(inner_edge_ins_id)
-                    elif incident_matrix_transpose[i, j] == 1:
-                        inner_edge_outs_id = connections[i].id
-                        inner_edge_id['outs'].append(inner_edge_outs_id)
-                    else:
-                        raise ValueError('Incident matrix error')
-            hyperEdge['id'] = cells[j].id
-            hyperEdge['properties'] = cells[j].properties
-            hyperEdge['space'] = cells[j].space.wkt
-            hyperEdge['node'] = cells[j].node.wkt
-            hyperEdge['inner_nodeset'] = inner_edge_id
-
-            for rlines in rlineses:
-                if rlines.cell == cells[j].id:
-                    hyperEdge['closure'] = rlines.closure
-                    break
-
-            hypergraph['hyperEdges'].append(hyperEdge)
-
-        self.set_hypergraph(hypergraph)
-
+        if not self._hypergraph_valid:
+            with timed_stage('indoorspace.hypergraph', len(self._cells) + len(self._connections), incremental=False):
+                hypergraph['hyperNodes'] = [hyperNode.to_json() for hyperNode in self._connections]
+                hypergraph['hyperEdges'] = [self._build_hyperedge(cell) for cell in self._cells]
+            self._hypergraph_valid = True
+        elif self._dirty_connections or self._dirty_cells:
+            with timed_stage('indoorspace.hypergraph', len(self._dirty_cells) + len(self._dirty_connections),
+                             incremental=True):
+                hyperNodes = hypergraph['hyperNodes']
+                hyperEdges = hypergraph['hyperEdges']
+                for connection_id in self._dirty_connections:
+                    index = self._connection_index[connection_id]
+                    hyperNodes[index] = self._connections[index].to_json()
+                for cell_id in self._dirty_cells:
+                    index = self._cell_index.get(cell_id)
+                    if index is not None:
+                        hyperEdges[index] = self._build_hyperedge(self._cells[index])
+        self._dirty_connections.clear()
+        self._dirty_cells.clear()
         return hypergraph
 
+    def _build_hyperedge(self, cell: Cell) -> Dict:
+        hyperEdge = {
+            'id': cell.id,
+            'properties': cell.properties,
+            'space': cell.space.wkt,
+            'node': cell.node.wkt,
+            'inner_nodeset': {'ins': list(self._ins.get(cell.id, [])), 'outs': list(self._outs.get(cell.id, []))}
+        }
+        if cell.id in self._cell_rlineses:
+            hyperEdge['closure'] = self._cell_rlineses[cell.id][0].closure
+        return hyperEdge
+
     def set_hypergraph(self, hypergraph):
         self._hypergraph = hypergraph
+        self._hypergraph_valid = False
 
     def get_cell_from_id(self, cell_id):
-        for cell in self.cells:
-            if cell.id == cell_id:
-                return cell
-        return None
+        index = self._cell_index.get(cell_id)
+        if index is None:
+            return None
+        return self._cells[index]
 
     def get_connection_from_id(self, connection_id):
-        for connection in self.connections:
-            if connection.id == connection_id:
-                return connection
-        return None
+        index = self._connection_index.get(connection_id)
+        if index is None:
+            return None
+        return self._connections[index]
+
+    def get_cell_index(self, cell_id) -> int:
+        return self._cell_index[cell_id]
+
+    def get_connection_index(self, connection_id) -> int:
+        return self._connection_index[connection_id]
+
+    def _invalidate_derived(self):
+        self._revision += 1
+        self._incidence = None
+        self._spatial_index = None
+        self._routing_graphs = {}
+        self._transition_graphs = {}
+
+    def _link_connection(self, connection: Connection):
+        self._ins.setdefault(connection.target, []).append(connection.id)
+        if connection.source != connection.target:
+            self._outs.setdefault(connection.source, []).append(connection.id)
+
+    def _unlink_connection(self, connection: Connection):
+        self._ins[connection.target].remove(connection.id)
+        if connection.source != connection.target:
+            self._outs[connection.source].remove(connection.id)
+
+    def _build_indexes(self, links: Optional[Tuple[Dict[str, List[str]], Dict[str, List[str]]]] = None):
+        with timed_stage('indoorspace.build_indexes', len(self._cells) + len(self._connections)):
+            self._cell_index = {cell.id: i for i, cell in enumerate(self._cells)}
+            self._connection_index = {connection.id: i for i, connection in enumerate(self._connections)}
+            if links is None:
+                self._ins = {}
+                self._outs = {}
+                for connection in self._connections:
+                    self._link_connection(connection)
+            else:
+                self._ins, self._outs = links
+            self._cell_rlineses = {}
+            for rlines in self._rlineses:
+                self._cell_rlineses.setdefault(rlines.cell, []).append(rlines)
+        self._endpoints = None
+        self._invalidate_derived()
+        self._geometries = {}
+        self._hypergraph_valid = False
+        self._dirty_cells.clear()
+        self._dirty_connections.clear()
 
     def to_json(self) -> Dict:
         result = {}
-        for key, value in self.__dict__.items():
-            if key == '_hypergraph':
-                continue
-            elif key == '_properties':
+        for key in ('_properties', '_cells', '_connections', '_layers', '_rlineses'):
+            value = getattr(self, key)
+            if key == '_properties':
                 result[key.strip('_')] = value
             else:
                 result[key.strip('_')] = [item.to_json() for item in value]
+        for key, features in self._extensions.items():
+            result[key] = [feature.to_json() for feature in features]
         return result
 
     @classmethod
-    def from_json(cls, json_str: str) -> 'IndoorSpace':
-        json_data = json.loads(json_str)
+    def from_json(cls, json_str: str, lazy: bool = False, strict: bool = False,
+                  trusted: bool = False) -> 'IndoorSpace':
+        """Decode every section through its registered feature type.
+
+        Unknown sections are ignored, or rejected with ``strict=True``.
+        ``trusted=True`` skips the per-object type checks for known-good files.
+        """
+        with timed_stage('from_json.parse', len(json_str)):
+            json_data = json.loads(json_str)
         instance = cls()
         for key, value in json_data.items():
             if key == 'properties':
-                setattr(instance, f"_{key}", value)
-            elif key == 'rlineses':
-                setattr(instance, f"_{key}", [eval(key.capitalize()[:-2]).from_json(item) for item in value])
+                instance._properties = value
+            elif key in FEATURE_TYPES:
+                with timed_stage(f'from_json.decode.{key}', len(value), lazy=lazy, trusted=trusted):
+                    instance.get_section(key).extend(FEATURE_TYPES[key].from_json_batch(value, lazy, trusted))
+            elif strict:
+                raise ValueError(f'Unknown IndoorJSON section: {key}')
+        instance._build_indexes()
+        return instance
+
+    @classmethod
+    def from_json_items(cls, items: Iterable[Tuple[str, Any]], lazy: bool = False, strict: bool = False,
+                        trusted: bool = False, keys: Optional[Iterable[str]] = None) -> 'IndoorSpace':
+        """Build an IndoorSpace from ``(key, element)`` pairs, one array element at a time.
+
+        ``keys`` lists the document's top-level keys for ``strict``, as in
+        ``decode_json_items``.
+        """
+        instance = cls()
+        for key, value in decode_json_items(items, lazy=lazy, strict=strict, trusted=trusted, keys=keys):
+            if key == 'properties':
+                instance._properties = value
             else:
-                setattr(instance, f"_{key}", [eval(key.capitalize()[:-1]).from_json(item) for item in value])
+                instance.get_section(key).append(value)
+        instance._build_indexes()
+        return instance
+
+    @classmethod
+    def from_features(cls, properties: Dict, cells: List[Cell], connections: List[Connection],
+                      layers: List[Layer], rlineses: List[Rlines],
+                      links: Optional[Tuple[Dict[str, List[str]], Dict[str, List[str]]]] = None) -> 'IndoorSpace':
+        """Assemble a space from decoded feature lists.
+
+        ``links`` are the incoming and outgoing connection ids per cell id, in
+        connection order and without self-loops in the outgoing lists, for
+        loaders that already know them; they are derived from ``connections``
+        otherwise.
+        """
+        instance = cls()
+        instance._properties = properties
+        instance._cells = cells
+        instance._connections = connections
+        instance._layers = layers
+        instance._rlineses = rlineses
+        instance._build_indexes(links)
         return instance
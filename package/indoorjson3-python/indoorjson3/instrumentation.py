@@ -0,0 +1,167 @@
+"""
+File Name: instrumentation.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import logging
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+# Registered sinks; while this is empty every timed_stage is a shared no-op.
+_sinks: List[Callable[[Dict], None]] = []
+
+
+class _NullStage:
+
+    __slots__ = ()
+
+    def __enter__(self) -> '_NullStage':
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+    def add(self, count: int):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+
+    __slots__ = ('__name', '__count', '__tags', '__start', '__memory')
+
+    def __init__(self, name: str, count: int, tags: Dict):
+        self.__name: str = name
+        self.__count: int = count
+        self.__tags: Dict = tags
+        self.__start: float = 0.0
+        self.__memory: Optional[int] = None
+
+    def __enter__(self) -> '_Stage':
+        if tracemalloc.is_tracing():
+            self.__memory = tracemalloc.get_traced_memory()[0]
+        self.__start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        seconds = time.perf_counter() - self.__start
+        event = {'stage': self.__name, 'seconds': seconds, 'count': self.__count}
+        if self.__memory is not None and tracemalloc.is_tracing():
+            event['allocated_bytes'] = tracemalloc.get_traced_memory()[0] - self.__memory
+        if exc_type is not None:
+            event['error'] = exc_type.__name__
+        event.update(self.__tags)
+        for sink in list(_sinks):
+            sink(event)
+        return False
+
+    def add(self, count: int):
+        """Count items processed inside the stage when the total is not known up front."""
+        self.__count += count
+
+
+def timed_stage(name: str, count: int = 0, **tags):
+    """Context manager reporting the duration of ``name`` to every sink; free when no sink is registered.
+
+    Events are dicts with ``stage``, ``seconds``, ``count``, any ``tags``,
+    ``allocated_bytes`` while allocations are traced, and ``error`` when the
+    stage raised.
+    """
+    if not _sinks:
+        return _NULL_STAGE
+    return _Stage(name, count, tags)
+
+
+def add_sink(sink: Callable[[Dict], None]):
+    """Send stage events to ``sink``: a MetricsRegistry, a LoggingSink or any callable taking the event dict."""
+    if sink not in _sinks:
+        _sinks.append(sink)
+
+
+def remove_sink(sink: Callable[[Dict], None]):
+    if sink in _sinks:
+        _sinks.remove(sink)
+
+
+def clear_sinks():
+    _sinks.clear()
+
+
+def instrumentation_enabled() -> bool:
+    return bool(_sinks)
+
+
+def trace_allocations(enabled: bool = True):
+    """Add the net Python allocation of every stage to its event, using tracemalloc; this slows everything down."""
+    if enabled and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif not enabled and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+class MetricsRegistry:
+    """In-memory sink aggregating calls, time, items and allocations per stage."""
+
+    def __init__(self):
+        self.__stats: Dict[str, Dict] = {}
+
+    def __call__(self, event: Dict):
+        stats = self.__stats.get(event['stage'])
+        if stats is None:
+            stats = self.__stats[event['stage']] = {'calls': 0, 'seconds': 0.0, 'min_seconds': float('inf'),
+                                                    'max_seconds': 0.0, 'count': 0, 'errors': 0}
+        stats['calls'] += 1
+        stats['seconds'] += event['seconds']
+        stats['min_seconds'] = min(stats['min_seconds'], event['seconds'])
+        stats['max_seconds'] = max(stats['max_seconds'], event['seconds'])
+        stats['count'] += event['count']
+        if 'error' in event:
+            stats['errors'] += 1
+        if 'allocated_bytes' in event:
+            stats['allocated_bytes'] = stats.get('allocated_bytes', 0) + event['allocated_bytes']
+
+    def stats(self) -> Dict[str, Dict]:
+        return {name: dict(stats) for name, stats in self.__stats.items()}
+
+    def reset(self):
+        self.__stats.clear()
+
+    def report(self) -> str:
+        lines = [f"{'stage':<40} {'calls':>7} {'seconds':>10} {'items':>10}"]
+        for name, stats in sorted(self.__stats.items(), key=lambda item: -item[1]['seconds']):
+            lines.append(f"{name:<40} {stats['calls']:>7} {stats['seconds']:>10.4f} {stats['count']:>10}")
+        return '\n'.join(lines)
+
+
+class LoggingSink:
+    """Sink writing one log record per stage."""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.DEBUG):
+        self.__logger: logging.Logger = logger or logging.getLogger('indoorjson3')
+        self.__level: int = level
+
+    def __call__(self, event: Dict):
+        if self.__logger.isEnabledFor(self.__level):
+            extras = ' '.join(f'{key}={value}' for key, value in event.items()
+                              if key not in ('stage', 'seconds', 'count'))
+            self.__logger.log(self.__level, '%s took %.6fs for %d items %s', event['stage'], event['seconds'],
+                              event['count'], extras)
+
+
+@contextmanager
+def collect_metrics() -> Iterator[MetricsRegistry]:
+    """Register a fresh MetricsRegistry for the duration of a ``with`` block."""
+    registry = MetricsRegistry()
+    add_sink(registry)
+    try:
+        yield registry
+    finally:
+        remove_sink(registry)
@@ -0,0 +1,117 @@
+"""
+File Name: jsonstream.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import json
+from typing import Any, Iterator, List, TextIO, Tuple
+
+_WHITESPACE = ' \t\n\r'
+_NUMBER_CHARS = '0123456789.eE+-'
+
+
+class JsonStreamReader:
+    """Incremental reader for a top-level JSON object.
+
+    Array members are yielded one element at a time so only a single
+    element has to be held in memory, whatever the size of the document.
+    """
+
+    def __init__(self, file: TextIO, chunk_size: int = 1 << 16):
+        self.__file: TextIO = file
+        self.__chunk_size: int = chunk_size
+        self.__buffer: str = ''
+        self.__pos: int = 0
+        self.__eof: bool = False
+        self.__decoder = json.JSONDecoder()
+        self.__keys: List[str] = []
+
+    @property
+    def keys(self) -> List[str]:
+        """Top-level keys read so far, including those of empty arrays, which ``items`` does not yield."""
+        return self.__keys
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        """Yield ``(key, value)`` for scalar/object members and ``(key, element)`` for each array element."""
+        self.__expect('{')
+        if self.__peek() == '}':
+            self.__pos += 1
+            return
+        while True:
+            key = self.__decode()
+            if not isinstance(key, str):
+                raise ValueError('Expected a string key in IndoorJSON document')
+            self.__keys.append(key)
+            self.__expect(':')
+            if self.__peek() == '[':
+                self.__pos += 1
+                if self.__peek() == ']':
+                    self.__pos += 1
+                else:
+                    while True:
+                        yield key, self.__decode()
+                        if self.__next_separator(']'):
+                            break
+            else:
+                yield key, self.__decode()
+            if self.__next_separator('}'):
+                return
+
+    def __fill(self, size: int) -> bool:
+        if self.__eof:
+            return False
+        chunk = self.__file.read(size)
+        if not chunk:
+            self.__eof = True
+            return False
+        self.__buffer = self.__buffer[self.__pos:] + chunk
+        self.__pos = 0
+        return True
+
+    def __peek(self) -> str:
+        while True:
+            buffer = self.__buffer
+            pos = self.__pos
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self.__pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self.__fill(self.__chunk_size):
+                raise ValueError('Unexpected end of IndoorJSON document')
+
+    def __expect(self, char: str):
+        if self.__peek() != char:
+            raise ValueError(f"Expected '{char}' at IndoorJSON stream position")
+        self.__pos += 1
+
+    def __next_separator(self, closing: str) -> bool:
+        char = self.__peek()
+        self.__pos += 1
+        if char == ',':
+            return False
+        if char == closing:
+            return True
+        raise ValueError(f"Expected ',' or '{closing}' in IndoorJSON document")
+
+    def __decode(self) -> Any:
+        self.__peek()
+        size = self.__chunk_size
+        while True:
+            try:
+                value, end = self.__decoder.raw_decode(self.__buffer, self.__pos)
+            except json.JSONDecodeError:
+                if not self.__fill(size):
+                    raise
+                size *= 2
+                continue
+            if isinstance(value, (int, float)) and not isinstance(value, bool) \
+                    and (end == len(self.__buffer) or self.__buffer[end] in _NUMBER_CHARS) and self.__fill(size):
+                # A number may continue past the buffered text; decode again with more input.
+                continue
+            self.__pos = end
+            return value
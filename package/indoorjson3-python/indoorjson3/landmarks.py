@@ -0,0 +1,166 @@
+"""
+File Name: landmarks.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import hashlib
+import json
+import mmap
+import numpy as np
+from typing import Callable, Dict, Optional, Tuple
+
+from indoorjson3.binary import read_container, write_container
+from indoorjson3.routing import RoutingGraph, csr_views, dijkstra, distance_matrix
+
+LANDMARK_MAGIC = b'IJ3L'
+LANDMARK_SUFFIX = '.alt'
+
+
+def landmark_path(filepath: str) -> str:
+    """Location of the landmark index stored next to an IndoorJSON file."""
+    return filepath + LANDMARK_SUFFIX
+
+
+def graph_fingerprint(graph: RoutingGraph) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for array in (graph.indptr, graph.indices, graph.weights):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+
+class LandmarkIndex:
+    """ALT (A*, landmarks, triangle inequality) speed-up index for a RoutingGraph.
+
+    ``forward[v, i]`` is the distance from landmark ``i`` to node ``v`` and
+    ``backward[v, i]`` the distance from ``v`` to landmark ``i``. Both tables
+    may be read-only memory maps of a saved index. ``metadata`` records which
+    routing graph of an IndoorSpace the index was built for.
+    """
+
+    def __init__(self, landmarks: np.ndarray, forward: np.ndarray, backward: np.ndarray, fingerprint: str,
+                 metadata: Optional[Dict] = None):
+        self.__landmarks: np.ndarray = landmarks
+        self.__forward: np.ndarray = forward
+        self.__backward: np.ndarray = backward
+        self.__fingerprint: str = fingerprint
+        self.__metadata: Dict = metadata if metadata is not None else {}
+        # Flat views whose items index as Python floats, for the per-node bounds.
+        self.__values: Tuple[memoryview, memoryview] = (memoryview(np.ascontiguousarray(forward).reshape(-1)),
+                                                        memoryview(np.ascontiguousarray(backward).reshape(-1)))
+
+    @property
+    def landmarks(self) -> np.ndarray:
+        return self.__landmarks
+
+    @property
+    def fingerprint(self) -> str:
+        return self.__fingerprint
+
+    @property
+    def metadata(self) -> Dict:
+        return self.__metadata
+
+    def matches(self, graph: RoutingGraph) -> bool:
+        return len(self.__forward) == graph.node_count and graph_fingerprint(graph) == self.__fingerprint
+
+    def heuristic(self, target: int, source: Optional[int] = None, active: int = 6) -> Callable[[int], float]:
+        """Lower bound on the distance from a node to ``target``, computed when the search first reaches it.
+
+        With a ``source`` only the ``active`` landmark terms that bound the
+        source best are used, which keeps the per-node cost low; without one
+        every landmark is used.
+        """
+        count = len(self.__landmarks)
+        forward, backward = self.__forward, self.__backward
+        # A term is kept only when the target's distance is finite, so no inf - inf can occur;
+        # an infinite node distance then yields -inf (no information) or inf (unreachable).
+        if source is None:
+            to_source = from_source = [0.0] * count
+        else:
+            to_source, from_source = forward[source].tolist(), backward[source].tolist()
+        terms = []
+        for i, (to_target, from_target) in enumerate(zip(forward[target].tolist(), backward[target].tolist())):
+            if to_target != np.inf:
+                terms.append((to_target - to_source[i], 0, i, to_target))
+            if from_target != np.inf:
+                terms.append((from_source[i] - from_target, 1, i, from_target))
+        if source is not None:
+            terms = sorted(terms, reverse=True)[:active]
+        forward_terms = [(i, distance) for _, kind, i, distance in terms if kind == 0]
+        backward_terms = [(i, distance) for _, kind, i, distance in terms if kind == 1]
+        forward_values, backward_values = self.__values
+        bounds: Dict[int, float] = {}
+
+        def bound(node: int) -> float:
+            value = bounds.get(node)
+            if value is None:
+                row = node * count
+                value = 0.0
+                for i, to_target in forward_terms:
+                    difference = to_target - forward_values[row + i]
+                    if difference > value:
+                        value = difference
+                for i, from_target in backward_terms:
+                    difference = backward_values[row + i] - from_target
+                    if difference > value:
+                        value = difference
+                bounds[node] = value
+            return value
+        return bound
+
+    def save(self, filepath: str):
+        with open(filepath, 'wb') as file:
+            write_container(file, {
+                'fingerprint': np.frombuffer(self.__fingerprint.encode('ascii'), dtype=np.uint8),
+                'metadata': np.frombuffer(json.dumps(self.__metadata).encode('utf-8'), dtype=np.uint8),
+                'landmarks': np.asarray(self.__landmarks, dtype=np.int64),
+                'forward': np.ascontiguousarray(self.__forward, dtype=np.float64).ravel(),
+                'backward': np.ascontiguousarray(self.__backward, dtype=np.float64).ravel(),
+            }, LANDMARK_MAGIC)
+
+    @classmethod
+    def load(cls, filepath: str, memory_map: bool = True) -> 'LandmarkIndex':
+        with open(filepath, 'rb') as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if memory_map else file.read()
+        sections = read_container(buffer, LANDMARK_MAGIC)
+        count = len(sections['landmarks'])
+        return cls(sections['landmarks'], sections['forward'].reshape(-1, count),
+                   sections['backward'].reshape(-1, count), sections['fingerprint'].tobytes().decode('ascii'),
+                   json.loads(sections['metadata'].tobytes()))
+
+    @classmethod
+    def build(cls, graph: RoutingGraph, count: int = 16, seed: int = 0, processes: Optional[int] = None,
+              metadata: Optional[Dict] = None) -> 'LandmarkIndex':
+        """Pick up to ``count`` landmarks by farthest-point selection and tabulate their distances."""
+        lists = csr_views(graph.indptr, graph.indices, graph.weights)
+        node_count = graph.node_count
+        landmarks = []
+        rows = []
+        nearest = np.full(node_count, np.inf)
+        if node_count:
+            dist, _ = dijkstra(*lists, int(np.random.default_rng(seed).integers(node_count)))
+            candidate = max(dist, key=dist.get)
+        while len(landmarks) < min(count, node_count):
+            dist, _ = dijkstra(*lists, candidate)
+            row = np.full(node_count, np.inf)
+            row[list(dist.keys())] = list(dist.values())
+            landmarks.append(candidate)
+            rows.append(row)
+            nearest = np.minimum(nearest, row)
+            # Nodes no landmark reaches count as the farthest, so every component gets covered.
+            spread = np.where(np.isinf(nearest), np.finfo(np.float64).max, nearest)
+            spread[landmarks] = -1
+            candidate = int(np.argmax(spread))
+
+        tails = np.repeat(np.arange(node_count), np.diff(graph.indptr))
+        reverse = RoutingGraph.from_arcs(graph.indices, tails, graph.weights, node_count)
+        landmarks = np.asarray(landmarks, dtype=np.int64)
+        forward = np.array(rows).T.reshape(node_count, len(landmarks))
+        backward = np.asarray(distance_matrix(reverse, landmarks, processes=processes)).T.reshape(
+            node_count, len(landmarks))
+        return cls(landmarks, np.ascontiguousarray(forward), np.ascontiguousarray(backward),
+                   graph_fingerprint(graph), metadata)
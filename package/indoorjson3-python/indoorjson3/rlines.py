@@ -31,6 +31,8 @@ def type_check(func):
 
 class Rlines:
 
+    __slots__ = ('__id', '__cell', '__ins', '__outs', '__closure')
+
     @type_check
     def __init__(self, rlines_id: str, cell: str, ins: List[str], outs: List[str], closure: List[str]):
         self.__id: str = rlines_id
@@ -60,15 +62,27 @@ class Rlines:
         return self.__closure
 
     def to_json(self) -> Dict:
-        result = {}
-        for key, value in self.__dict__.items():
-            json_key = key.split('__')[-1]
-            if json_key == 'id':
-                json_key = '$id'
-            result[json_key] = value
-        return result
+        return {'$id': self.__id, 'cell': self.__cell, 'ins': self.__ins, 'outs': self.__outs, 'closure': self.__closure}
+
+    @classmethod
+    def from_raw(cls, rlines_id: str, cell: str, ins: List[str], outs: List[str], closure: List[str]) -> 'Rlines':
+        """Create an Rlines without type checks, for input that is known to be valid."""
+        rlines = cls.__new__(cls)
+        rlines.__id = rlines_id
+        rlines.__cell = cell
+        rlines.__ins = ins
+        rlines.__outs = outs
+        rlines.__closure = closure
+        return rlines
 
     @classmethod
     def from_json(cls, json_dict: Dict) -> 'Rlines':
         json_dict['rlines_id'] = json_dict.pop('$id')
         return cls(**json_dict)
+
+    @classmethod
+    def from_json_batch(cls, json_dicts: List[Dict], lazy: bool = False, trusted: bool = False) -> List['Rlines']:
+        if trusted:
+            return [cls.from_raw(json_dict['$id'], json_dict['cell'], json_dict['ins'], json_dict['outs'],
+                                 json_dict['closure']) for json_dict in json_dicts]
+        return [cls.from_json(json_dict) for json_dict in json_dicts]
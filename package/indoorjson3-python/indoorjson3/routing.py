@@ -0,0 +1,370 @@
+"""
+File Name: routing.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import bisect
+import heapq
+import os
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Per-process view of the graph shared by distance_matrix, set up by _init_worker.
+_worker_state: Dict = {}
+
+
+def dijkstra(indptr: Sequence[int], indices: Sequence[int], weights: Sequence[float], source: int,
+             target: int = -1, limit: int = 0) -> Tuple[Dict[int, float], Dict[int, int]]:
+    """Single-source shortest paths over a CSR graph.
+
+    Returns the settled distances and, for every settled node except the
+    source, the arc slot it was reached through. The search stops once
+    ``target`` is settled or ``limit`` nodes have been settled.
+    """
+    dist = {source: 0.0}
+    arcs = {}
+    settled = {}
+    heap = [(0.0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if u in settled:
+            continue
+        settled[u] = d
+        if u == target or len(settled) == limit:
+            break
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            nd = d + weights[k]
+            if nd < dist.get(v, np.inf):
+                dist[v] = nd
+                arcs[v] = k
+                heapq.heappush(heap, (nd, v))
+    return settled, {v: arcs[v] for v in settled if v in arcs}
+
+
+def astar(indptr: Sequence[int], indices: Sequence[int], weights: Sequence[float], source: int, target: int,
+          heuristic: Callable[[int], float]) -> Tuple[Dict[int, float], Dict[int, int]]:
+    """A* search with a consistent lower bound ``heuristic(node)`` on the distance to ``target``.
+
+    Returns the same ``(settled, arcs)`` pair as ``dijkstra``.
+    """
+    dist = {source: 0.0}
+    arcs = {}
+    settled = {}
+    heap = [(heuristic(source), 0.0, source)]
+    while heap:
+        _, d, u = heapq.heappop(heap)
+        if u in settled:
+            continue
+        settled[u] = d
+        if u == target:
+            break
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            nd = d + weights[k]
+            if nd < dist.get(v, np.inf):
+                h = heuristic(v)
+                if h == np.inf:
+                    continue
+                dist[v] = nd
+                arcs[v] = k
+                heapq.heappush(heap, (nd + h, nd, v))
+    return settled, {v: arcs[v] for v in settled if v in arcs}
+
+
+def csr_views(indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray) -> Tuple[memoryview, ...]:
+    """Views of CSR arrays whose items index as Python ints and floats, as fast as lists but without a copy."""
+    return (memoryview(np.ascontiguousarray(indptr, dtype=np.int64)),
+            memoryview(np.ascontiguousarray(indices, dtype=np.int64)),
+            memoryview(np.ascontiguousarray(weights, dtype=np.float64)))
+
+
+class RoutingGraph:
+    """Directed weighted graph in CSR layout.
+
+    Arc ``k`` runs from the node whose ``indptr`` range holds ``k`` to
+    ``indices[k]`` and carries ``edges[k]``, the connection position it
+    stands for. Searches index the arrays in place, so a graph over
+    memory-mapped arrays adds no per-process copy. Complete search trees are
+    kept in a small LRU cache so repeated queries from the same source skip
+    the search.
+    """
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray, edges: np.ndarray,
+                 cache_size: int = 64):
+        self.__indptr: np.ndarray = indptr
+        self.__indices: np.ndarray = indices
+        self.__weights: np.ndarray = weights
+        self.__edges: np.ndarray = edges
+        self.__views = csr_views(indptr, indices, weights)
+        self.__cache_size: int = cache_size
+        self.__trees: 'OrderedDict[int, Tuple[Dict[int, float], Dict[int, int]]]' = OrderedDict()
+        self.__paths: 'OrderedDict[Tuple[int, int], Tuple[float, List[int], List[int]]]' = OrderedDict()
+        self.__landmarks = None
+
+    @property
+    def indptr(self) -> np.ndarray:
+        return self.__indptr
+
+    @property
+    def indices(self) -> np.ndarray:
+        return self.__indices
+
+    @property
+    def weights(self) -> np.ndarray:
+        return self.__weights
+
+    @property
+    def edges(self) -> np.ndarray:
+        return self.__edges
+
+    @property
+    def node_count(self) -> int:
+        return len(self.__indptr) - 1
+
+    @property
+    def landmarks(self):
+        return self.__landmarks
+
+    def set_landmarks(self, landmarks):
+        """Use a landmark index (anything with ``heuristic(target, source)``) for point-to-point A* queries."""
+        self.__landmarks = landmarks
+
+    def shortest_path(self, source: int, target: int) -> Tuple[float, List[int], List[int]]:
+        """Distance, node positions and connection positions of a shortest path; ``inf`` when unreachable."""
+        key = (source, target)
+        if key in self.__paths:
+            self.__paths.move_to_end(key)
+            return self.__paths[key]
+        if source in self.__trees:
+            dist, arcs = self.__trees[source]
+        elif self.__landmarks is not None:
+            dist, arcs = astar(*self.__views, source, target, self.__landmarks.heuristic(target, source))
+        else:
+            dist, arcs = dijkstra(*self.__views, source, target=target)
+        if target in dist:
+            result = (dist[target],) + self.__trace(arcs, source, target)
+        else:
+            result = (np.inf, [], [])
+        self.__remember(self.__paths, key, result)
+        return result
+
+    def shortest_distances(self, source: int) -> Dict[int, float]:
+        """Distances from ``source`` to every reachable node."""
+        return self.__tree(source)[0]
+
+    def nearest(self, source: int, k: int) -> List[Tuple[int, float]]:
+        """The ``k`` closest reachable nodes other than ``source``, nearest first."""
+        if source in self.__trees:
+            dist = self.__trees[source][0]
+            return heapq.nsmallest(k, ((v, d) for v, d in dist.items() if v != source), key=lambda item: item[1])
+        dist, _ = dijkstra(*self.__views, source, limit=k + 1)
+        return [(v, d) for v, d in dist.items() if v != source]
+
+    def __tree(self, source: int) -> Tuple[Dict[int, float], Dict[int, int]]:
+        if source in self.__trees:
+            self.__trees.move_to_end(source)
+            return self.__trees[source]
+        tree = dijkstra(*self.__views, source)
+        self.__remember(self.__trees, source, tree)
+        return tree
+
+    def __trace(self, arcs: Dict[int, int], source: int, target: int) -> Tuple[List[int], List[int]]:
+        nodes = [target]
+        edges = []
+        node = target
+        while node != source:
+            arc = arcs[node]
+            edges.append(int(self.__edges[arc]))
+            node = bisect.bisect_right(self.__views[0], arc) - 1
+            nodes.append(node)
+        return nodes[::-1], edges[::-1]
+
+    def __remember(self, cache: OrderedDict, key, value):
+        cache[key] = value
+        if len(cache) > self.__cache_size:
+            cache.popitem(last=False)
+
+    @classmethod
+    def from_arcs(cls, tails: np.ndarray, heads: np.ndarray, weights: np.ndarray, node_count: int,
+                  edges: Optional[np.ndarray] = None) -> 'RoutingGraph':
+        weights = np.asarray(weights, dtype=np.float64)
+        if len(weights) and (np.isnan(weights).any() or weights.min() < 0):
+            raise ValueError('Routing weights must be non-negative numbers')
+        if edges is None:
+            edges = np.arange(len(tails), dtype=np.int64)
+        order = np.argsort(tails, kind='stable')
+        indptr = np.zeros(node_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(tails, minlength=node_count), out=indptr[1:])
+        return cls(indptr, np.asarray(heads, dtype=np.int64)[order], weights[order], np.asarray(edges)[order])
+
+    @classmethod
+    def from_endpoints(cls, sources: np.ndarray, targets: np.ndarray, weights: np.ndarray, node_count: int,
+                       directed: bool = True) -> 'RoutingGraph':
+        edges = np.arange(len(sources), dtype=np.int64)
+        if not directed:
+            sources, targets = np.concatenate((sources, targets)), np.concatenate((targets, sources))
+            weights = np.concatenate((weights, weights))
+            edges = np.concatenate((edges, edges))
+        return cls.from_arcs(sources, targets, weights, node_count, edges)
+
+
+def build_transition_graph(sources: np.ndarray, targets: np.ndarray, door_points: np.ndarray,
+                           cell_points: np.ndarray, closures: np.ndarray,
+                           door_weights: Optional[np.ndarray] = None) -> RoutingGraph:
+    """Door-to-door graph whose arcs are the permitted transitions through each cell.
+
+    With M connections and N cells, node ``i < M`` is connection ``i``, node
+    ``M + c`` leaves cell ``c`` through any of its outgoing connections and
+    node ``M + N + c`` is reached from any connection entering cell ``c``.
+    A transition from connection ``a`` into cell ``c`` on to connection ``b``
+    out of ``c`` is an arc unless ``(a, b)`` is listed in ``closures``. Arcs
+    cost the straight distance between door points, or ``door_weights[b]``.
+    """
+    door_count = len(sources)
+    cell_count = len(cell_points)
+    in_order = np.argsort(targets, kind='stable')
+    out_order = np.argsort(sources, kind='stable')
+    out_counts = np.bincount(sources, minlength=cell_count)
+    out_starts = np.zeros(cell_count + 1, dtype=np.int64)
+    np.cumsum(out_counts, out=out_starts[1:])
+
+    # Pair every door entering a cell with every door leaving it.
+    repeats = out_counts[targets[in_order]]
+    tails = np.repeat(in_order, repeats)
+    block_starts = np.repeat(np.cumsum(repeats) - repeats, repeats)
+    slots = out_starts[targets[tails]] + np.arange(len(tails)) - block_starts
+    heads = out_order[slots]
+    keep = tails != heads
+    if len(closures):
+        keep &= ~np.isin(tails * door_count + heads, closures[:, 0] * door_count + closures[:, 1])
+    tails, heads = tails[keep], heads[keep]
+    if door_weights is None:
+        weights = np.hypot(*(door_points[heads] - door_points[tails]).T)
+    else:
+        weights = door_weights[heads]
+
+    cells = np.arange(cell_count, dtype=np.int64)
+    doors = np.arange(door_count, dtype=np.int64)
+    origin_weights = np.hypot(*(door_points - cell_points[sources]).T) if door_weights is None else door_weights
+    arrival_weights = np.hypot(*(cell_points[targets] - door_points).T) if door_weights is None \
+        else np.zeros(door_count)
+    return RoutingGraph.from_arcs(
+        np.concatenate((tails, door_count + sources, doors)),
+        np.concatenate((heads, doors, door_count + cell_count + targets)),
+        np.concatenate((weights, origin_weights, arrival_weights)),
+        door_count + 2 * cell_count,
+        np.concatenate((heads, doors, np.full(door_count, -1, dtype=np.int64))))
+
+
+def distance_matrix(graph: RoutingGraph, sources: Sequence[int], targets: Optional[Sequence[int]] = None,
+                    processes: Optional[int] = None, out: Optional[str] = None) -> np.ndarray:
+    """Shortest distances from every source (rows) to every target (columns); ``inf`` when unreachable.
+
+    Sources are spread over a process pool. The CSR arrays are placed in shared
+    memory once and attached by each worker instead of being pickled per task.
+    Rows are written straight into a shared result block, or into the
+    ``out`` file as a ``float64`` memory map which is then returned.
+    """
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.arange(graph.node_count, dtype=np.int64) if targets is None else np.asarray(targets, dtype=np.int64)
+    # Rows are searched per distinct target and gathered back, so a repeated target fills all of its columns.
+    distinct, inverse = np.unique(targets, return_inverse=True)
+    columns = np.full(graph.node_count, -1, dtype=np.int64)
+    columns[distinct] = np.arange(len(distinct))
+    shape = (len(sources), len(targets))
+    processes = processes or os.cpu_count() or 1
+
+    if processes == 1 or len(sources) < 2:
+        result = np.memmap(out, dtype=np.float64, mode='w+', shape=shape) if out else np.empty(shape)
+        _compute_rows(csr_views(graph.indptr, graph.indices, graph.weights), columns, inverse, result, 0,
+                      sources.tolist())
+        return result
+
+    blocks = []
+    try:
+        arrays = {}
+        for name, array in (('indptr', graph.indptr), ('indices', graph.indices), ('weights', graph.weights),
+                            ('columns', columns), ('inverse', inverse)):
+            block = SharedMemory(create=True, size=max(array.nbytes, 1))
+            blocks.append(block)
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+            arrays[name] = (block.name, array.shape, array.dtype.str)
+        if out:
+            np.memmap(out, dtype=np.float64, mode='w+', shape=shape).flush()
+            target = ('file', out, shape)
+        else:
+            block = SharedMemory(create=True, size=max(8 * shape[0] * shape[1], 1))
+            blocks.append(block)
+            target = ('shm', block.name, shape)
+
+        chunk = max(1, len(sources) // (4 * processes))
+        with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(arrays, target)) as executor:
+            for future in [executor.submit(_fill_rows, start, sources[start:start + chunk].tolist())
+                           for start in range(0, len(sources), chunk)]:
+                future.result()
+
+        if out:
+            return np.memmap(out, dtype=np.float64, mode='r+', shape=shape)
+        return np.ndarray(shape, dtype=np.float64, buffer=blocks[-1].buf).copy()
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def _init_worker(arrays: Dict, target: Tuple):
+    views = {}
+    for key, (name, shape, dtype) in arrays.items():
+        block = SharedMemory(name=name)
+        _worker_state.setdefault('blocks', []).append(block)
+        views[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+    _worker_state['graph'] = csr_views(views['indptr'], views['indices'], views['weights'])
+    _worker_state['columns'] = views['columns']
+    _worker_state['inverse'] = views['inverse']
+    kind, location, shape = target
+    if kind == 'file':
+        _worker_state['result'] = np.memmap(location, dtype=np.float64, mode='r+', shape=shape)
+    else:
+        block = SharedMemory(name=location)
+        _worker_state['blocks'].append(block)
+        _worker_state['result'] = np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+
+
+def _fill_rows(start: int, sources: List[int]):
+    _compute_rows(_worker_state['graph'], _worker_state['columns'], _worker_state['inverse'], _worker_state['result'],
+                  start, sources)
+
+
+def _compute_rows(views: Tuple[Sequence, Sequence, Sequence], columns: np.ndarray, inverse: np.ndarray,
+                  result: np.ndarray, start: int, sources: List[int]):
+    # Distinct targets number at most len(inverse), so one buffer of that size holds a row by distinct column.
+    reached = np.empty(len(inverse))
+    for row, source in enumerate(sources, start):
+        dist, _ = dijkstra(*views, source)
+        nodes = np.fromiter(dist.keys(), dtype=np.int64, count=len(dist))
+        values = np.fromiter(dist.values(), dtype=np.float64, count=len(dist))
+        found = columns[nodes]
+        reached.fill(np.inf)
+        reached[found[found >= 0]] = values[found >= 0]
+        result[row] = reached[inverse]
+    if isinstance(result, np.memmap):
+        result.flush()
+
+
+def connection_weights(connections, lengths: np.ndarray, weight: Optional[str] = None) -> np.ndarray:
+    """Edge geometry lengths, or the numeric ``weight`` property of every connection."""
+    if weight is None:
+        return lengths
+    try:
+        return np.fromiter((connection.properties[weight] for connection in connections),
+                           dtype=np.float64, count=len(connections))
+    except KeyError:
+        raise ValueError(f'Every connection needs a "{weight}" property to route by it')
@@ -7,18 +7,110 @@ Author: Ziwei Xiang <knightzz1016@gmail.com>
 Create Date: 2024/3/13
 """
 
+import gzip
 import json
-from indoorjson3.indoorspace import IndoorSpace
+import os
+from typing import BinaryIO, Iterable, Iterator, Optional, TextIO, Union
+from indoorjson3.binary import BINARY_SUFFIX, dump_binary, is_binary, load_binary
+from indoorjson3.cell import Cell
+from indoorjson3.connection import Connection
+from indoorjson3.indoorspace import IndoorSpace, BUILTIN_SECTIONS, FEATURE_TYPES, decode_json_items
+from indoorjson3.instrumentation import timed_stage
+from indoorjson3.jsonstream import JsonStreamReader
+from indoorjson3.landmarks import LandmarkIndex, landmark_path
 
 
-def serialization(filepath: str, indoorspace: IndoorSpace):
-    indoorSpace_jsondata = json.dumps(indoorspace.to_json(), indent=4, ensure_ascii=False)
-    with open(filepath, 'w', encoding='utf-8') as file:
-        file.write(indoorSpace_jsondata)
-    return indoorSpace_jsondata
+def serialization(filepath: Union[str, os.PathLike, TextIO, BinaryIO], indoorspace: IndoorSpace,
+                  indent: Optional[int] = 4, fmt: Optional[str] = None):
+    """Write ``indoorspace`` as IndoorJSON feature by feature.
 
+    ``filepath`` may be a path (gzip-compressed when it ends with ``.gz``) or an
+    open text stream. ``indent=None`` writes compact output without whitespace.
+    ``fmt='binary'``, or a path ending with ``.ij3b``, selects the binary format
+    instead; it expects a binary stream when one is given.
+    """
+    if isinstance(filepath, (str, os.PathLike)):
+        filepath = os.fspath(filepath)
+    if fmt is None:
+        fmt = 'binary' if isinstance(filepath, str) and filepath.endswith(BINARY_SUFFIX) else 'json'
+    if fmt not in ('binary', 'json'):
+        raise ValueError(f'Unknown IndoorJSON format: {fmt}')
+    with timed_stage(f'serialization.{fmt}', len(indoorspace.cells) + len(indoorspace.connections)):
+        if fmt == 'binary':
+            dump_binary(filepath, indoorspace)
+        elif isinstance(filepath, str):
+            with _open_text(filepath, 'w') as file:
+                _write_json(file, indoorspace, indent)
+        else:
+            _write_json(filepath, indoorspace, indent)
 
-def deserialization(filepath: str) -> IndoorSpace:
-    with open(filepath, 'r', encoding='utf-8') as file:
-        indoorSpace_str = file.read()
-    return IndoorSpace().from_json(indoorSpace_str)
+
+def deserialization(filepath: Union[str, os.PathLike], streaming: bool = False, lazy: bool = False,
+                    landmarks: bool = False, strict: bool = False, trusted: bool = False) -> IndoorSpace:
+    """Read an IndoorJSON file, detecting the binary format from its magic bytes.
+
+    ``lazy=True`` keeps geometries as WKT/WKB and parses them on first access.
+    ``landmarks=True`` memory-maps the routing index saved next to the file,
+    if there is one. ``strict`` and ``trusted`` apply to both formats as in
+    ``IndoorSpace.from_json``.
+    """
+    filepath = os.fspath(filepath)
+    if is_binary(filepath):
+        with timed_stage('deserialization.binary', lazy=lazy):
+            indoorspace = load_binary(filepath, lazy=lazy, strict=strict, trusted=trusted)
+    elif streaming:
+        with timed_stage('deserialization.streaming', lazy=lazy), _open_text(filepath, 'r') as file:
+            reader = JsonStreamReader(file)
+            indoorspace = IndoorSpace.from_json_items(reader.items(), lazy=lazy, strict=strict, trusted=trusted,
+                                                      keys=reader.keys)
+    else:
+        with timed_stage('deserialization.read') as stage, _open_text(filepath, 'r') as file:
+            indoorSpace_str = file.read()
+            stage.add(len(indoorSpace_str))
+        with timed_stage('deserialization.json', lazy=lazy, trusted=trusted):
+            indoorspace = IndoorSpace.from_json(indoorSpace_str, lazy=lazy, strict=strict, trusted=trusted)
+    if landmarks and os.path.exists(landmark_path(filepath)):
+        indoorspace.set_landmark_index(LandmarkIndex.load(landmark_path(filepath)))
+    return indoorspace
+
+
+def iter_deserialization(filepath: Union[str, os.PathLike], sections: Iterable[str] = ('cells', 'connections'),
+                         lazy: bool = False) -> Iterator[Union[Cell, Connection]]:
+    """Yield features of the given sections in file order without building an IndoorSpace."""
+    sections = set(sections)
+    with _open_text(os.fspath(filepath), 'r') as file:
+        items = ((key, value) for key, value in JsonStreamReader(file).items() if key in sections)
+        for key, feature in decode_json_items(items, lazy=lazy):
+            if key in FEATURE_TYPES:
+                yield feature
+
+
+def _open_text(filepath: str, mode: str) -> TextIO:
+    if filepath.endswith('.gz'):
+        return gzip.open(filepath, mode + 't', encoding='utf-8')
+    return open(filepath, mode, encoding='utf-8')
+
+
+def _write_json(file: TextIO, indoorspace: IndoorSpace, indent: Optional[int]):
+    if indent is None:
+        encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+        outer, inner, key_separator = '', '', ':'
+    else:
+        encoder = json.JSONEncoder(ensure_ascii=False, indent=indent)
+        outer, inner, key_separator = '\n' + ' ' * indent, '\n' + ' ' * (2 * indent), ': '
+
+    sections = [(key, getattr(indoorspace, key)) for key in BUILTIN_SECTIONS]
+    sections.extend(getattr(indoorspace, 'extensions', {}).items())
+    file.write('{')
+    for n, (key, value) in enumerate(sections):
+        file.write((',' if n else '') + outer + encoder.encode(key) + key_separator)
+        if key == 'properties':
+            file.write(encoder.encode(value).replace('\n', outer))
+        elif not value:
+            file.write('[]')
+        else:
+            file.write('[')
+            for i, item in enumerate(value):
+                file.write((',' if i else '') + inner + encoder.encode(item.to_json()).replace('\n', inner))
+            file.write(outer + ']')
+    file.write('\n}' if indent is not None else '}')
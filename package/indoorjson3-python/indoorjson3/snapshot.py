@@ -0,0 +1,407 @@
+"""
+File Name: snapshot.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import json
+import mmap
+import os
+import numpy as np
+import shapely
+from collections.abc import Sequence
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from indoorjson3.binary import decode_extensions, decode_sections, encode_sections, read_container, write_container
+from indoorjson3.cell import Cell
+from indoorjson3.connection import Connection
+from indoorjson3.geometry import GeometryArray
+from indoorjson3.incidence import IncidenceMatrix
+from indoorjson3.indoorspace import BUILTIN_SECTIONS, CELL_GEOMETRY_FIELDS, FEATURE_TYPES, IndoorSpace
+from indoorjson3.landmarks import LandmarkIndex
+from indoorjson3.layer import Layer
+from indoorjson3.rlines import Rlines
+from indoorjson3.routing import RoutingGraph, build_transition_graph, connection_weights, distance_matrix
+from indoorjson3.spatial import SpatialIndex
+
+SNAPSHOT_MAGIC = b'IJ3S'
+SNAPSHOT_SUFFIX = '.ij3s'
+# Sections dump_snapshot derives from the building; a file without them was not written by this version.
+SNAPSHOT_SECTIONS = ('connections.source', 'connections.target', 'incidence.indptr', 'incidence.indices',
+                     'incidence.data', 'routing.indptr', 'routing.indices', 'routing.weights', 'routing.edges',
+                     'cells.id.sorted', 'connections.id.sorted')
+
+
+def dump_snapshot(filepath: Union[str, os.PathLike], indoorspace: IndoorSpace):
+    """Write a read-only snapshot: the binary sections plus adjacency, incidence, routing and id lookups."""
+    sections = encode_sections(indoorspace)
+    sources, targets = indoorspace.get_connection_endpoints()
+    sections['connections.source'] = np.asarray(sources, dtype=np.int64)
+    sections['connections.target'] = np.asarray(targets, dtype=np.int64)
+    incidence = indoorspace.get_incident_matrix()
+    sections['incidence.indptr'] = np.asarray(incidence.indptr, dtype=np.int64)
+    sections['incidence.indices'] = np.asarray(incidence.indices, dtype=np.int64)
+    sections['incidence.data'] = np.asarray(incidence.data, dtype=np.int8)
+    graph = indoorspace.get_routing_graph()
+    for name in ('indptr', 'indices', 'weights', 'edges'):
+        sections[f'routing.{name}'] = getattr(graph, name)
+    sections['cells.id.sorted'] = _sorted_ids(cell.id for cell in indoorspace.cells)
+    sections['connections.id.sorted'] = _sorted_ids(connection.id for connection in indoorspace.connections)
+    with open(filepath, 'wb') as file:
+        write_container(file, sections, SNAPSHOT_MAGIC)
+
+
+def load_snapshot(filepath: Union[str, os.PathLike],
+                  source: Optional[Union[str, os.PathLike]] = None) -> 'IndoorSnapshot':
+    """Memory-map a snapshot read-only; nothing is decoded until it is asked for.
+
+    ``source`` names the file the snapshot was made from; a snapshot older
+    than it is rejected rather than served stale.
+    """
+    if source is not None and os.path.getmtime(source) > os.path.getmtime(filepath):
+        raise ValueError(f'Snapshot {os.fspath(filepath)} is older than {os.fspath(source)}')
+    with open(filepath, 'rb') as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    sections = read_container(buffer, SNAPSHOT_MAGIC)
+    missing = [name for name in SNAPSHOT_SECTIONS if name not in sections]
+    if missing:
+        raise ValueError(f'Snapshot is missing sections {missing}; write it again with dump_snapshot')
+    return IndoorSnapshot(sections)
+
+
+class SnapshotFeatures(Sequence):
+    """Read-only sequence that builds each feature from the snapshot on access."""
+
+    __slots__ = ('__count', '__factory')
+
+    def __init__(self, count: int, factory: Callable[[int], object]):
+        self.__count: int = count
+        self.__factory: Callable[[int], object] = factory
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.__factory(i) for i in range(*index.indices(self.__count))]
+        if index < 0:
+            index += self.__count
+        if not 0 <= index < self.__count:
+            raise IndexError('feature index out of range')
+        return self.__factory(index)
+
+    def __iter__(self) -> Iterator:
+        return map(self.__factory, range(self.__count))
+
+
+class IndoorSnapshot:
+    """Read-only IndoorSpace backed by a memory-mapped snapshot file.
+
+    It answers the same queries as IndoorSpace but has no mutators.
+
+    Every array is a view into the mapping, so processes that open the same
+    file share one copy through the page cache. Cells and connections are
+    built on access as lazy features whose WKB is parsed when touched; they
+    are not cached, so a worker's own memory stays proportional to what it
+    uses. Ids are found by binary search over a sorted position array.
+    """
+
+    def __init__(self, sections: Dict[str, np.ndarray]):
+        self.__sections: Dict[str, np.ndarray] = sections
+        self.__strings: Tuple[np.ndarray, np.ndarray] = (sections['strings.offsets'], sections['strings.data'])
+        self.__properties: Optional[Dict] = None
+        self.__layers: Optional[List[Layer]] = None
+        self.__rlineses: Optional[List[Rlines]] = None
+        self.__extensions: Optional[Dict[str, List]] = None
+        self.__geometries: Dict[str, GeometryArray] = {}
+        self.__routing_graphs: Dict[Tuple[Optional[str], bool], RoutingGraph] = {}
+        self.__transition_graphs: Dict[Optional[str], RoutingGraph] = {}
+        self.__spatial_index: Optional[SpatialIndex] = None
+
+    @property
+    def properties(self) -> Dict:
+        if self.__properties is None:
+            self.__properties = json.loads(self.__sections['properties'].tobytes())
+        return self.__properties
+
+    @property
+    def cells(self) -> SnapshotFeatures:
+        return SnapshotFeatures(len(self.__sections['cells.id']), self.__cell)
+
+    @property
+    def connections(self) -> SnapshotFeatures:
+        return SnapshotFeatures(len(self.__sections['connections.id']), self.__connection)
+
+    @property
+    def layers(self) -> List[Layer]:
+        if self.__layers is None:
+            self.__layers = [Layer.from_json(item) for item in json.loads(self.__sections['layers'].tobytes())]
+        return self.__layers
+
+    @property
+    def rlineses(self) -> List[Rlines]:
+        if self.__rlineses is None:
+            self.__rlineses = [Rlines.from_json(item) for item in json.loads(self.__sections['rlineses'].tobytes())]
+        return self.__rlineses
+
+    @property
+    def extensions(self) -> Dict[str, List]:
+        """Features of registered extension sections, keyed by section; decoded on first access."""
+        if self.__extensions is None:
+            self.__extensions = decode_extensions(self.__sections)
+        return self.__extensions
+
+    def get_section(self, key: str):
+        if key not in FEATURE_TYPES:
+            raise ValueError(f'Unknown IndoorJSON section: {key}')
+        if key in BUILTIN_SECTIONS:
+            return getattr(self, key)
+        return self.extensions.get(key, [])
+
+    def get_cell_index(self, cell_id) -> int:
+        index = self.__search('cells', cell_id)
+        if index < 0:
+            raise KeyError(cell_id)
+        return index
+
+    def get_connection_index(self, connection_id) -> int:
+        index = self.__search('connections', connection_id)
+        if index < 0:
+            raise KeyError(connection_id)
+        return index
+
+    def get_cell_from_id(self, cell_id) -> Optional[Cell]:
+        index = self.__search('cells', cell_id)
+        return self.__cell(index) if index >= 0 else None
+
+    def get_connection_from_id(self, connection_id) -> Optional[Connection]:
+        index = self.__search('connections', connection_id)
+        return self.__connection(index) if index >= 0 else None
+
+    def get_cell_positions(self, cell_ids: Iterable[str]) -> np.ndarray:
+        """Positions of the given cells in ``cells``, skipping ids that do not exist."""
+        positions = (self.__search('cells', cell_id) for cell_id in cell_ids)
+        return np.fromiter((i for i in positions if i >= 0), dtype=np.int64)
+
+    def get_layer(self, layer_id: str) -> Optional[Layer]:
+        for layer in self.layers:
+            if layer.id == layer_id:
+                return layer
+        return None
+
+    def get_connection_endpoints(self) -> Tuple[np.ndarray, np.ndarray]:
+        return self.__sections['connections.source'], self.__sections['connections.target']
+
+    def get_incident_matrix(self, dense: bool = False):
+        sections = self.__sections
+        incidence = IncidenceMatrix(sections['incidence.indptr'], sections['incidence.indices'],
+                                    sections['incidence.data'],
+                                    (len(sections['cells.id']), len(sections['connections.id'])))
+        if dense:
+            return incidence.toarray()
+        return incidence
+
+    def get_hypergraph_incidence_matrix(self, dense: bool = False):
+        if dense:
+            return self.get_incident_matrix(dense=True).T
+        return self.get_incident_matrix().T
+
+    def get_geometry_array(self, field: str) -> GeometryArray:
+        if field not in self.__geometries:
+            prefix = 'cells' if field in CELL_GEOMETRY_FIELDS else 'connections'
+            if f'{prefix}.{field}.offsets' not in self.__sections:
+                raise ValueError(f'Unknown geometry field: {field}')
+            blobs = [self.__blob(f'{prefix}.{field}', i) for i in range(len(self.__sections[f'{prefix}.id']))]
+            self.__geometries[field] = GeometryArray.from_geometries(shapely.from_wkb(np.array(blobs, dtype=object)))
+        return self.__geometries[field]
+
+    def get_cell_areas(self) -> np.ndarray:
+        return self.get_geometry_array('space').area()
+
+    def get_cell_bounds(self) -> np.ndarray:
+        return self.get_geometry_array('space').bounds()
+
+    def get_cell_centroids(self) -> np.ndarray:
+        return self.get_geometry_array('space').centroid()
+
+    def get_connection_centroids(self) -> np.ndarray:
+        return self.get_geometry_array('bound').centroid()
+
+    def get_connection_lengths(self) -> np.ndarray:
+        return self.get_geometry_array('edge').length()
+
+    def get_spatial_index(self) -> SpatialIndex:
+        if self.__spatial_index is None:
+            self.__spatial_index = SpatialIndex(self.get_geometry_array('space').values,
+                                                self.get_geometry_array('bound').values)
+        return self.__spatial_index
+
+    def locate_cells(self, points: np.ndarray) -> List[Optional[Cell]]:
+        return [self.__cell(i) if i >= 0 else None for i in self.get_spatial_index().locate_points(points).tolist()]
+
+    def locate_cell(self, x: float, y: float) -> Optional[Cell]:
+        return self.locate_cells(np.array([[x, y]]))[0]
+
+    def get_routing_graph(self, weight: Optional[str] = None, directed: bool = True) -> RoutingGraph:
+        key = (weight, directed)
+        if key not in self.__routing_graphs:
+            sections = self.__sections
+            if key == (None, True):
+                graph = RoutingGraph(sections['routing.indptr'], sections['routing.indices'],
+                                     sections['routing.weights'], sections['routing.edges'])
+            else:
+                sources, targets = self.get_connection_endpoints()
+                lengths = self.get_connection_lengths() if weight is None else None
+                weights = connection_weights(self.connections, lengths, weight)
+                graph = RoutingGraph.from_endpoints(sources, targets, weights, len(sections['cells.id']), directed)
+            self.__routing_graphs[key] = graph
+        return self.__routing_graphs[key]
+
+    def shortest_path(self, source_id: str, target_id: str, weight: Optional[str] = None,
+                      directed: bool = True) -> Tuple[float, List[str]]:
+        graph = self.get_routing_graph(weight, directed)
+        distance, nodes, _ = graph.shortest_path(self.get_cell_index(source_id), self.get_cell_index(target_id))
+        return distance, [self.__string('cells.id', i) for i in nodes]
+
+    def shortest_distances(self, source_id: str, target_ids: Optional[Iterable[str]] = None,
+                           weight: Optional[str] = None, directed: bool = True) -> Dict[str, float]:
+        dist = self.get_routing_graph(weight, directed).shortest_distances(self.get_cell_index(source_id))
+        if target_ids is None:
+            return {self.__string('cells.id', i): d for i, d in dist.items()}
+        return {target_id: dist.get(self.get_cell_index(target_id), np.inf) for target_id in target_ids}
+
+    def nearest_reachable_cells(self, source_id: str, k: int, weight: Optional[str] = None,
+                                directed: bool = True) -> List[Tuple[str, float]]:
+        nearest = self.get_routing_graph(weight, directed).nearest(self.get_cell_index(source_id), k)
+        return [(self.__string('cells.id', i), d) for i, d in nearest]
+
+    def build_landmark_index(self, count: int = 16, weight: Optional[str] = None, directed: bool = True,
+                             processes: Optional[int] = None) -> LandmarkIndex:
+        graph = self.get_routing_graph(weight, directed)
+        index = LandmarkIndex.build(graph, count, processes=processes,
+                                    metadata={'weight': weight, 'directed': directed})
+        graph.set_landmarks(index)
+        return index
+
+    def set_landmark_index(self, index: LandmarkIndex):
+        graph = self.get_routing_graph(index.metadata.get('weight'), index.metadata.get('directed', True))
+        if not index.matches(graph):
+            raise ValueError('Landmark index was built for a different routing graph')
+        graph.set_landmarks(index)
+
+    def get_distance_matrix(self, source_ids: Optional[Iterable[str]] = None,
+                            target_ids: Optional[Iterable[str]] = None, weight: Optional[str] = None,
+                            directed: bool = True, processes: Optional[int] = None,
+                            out: Optional[str] = None) -> np.ndarray:
+        sources = range(len(self.__sections['cells.id'])) if source_ids is None \
+            else [self.get_cell_index(i) for i in source_ids]
+        targets = None if target_ids is None else [self.get_cell_index(i) for i in target_ids]
+        return distance_matrix(self.get_routing_graph(weight, directed), sources, targets, processes, out)
+
+    def get_transition_graph(self, weight: Optional[str] = None) -> RoutingGraph:
+        if weight not in self.__transition_graphs:
+            pairs = [(self.__search('connections', pair[0]), self.__search('connections', pair[1]))
+                     for rlines in self.rlineses for pair in rlines.closure]
+            closures = np.array([pair for pair in pairs if pair[0] >= 0 and pair[1] >= 0],
+                                dtype=np.int64).reshape(-1, 2)
+            door_weights = None if weight is None else connection_weights(self.connections, None, weight)
+            sources, targets = self.get_connection_endpoints()
+            self.__transition_graphs[weight] = build_transition_graph(
+                sources, targets, self.get_connection_centroids(), self.get_geometry_array('node').centroid(),
+                closures, door_weights)
+        return self.__transition_graphs[weight]
+
+    def shortest_rlines_path(self, source_id: str, target_id: str,
+                             weight: Optional[str] = None) -> Tuple[float, List[str], List[str]]:
+        source, target = self.get_cell_index(source_id), self.get_cell_index(target_id)
+        if source == target:
+            return 0.0, [source_id], []
+        door_count = len(self.__sections['connections.id'])
+        graph = self.get_transition_graph(weight)
+        distance, nodes, _ = graph.shortest_path(door_count + source,
+                                                 door_count + len(self.__sections['cells.id']) + target)
+        doors = nodes[1:-1]
+        if not doors:
+            return distance, [], []
+        return (distance, [source_id] + [self.__string('connections.to', i) for i in doors],
+                [self.__string('connections.id', i) for i in doors])
+
+    def shortest_door_path(self, source_id: str, target_id: str,
+                           weight: Optional[str] = None) -> Tuple[float, List[str]]:
+        graph = self.get_transition_graph(weight)
+        distance, nodes, _ = graph.shortest_path(self.get_connection_index(source_id),
+                                                 self.get_connection_index(target_id))
+        return distance, [self.__string('connections.id', i) for i in nodes]
+
+    def get_hypergraph(self) -> Dict:
+        incidence = self.get_incident_matrix()
+        closures = {}
+        for rlines in self.rlineses:
+            closures.setdefault(rlines.cell, rlines.closure)
+        hyperEdges = []
+        for i, cell in enumerate(self.cells):
+            columns, signs = incidence.row(i)
+            ids = [self.__string('connections.id', c) for c in columns.tolist()]
+            hyperEdge = {
+                'id': cell.id,
+                'properties': cell.properties,
+                'space': cell.space.wkt,
+                'node': cell.node.wkt,
+                'inner_nodeset': {'ins': [c for c, s in zip(ids, signs.tolist()) if s < 0],
+                                  'outs': [c for c, s in zip(ids, signs.tolist()) if s > 0]}
+            }
+            if cell.id in closures:
+                hyperEdge['closure'] = closures[cell.id]
+            hyperEdges.append(hyperEdge)
+        return {'hyperNodes': [connection.to_json() for connection in self.connections], 'hyperEdges': hyperEdges}
+
+    def to_json(self) -> Dict:
+        return self.to_indoorspace().to_json()
+
+    def to_indoorspace(self, lazy: bool = False) -> IndoorSpace:
+        """Decode the whole snapshot into an ordinary, mutable IndoorSpace."""
+        return decode_sections(self.__sections, lazy)
+
+    def __string(self, column: str, index: int) -> str:
+        offsets, data = self.__strings
+        i = int(self.__sections[column][index])
+        return data[offsets[i]:offsets[i + 1]].tobytes().decode('utf-8')
+
+    def __blob(self, name: str, index: int) -> bytes:
+        offsets = self.__sections[f'{name}.offsets']
+        return self.__sections[f'{name}.data'][offsets[index]:offsets[index + 1]].tobytes()
+
+    def __record(self, prefix: str, index: int) -> Dict:
+        # Records are stored with a trailing comma so a whole column decodes at once.
+        return json.loads(self.__blob(f'{prefix}.properties', index)[:-1])
+
+    def __cell(self, index: int) -> Cell:
+        return Cell.from_raw(self.__string('cells.id', index), self.__record('cells', index),
+                             self.__blob('cells.space', index), self.__blob('cells.node', index))
+
+    def __connection(self, index: int) -> Connection:
+        return Connection.from_raw(self.__string('connections.id', index), self.__record('connections', index),
+                                   self.__string('connections.fr', index), self.__string('connections.to', index),
+                                   self.__blob('connections.bound', index), self.__blob('connections.edge', index))
+
+    def __search(self, prefix: str, feature_id) -> int:
+        order = self.__sections[f'{prefix}.id.sorted']
+        column = f'{prefix}.id'
+        low, high = 0, len(order)
+        while low < high:
+            middle = (low + high) // 2
+            if self.__string(column, order[middle]) < feature_id:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(order) and self.__string(column, order[low]) == feature_id:
+            return int(order[low])
+        return -1
+
+
+def _sorted_ids(ids: Iterable[str]) -> np.ndarray:
+    ids = list(ids)
+    return np.array(sorted(range(len(ids)), key=ids.__getitem__), dtype=np.int64)
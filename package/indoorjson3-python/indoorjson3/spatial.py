@@ -0,0 +1,72 @@
+"""
+File Name: spatial.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import numpy as np
+import shapely
+from shapely import STRtree
+from typing import Dict, Optional, Tuple
+
+
+class SpatialIndex:
+    """STR-tree index over cell spaces and connection bounds.
+
+    Queries take coordinate arrays and return positions into
+    ``IndoorSpace.cells`` / ``IndoorSpace.connections``. Trees are built on
+    first use; the owning IndoorSpace drops the index whenever cells or
+    connections change.
+    """
+
+    def __init__(self, cell_spaces: np.ndarray, connection_bounds: np.ndarray):
+        self.__geometries: Dict[str, np.ndarray] = {'cells': cell_spaces, 'connections': connection_bounds}
+        self.__trees: Dict[str, STRtree] = {}
+
+    def tree(self, target: str = 'cells') -> STRtree:
+        if target not in self.__trees:
+            if target not in self.__geometries:
+                raise ValueError(f'Unknown spatial index target: {target}')
+            self.__trees[target] = STRtree(self.__geometries[target])
+        return self.__trees[target]
+
+    def locate_points(self, points: np.ndarray, predicate: str = 'intersects') -> np.ndarray:
+        """Position of the first cell whose space matches each ``(x, y)`` point, or -1."""
+        points = _as_points(points)
+        located = np.full(len(points), -1, dtype=np.int64)
+        if len(points) == 0:
+            return located
+        inputs, cells = self.tree('cells').query(points, predicate=predicate)
+        order = np.lexsort((cells, inputs))
+        inputs, cells = inputs[order], cells[order]
+        first = np.unique(inputs, return_index=True)[1]
+        located[inputs[first]] = cells[first]
+        return located
+
+    def nearest(self, points: np.ndarray, target: str = 'cells',
+                max_distance: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Position of and distance to the nearest feature for each point; -1/inf when none is in range."""
+        points = _as_points(points)
+        positions = np.full(len(points), -1, dtype=np.int64)
+        distances = np.full(len(points), np.inf)
+        if len(points) == 0 or len(self.__geometries[target]) == 0:
+            return positions, distances
+        (inputs, features), found = self.tree(target).query_nearest(points, max_distance=max_distance,
+                                                                    return_distance=True, all_matches=False)
+        positions[inputs] = features
+        distances[inputs] = found
+        return positions, distances
+
+    def intersects_bbox(self, bboxes: np.ndarray, target: str = 'cells') -> np.ndarray:
+        """``(2, n)`` array of (bbox index, feature position) pairs for features intersecting each bbox."""
+        bboxes = np.atleast_2d(np.asarray(bboxes, dtype=float))
+        boxes = shapely.box(bboxes[:, 0], bboxes[:, 1], bboxes[:, 2], bboxes[:, 3])
+        return self.tree(target).query(boxes, predicate='intersects')
+
+
+def _as_points(points: np.ndarray) -> np.ndarray:
+    coordinates = np.atleast_2d(np.asarray(points, dtype=float))
+    return shapely.points(coordinates[:, :2])
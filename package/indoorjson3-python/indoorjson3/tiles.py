@@ -0,0 +1,290 @@
+"""
+File Name: tiles.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import json
+import math
+import os
+import numpy as np
+import shapely
+from typing import Dict, List, Optional, Tuple
+
+from indoorjson3.indoorspace import IndoorSpace
+
+TILE_PIXELS = 256
+
+
+def export_tiles(indoorSpace: IndoorSpace, directory: str, max_zoom: Optional[int] = None,
+                 tile_features: int = 4096) -> Dict:
+    """Write a tiled, level-of-detail rendering of cell spaces and connection edges with a static viewer.
+
+    Zoom level ``z`` splits the square extent of the cells into ``2**z`` by
+    ``2**z`` tiles of ``TILE_PIXELS`` pixels. At each level, geometries at
+    least a pixel across are simplified to pixel tolerance. Smaller cells
+    collapse into one dot per occupied pixel, and smaller edges are left out.
+    The finest level keeps every feature as is. By default the levels continue until
+    a tile holds about ``tile_features`` cells. Tiles go to
+    ``directory/tiles/z/x/y.json`` and only non-empty ones are written.
+    ``tiles.json`` lists them for ``index.html``, which fetches only the tiles
+    in view; serve the directory over HTTP to open it.
+    """
+    spaces = indoorSpace.get_geometry_array('space').values
+    edges = indoorSpace.get_geometry_array('edge').values
+    cell_ids = [cell.id for cell in indoorSpace.cells]
+    connection_ids = [connection.id for connection in indoorSpace.connections]
+    cell_bounds = shapely.bounds(spaces)
+    if len(cell_bounds) == 0:
+        raise ValueError('Cannot tile an IndoorSpace without cells')
+    origin = cell_bounds[:, :2].min(axis=0)
+    extent = float((cell_bounds[:, 2:].max(axis=0) - origin).max()) or 1.0
+    if max_zoom is None:
+        max_zoom = max(0, math.ceil(math.log(max(len(spaces), 1) / tile_features, 4)))
+
+    os.makedirs(directory, exist_ok=True)
+    tiles: Dict[int, List[List[int]]] = {}
+    for zoom in range(max_zoom + 1):
+        tile_size = extent / (1 << zoom)
+        pixel = tile_size / TILE_PIXELS
+        tolerance = 0.0 if zoom == max_zoom else pixel
+        cell_tiles = _level(spaces, cell_ids, cell_bounds, origin, zoom, pixel, tolerance, polygons=True)
+        edge_tiles = _level(edges, connection_ids, shapely.bounds(edges), origin, zoom, pixel, tolerance,
+                            polygons=False)
+        dot_tiles = _dots(cell_bounds, origin, zoom, pixel) if tolerance else {}
+        keys = sorted(set(cell_tiles) | set(edge_tiles) | set(dot_tiles))
+        for x, y in keys:
+            cells = cell_tiles.get((x, y), ([], []))
+            lines = edge_tiles.get((x, y), ([], []))
+            path = os.path.join(directory, 'tiles', str(zoom), str(x))
+            os.makedirs(path, exist_ok=True)
+            with open(os.path.join(path, f'{y}.json'), 'w', encoding='utf-8') as file:
+                json.dump({'cells': {'ids': cells[0], 'rings': cells[1]},
+                           'edges': {'ids': lines[0], 'lines': lines[1]},
+                           'dots': dot_tiles.get((x, y), [])}, file, ensure_ascii=False,
+                          separators=(',', ':'))
+        tiles[zoom] = [list(key) for key in keys]
+
+    metadata = {'origin': origin.tolist(), 'extent': extent, 'max_zoom': max_zoom, 'tile_pixels': TILE_PIXELS,
+                'cells': len(cell_ids), 'connections': len(connection_ids), 'tiles': tiles}
+    with open(os.path.join(directory, 'tiles.json'), 'w', encoding='utf-8') as file:
+        json.dump(metadata, file, separators=(',', ':'))
+    with open(os.path.join(directory, 'index.html'), 'w', encoding='utf-8') as file:
+        file.write(VIEWER_HTML)
+    return metadata
+
+
+def _level(geometries: np.ndarray, ids: List[str], bounds: np.ndarray, origin: np.ndarray, zoom: int,
+           pixel: float, tolerance: float,
+           polygons: bool) -> Dict[Tuple[int, int], Tuple[List[str], List[List[float]]]]:
+    """Simplified flat coordinate lists of the geometries visible at ``zoom``, grouped by tile."""
+    sizes = np.maximum(bounds[:, 2] - bounds[:, 0], bounds[:, 3] - bounds[:, 1])
+    visible = np.flatnonzero(sizes >= pixel) if tolerance else np.arange(len(geometries))
+    if len(visible) == 0:
+        return {}
+    shapes = geometries[visible]
+    if polygons:
+        shapes = shapely.get_exterior_ring(shapes)
+    if tolerance:
+        shapes = shapely.simplify(shapes, tolerance, preserve_topology=False)
+    coordinates, index = shapely.get_coordinates(shapes, return_index=True)
+    flat = np.round(coordinates, _decimals(pixel)).ravel().tolist()
+    starts = np.searchsorted(index, np.arange(len(visible) + 1)).tolist()
+
+    last = (1 << zoom) - 1
+    tile_size = pixel * TILE_PIXELS
+    low = np.clip(((bounds[visible, :2] - origin) // tile_size).astype(np.int64), 0, last)
+    high = np.clip(((bounds[visible, 2:] - origin) // tile_size).astype(np.int64), 0, last)
+    widths = high[:, 0] - low[:, 0] + 1
+    counts = widths * (high[:, 1] - low[:, 1] + 1)
+    # Features crossing tile borders are repeated once per tile they touch.
+    features = np.repeat(np.arange(len(visible)), counts)
+    offsets = np.arange(len(features)) - np.repeat(np.cumsum(counts) - counts, counts)
+    xs = low[features, 0] + offsets % widths[features]
+    ys = low[features, 1] + offsets // widths[features]
+
+    tiles: Dict[Tuple[int, int], Tuple[List[str], List[List[float]]]] = {}
+    for feature, x, y in zip(features.tolist(), xs.tolist(), ys.tolist()):
+        start, end = starts[feature], starts[feature + 1]
+        if start == end:
+            continue
+        tile = tiles.setdefault((x, y), ([], []))
+        tile[0].append(ids[visible[feature]])
+        tile[1].append(flat[2 * start:2 * end])
+    return tiles
+
+
+def _dots(bounds: np.ndarray, origin: np.ndarray, zoom: int, pixel: float) -> Dict[Tuple[int, int], List[float]]:
+    """Centres of the pixels holding at least one sub-pixel cell, as flat coordinate lists per tile."""
+    sizes = np.maximum(bounds[:, 2] - bounds[:, 0], bounds[:, 3] - bounds[:, 1])
+    hidden = sizes < pixel
+    if not hidden.any():
+        return {}
+    centers = (bounds[hidden, :2] + bounds[hidden, 2:]) / 2
+    last = (1 << zoom) * TILE_PIXELS - 1
+    pixels = np.unique(np.clip(((centers - origin) // pixel).astype(np.int64), 0, last), axis=0)
+    points = np.round(origin + (pixels + 0.5) * pixel, _decimals(pixel))
+    keys = pixels // TILE_PIXELS
+    order = np.lexsort((keys[:, 1], keys[:, 0]))
+    keys, points = keys[order], points[order]
+    splits = np.flatnonzero(np.any(np.diff(keys, axis=0) != 0, axis=1)) + 1
+    return {(int(group[0, 0]), int(group[0, 1])): chunk.ravel().tolist()
+            for group, chunk in zip(np.split(keys, splits), np.split(points, splits))}
+
+
+def _decimals(pixel: float) -> int:
+    # A quarter pixel of precision is invisible and keeps the tiles small.
+    return max(0, math.ceil(-math.log10(pixel / 4))) if pixel > 0 else 6
+
+
+VIEWER_HTML = '''<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>IndoorJSON tiles</title>
+<style>
+  html, body { margin: 0; height: 100%; overflow: hidden; font-family: sans-serif; }
+  canvas { display: block; width: 100%; height: 100%; cursor: grab; }
+  #status { position: absolute; left: 8px; bottom: 8px; padding: 4px 8px; background: rgba(255,255,255,0.85); }
+</style>
+</head>
+<body>
+<canvas id="map"></canvas>
+<div id="status"></div>
+<script>
+const canvas = document.getElementById('map');
+const context = canvas.getContext('2d');
+const label = document.getElementById('status');
+const cache = new Map();
+let meta, available, scale, offsetX, offsetY, selected = '';
+
+function resize() {
+  canvas.width = canvas.clientWidth * devicePixelRatio;
+  canvas.height = canvas.clientHeight * devicePixelRatio;
+  draw();
+}
+
+function level() {
+  const z = Math.round(Math.log2(scale * meta.extent / meta.tile_pixels));
+  return Math.max(0, Math.min(meta.max_zoom, z));
+}
+
+function visibleTiles(z) {
+  const size = meta.extent / (1 << z);
+  const x0 = (0 - offsetX) / scale, x1 = (canvas.width - offsetX) / scale;
+  const y0 = (offsetY - canvas.height) / scale, y1 = offsetY / scale;
+  const keys = [];
+  for (let x = Math.floor((x0 - meta.origin[0]) / size); x <= Math.floor((x1 - meta.origin[0]) / size); x++) {
+    for (let y = Math.floor((y0 - meta.origin[1]) / size); y <= Math.floor((y1 - meta.origin[1]) / size); y++) {
+      const key = z + '/' + x + '/' + y;
+      if (available.has(key)) keys.push(key);
+    }
+  }
+  return keys;
+}
+
+function tile(key) {
+  if (!cache.has(key)) {
+    cache.set(key, null);
+    fetch('tiles/' + key + '.json').then(response => response.json()).then(data => {
+      cache.set(key, data);
+      draw();
+    });
+  }
+  return cache.get(key);
+}
+
+function path(coordinates, close) {
+  context.moveTo(coordinates[0] * scale + offsetX, offsetY - coordinates[1] * scale);
+  for (let i = 2; i < coordinates.length; i += 2) {
+    context.lineTo(coordinates[i] * scale + offsetX, offsetY - coordinates[i + 1] * scale);
+  }
+  if (close) context.closePath();
+}
+
+function draw() {
+  if (!meta) return;
+  context.clearRect(0, 0, canvas.width, canvas.height);
+  const z = level();
+  const loaded = visibleTiles(z).map(tile).filter(data => data);
+  context.fillStyle = '#C1DDDB';
+  context.strokeStyle = '#81B3A9';
+  context.lineWidth = 1;
+  context.beginPath();
+  for (const data of loaded) data.cells.rings.forEach(ring => path(ring, true));
+  context.fill();
+  context.stroke();
+  context.beginPath();
+  for (const data of loaded) data.edges.lines.forEach(line => path(line, false));
+  context.stroke();
+  const dot = Math.max(1, scale * meta.extent / (1 << z) / meta.tile_pixels);
+  context.fillStyle = '#81B3A9';
+  for (const data of loaded) {
+    for (let i = 0; i < data.dots.length; i += 2) {
+      context.fillRect(data.dots[i] * scale + offsetX - dot / 2, offsetY - data.dots[i + 1] * scale - dot / 2, dot, dot);
+    }
+  }
+  label.textContent = 'zoom ' + z + ' / ' + meta.max_zoom + ', ' + loaded.length + ' tiles' +
+    (selected ? ', ' + selected : '');
+}
+
+function inside(ring, x, y) {
+  let hit = false;
+  for (let i = 0, j = ring.length - 2; i < ring.length; j = i, i += 2) {
+    const xi = ring[i], yi = ring[i + 1], xj = ring[j], yj = ring[j + 1];
+    if ((yi > y) !== (yj > y) && x < (xj - xi) * (y - yi) / (yj - yi) + xi) hit = !hit;
+  }
+  return hit;
+}
+
+let drag = null;
+canvas.addEventListener('mousedown', event => { drag = [event.clientX, event.clientY, false]; });
+window.addEventListener('mouseup', event => {
+  if (drag && !drag[2]) {
+    const x = (event.clientX * devicePixelRatio - offsetX) / scale;
+    const y = (offsetY - event.clientY * devicePixelRatio) / scale;
+    selected = '';
+    for (const data of visibleTiles(level()).map(key => cache.get(key)).filter(data => data)) {
+      const i = data.cells.rings.findIndex(ring => inside(ring, x, y));
+      if (i >= 0) selected = data.cells.ids[i];
+    }
+    draw();
+  }
+  drag = null;
+});
+window.addEventListener('mousemove', event => {
+  if (!drag) return;
+  offsetX += (event.clientX - drag[0]) * devicePixelRatio;
+  offsetY += (event.clientY - drag[1]) * devicePixelRatio;
+  drag = [event.clientX, event.clientY, true];
+  draw();
+});
+canvas.addEventListener('wheel', event => {
+  event.preventDefault();
+  const factor = Math.exp(-event.deltaY * 0.002);
+  const x = event.clientX * devicePixelRatio, y = event.clientY * devicePixelRatio;
+  offsetX = x - (x - offsetX) * factor;
+  offsetY = y - (y - offsetY) * factor;
+  scale *= factor;
+  draw();
+}, { passive: false });
+window.addEventListener('resize', resize);
+
+fetch('tiles.json').then(response => response.json()).then(data => {
+  meta = data;
+  available = new Set();
+  for (const [z, keys] of Object.entries(meta.tiles)) keys.forEach(([x, y]) => available.add(z + '/' + x + '/' + y));
+  canvas.width = canvas.clientWidth * devicePixelRatio;
+  canvas.height = canvas.clientHeight * devicePixelRatio;
+  scale = Math.min(canvas.width, canvas.height) / meta.extent;
+  offsetX = -meta.origin[0] * scale;
+  offsetY = canvas.height + meta.origin[1] * scale;
+  resize();
+});
+</script>
+</body>
+</html>
+'''
@@ -0,0 +1,364 @@
+"""
+File Name: view.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import numpy as np
+from collections.abc import Sequence
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from indoorjson3.cell import Cell
+from indoorjson3.connection import Connection
+from indoorjson3.geometry import GeometryArray
+from indoorjson3.incidence import IncidenceMatrix
+from indoorjson3.indoorspace import IndoorSpace
+from indoorjson3.landmarks import LandmarkIndex
+from indoorjson3.layer import Layer
+from indoorjson3.rlines import Rlines
+from indoorjson3.routing import RoutingGraph, build_transition_graph, connection_weights, distance_matrix
+from indoorjson3.spatial import SpatialIndex
+
+
+class FeatureView(Sequence):
+    """Read-only sequence of the features of a parent list at the given positions."""
+
+    __slots__ = ('__features', '__positions')
+
+    def __init__(self, features: List, positions: np.ndarray):
+        self.__features: List = features
+        self.__positions: np.ndarray = positions
+
+    @property
+    def positions(self) -> np.ndarray:
+        return self.__positions
+
+    def __len__(self) -> int:
+        return len(self.__positions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return FeatureView(self.__features, self.__positions[index])
+        return self.__features[self.__positions[index]]
+
+    def __iter__(self) -> Iterator:
+        features = self.__features
+        for position in self.__positions.tolist():
+            yield features[position]
+
+
+class LayerView:
+    """The part of an IndoorSpace that belongs to one layer, without copying it.
+
+    Cells are the layer's members and connections are those with both ends
+    in the layer, held as sorted position arrays into the parent's lists, so
+    the view keeps the parent's order. It answers the same read queries as an
+    IndoorSpace, with positions local to the view. The arrays and everything
+    derived from them are rebuilt when the parent's cells, connections or
+    Rlines change.
+    """
+
+    def __init__(self, indoorspace: IndoorSpace, layer: Layer):
+        self.__space: IndoorSpace = indoorspace
+        self.__layer: Layer = layer
+        self.__revision: Optional[int] = None
+        self.__cell_positions: np.ndarray = np.empty(0, dtype=np.int64)
+        self.__connection_positions: np.ndarray = np.empty(0, dtype=np.int64)
+        self.__local_cells: np.ndarray = np.empty(0, dtype=np.int64)
+        self.__local_connections: np.ndarray = np.empty(0, dtype=np.int64)
+        self.__endpoints: Tuple[np.ndarray, np.ndarray] = (self.__cell_positions, self.__cell_positions)
+        self.__incidence: Optional[IncidenceMatrix] = None
+        self.__geometries: Dict[str, GeometryArray] = {}
+        self.__spatial_index: Optional[SpatialIndex] = None
+        self.__routing_graphs: Dict[Tuple[Optional[str], bool], RoutingGraph] = {}
+        self.__transition_graphs: Dict[Optional[str], RoutingGraph] = {}
+
+    @property
+    def id(self) -> str:
+        return self.__layer.id
+
+    @property
+    def layer(self) -> Layer:
+        return self.__layer
+
+    @property
+    def indoorspace(self) -> IndoorSpace:
+        return self.__space
+
+    @property
+    def properties(self) -> Dict:
+        return self.__space.properties
+
+    @property
+    def cells(self) -> FeatureView:
+        return FeatureView(self.__space.cells, self.cell_positions)
+
+    @property
+    def connections(self) -> FeatureView:
+        return FeatureView(self.__space.connections, self.connection_positions)
+
+    @property
+    def layers(self) -> List[Layer]:
+        return [self.__layer]
+
+    @property
+    def rlineses(self) -> List[Rlines]:
+        return [rlines for rlines in self.__space.rlineses if self.__is_member(rlines.cell)]
+
+    @property
+    def cell_positions(self) -> np.ndarray:
+        """Positions of the view's cells in the parent's ``cells``."""
+        self.__refresh()
+        return self.__cell_positions
+
+    @property
+    def connection_positions(self) -> np.ndarray:
+        """Positions of the view's connections in the parent's ``connections``."""
+        self.__refresh()
+        return self.__connection_positions
+
+    def get_connection_endpoints(self) -> Tuple[np.ndarray, np.ndarray]:
+        self.__refresh()
+        return self.__endpoints
+
+    def get_incident_matrix(self, dense: bool = False):
+        self.__refresh()
+        if self.__incidence is None:
+            sources, targets = self.__endpoints
+            self.__incidence = IncidenceMatrix.from_endpoints(sources, targets, len(self.__cell_positions))
+        if dense:
+            return self.__incidence.toarray()
+        return self.__incidence
+
+    def get_hypergraph_incidence_matrix(self, dense: bool = False):
+        if dense:
+            return self.get_incident_matrix(dense=True).T
+        return self.get_incident_matrix().T
+
+    def get_geometry_array(self, field: str) -> GeometryArray:
+        self.__refresh()
+        if field not in self.__geometries:
+            if field in ('space', 'node'):
+                positions = self.__cell_positions
+            else:
+                positions = self.__connection_positions
+            values = self.__space.get_geometry_array(field).values
+            self.__geometries[field] = GeometryArray.from_geometries(values[positions])
+        return self.__geometries[field]
+
+    def get_cell_areas(self) -> np.ndarray:
+        return self.get_geometry_array('space').area()
+
+    def get_cell_bounds(self) -> np.ndarray:
+        return self.get_geometry_array('space').bounds()
+
+    def get_cell_centroids(self) -> np.ndarray:
+        return self.get_geometry_array('space').centroid()
+
+    def get_connection_centroids(self) -> np.ndarray:
+        return self.get_geometry_array('bound').centroid()
+
+    def get_connection_lengths(self) -> np.ndarray:
+        return self.get_geometry_array('edge').length()
+
+    def get_spatial_index(self) -> SpatialIndex:
+        self.__refresh()
+        if self.__spatial_index is None:
+            self.__spatial_index = SpatialIndex(self.get_geometry_array('space').values,
+                                                self.get_geometry_array('bound').values)
+        return self.__spatial_index
+
+    def locate_cells(self, points: np.ndarray) -> List[Optional[Cell]]:
+        cells = self.cells
+        return [cells[i] if i >= 0 else None for i in self.get_spatial_index().locate_points(points).tolist()]
+
+    def locate_cell(self, x: float, y: float) -> Optional[Cell]:
+        return self.locate_cells(np.array([[x, y]]))[0]
+
+    def get_routing_graph(self, weight: Optional[str] = None, directed: bool = True) -> RoutingGraph:
+        self.__refresh()
+        key = (weight, directed)
+        if key not in self.__routing_graphs:
+            sources, targets = self.__endpoints
+            lengths = self.get_connection_lengths() if weight is None else None
+            weights = connection_weights(self.connections, lengths, weight)
+            self.__routing_graphs[key] = RoutingGraph.from_endpoints(sources, targets, weights,
+                                                                     len(self.__cell_positions), directed)
+        return self.__routing_graphs[key]
+
+    def shortest_path(self, source_id: str, target_id: str, weight: Optional[str] = None,
+                      directed: bool = True) -> Tuple[float, List[str]]:
+        graph = self.get_routing_graph(weight, directed)
+        distance, nodes, _ = graph.shortest_path(self.get_cell_index(source_id), self.get_cell_index(target_id))
+        cells = self.cells
+        return distance, [cells[i].id for i in nodes]
+
+    def shortest_distances(self, source_id: str, target_ids: Optional[Iterable[str]] = None,
+                           weight: Optional[str] = None, directed: bool = True) -> Dict[str, float]:
+        dist = self.get_routing_graph(weight, directed).shortest_distances(self.get_cell_index(source_id))
+        if target_ids is None:
+            cells = self.cells
+            return {cells[i].id: d for i, d in dist.items()}
+        return {target_id: dist.get(self.get_cell_index(target_id), np.inf) for target_id in target_ids}
+
+    def nearest_reachable_cells(self, source_id: str, k: int, weight: Optional[str] = None,
+                                directed: bool = True) -> List[Tuple[str, float]]:
+        nearest = self.get_routing_graph(weight, directed).nearest(self.get_cell_index(source_id), k)
+        cells = self.cells
+        return [(cells[i].id, d) for i, d in nearest]
+
+    def build_landmark_index(self, count: int = 16, weight: Optional[str] = None, directed: bool = True,
+                             processes: Optional[int] = None) -> LandmarkIndex:
+        graph = self.get_routing_graph(weight, directed)
+        index = LandmarkIndex.build(graph, count, processes=processes,
+                                    metadata={'weight': weight, 'directed': directed})
+        graph.set_landmarks(index)
+        return index
+
+    def set_landmark_index(self, index: LandmarkIndex):
+        graph = self.get_routing_graph(index.metadata.get('weight'), index.metadata.get('directed', True))
+        if not index.matches(graph):
+            raise ValueError('Landmark index was built for a different routing graph')
+        graph.set_landmarks(index)
+
+    def get_distance_matrix(self, source_ids: Optional[Iterable[str]] = None,
+                            target_ids: Optional[Iterable[str]] = None, weight: Optional[str] = None,
+                            directed: bool = True, processes: Optional[int] = None,
+                            out: Optional[str] = None) -> np.ndarray:
+        graph = self.get_routing_graph(weight, directed)
+        sources = range(graph.node_count) if source_ids is None else [self.get_cell_index(i) for i in source_ids]
+        targets = None if target_ids is None else [self.get_cell_index(i) for i in target_ids]
+        return distance_matrix(graph, sources, targets, processes, out)
+
+    def get_transition_graph(self, weight: Optional[str] = None) -> RoutingGraph:
+        """Door-to-door graph of the view; closures naming a connection outside the view are dropped."""
+        self.__refresh()
+        if weight not in self.__transition_graphs:
+            index = {connection.id: i for i, connection in enumerate(self.connections)}
+            closures = np.array([(index[pair[0]], index[pair[1]]) for rlines in self.rlineses
+                                 for pair in rlines.closure if pair[0] in index and pair[1] in index],
+                                dtype=np.int64).reshape(-1, 2)
+            door_weights = None if weight is None else connection_weights(self.connections, None, weight)
+            sources, targets = self.__endpoints
+            self.__transition_graphs[weight] = build_transition_graph(
+                sources, targets, self.get_connection_centroids(), self.get_geometry_array('node').centroid(),
+                closures, door_weights)
+        return self.__transition_graphs[weight]
+
+    def shortest_rlines_path(self, source_id: str, target_id: str,
+                             weight: Optional[str] = None) -> Tuple[float, List[str], List[str]]:
+        source, target = self.get_cell_index(source_id), self.get_cell_index(target_id)
+        if source == target:
+            return 0.0, [source_id], []
+        graph = self.get_transition_graph(weight)
+        door_count, cell_count = len(self.__connection_positions), len(self.__cell_positions)
+        distance, nodes, _ = graph.shortest_path(door_count + source, door_count + cell_count + target)
+        connections = self.connections
+        doors = [connections[i] for i in nodes[1:-1]]
+        if not doors:
+            return distance, [], []
+        return distance, [source_id] + [door.target for door in doors], [door.id for door in doors]
+
+    def shortest_door_path(self, source_id: str, target_id: str,
+                           weight: Optional[str] = None) -> Tuple[float, List[str]]:
+        graph = self.get_transition_graph(weight)
+        distance, nodes, _ = graph.shortest_path(self.get_connection_index(source_id),
+                                                 self.get_connection_index(target_id))
+        connections = self.connections
+        return distance, [connections[i].id for i in nodes]
+
+    def get_hypergraph(self) -> Dict:
+        """The parent's hypergraph restricted to the view; hyperedges only list member connections."""
+        hypergraph = self.__space.get_hypergraph()
+        hyperNodes = hypergraph['hyperNodes']
+        hyperEdges = hypergraph['hyperEdges']
+        members = {connection.id for connection in self.connections}
+        restricted = {'hyperNodes': [hyperNodes[i] for i in self.__connection_positions.tolist()],
+                      'hyperEdges': []}
+        for i in self.__cell_positions.tolist():
+            hyperEdge = dict(hyperEdges[i])
+            inner_nodeset = hyperEdge['inner_nodeset']
+            hyperEdge['inner_nodeset'] = {'ins': [c for c in inner_nodeset['ins'] if c in members],
+                                          'outs': [c for c in inner_nodeset['outs'] if c in members]}
+            if 'closure' in hyperEdge:
+                hyperEdge['closure'] = [pair for pair in hyperEdge['closure']
+                                        if pair[0] in members and pair[1] in members]
+            restricted['hyperEdges'].append(hyperEdge)
+        return restricted
+
+    def get_cell_from_id(self, cell_id) -> Optional[Cell]:
+        if not self.__is_member(cell_id):
+            return None
+        return self.__space.get_cell_from_id(cell_id)
+
+    def get_connection_from_id(self, connection_id) -> Optional[Connection]:
+        self.__refresh()
+        connection = self.__space.get_connection_from_id(connection_id)
+        if connection is None or self.__local_connections[self.__space.get_connection_index(connection_id)] < 0:
+            return None
+        return connection
+
+    def get_cell_index(self, cell_id) -> int:
+        """Position of a member cell within the view."""
+        self.__refresh()
+        local = int(self.__local_cells[self.__space.get_cell_index(cell_id)])
+        if local < 0:
+            raise KeyError(cell_id)
+        return local
+
+    def get_connection_index(self, connection_id) -> int:
+        """Position of a member connection within the view."""
+        self.__refresh()
+        local = int(self.__local_connections[self.__space.get_connection_index(connection_id)])
+        if local < 0:
+            raise KeyError(connection_id)
+        return local
+
+    def to_json(self) -> Dict:
+        return {'properties': self.properties,
+                'cells': [cell.to_json() for cell in self.cells],
+                'connections': [connection.to_json() for connection in self.connections],
+                'layers': [layer.to_json() for layer in self.layers],
+                'rlineses': [rlines.to_json() for rlines in self.rlineses]}
+
+    def to_indoorspace(self) -> IndoorSpace:
+        """Copy the view into a standalone IndoorSpace sharing the same feature objects."""
+        return IndoorSpace.from_features(self.properties, list(self.cells), list(self.connections),
+                                         self.layers, self.rlineses)
+
+    def __is_member(self, cell_id) -> bool:
+        self.__refresh()
+        cell = self.__space.get_cell_from_id(cell_id)
+        return cell is not None and self.__local_cells[self.__space.get_cell_index(cell_id)] >= 0
+
+    def __stale(self) -> bool:
+        return self.__revision != self.__space.revision
+
+    def __refresh(self):
+        if not self.__stale():
+            return
+        space = self.__space
+        cell_count = len(space.cells)
+        cells = np.unique(space.get_cell_positions(self.__layer.cells))
+        sources, targets = space.get_connection_endpoints()
+        member = np.zeros(cell_count, dtype=bool)
+        member[cells] = True
+        connections = np.flatnonzero(member[sources] & member[targets])
+        local_cells = np.full(cell_count, -1, dtype=np.int64)
+        local_cells[cells] = np.arange(len(cells))
+        local_connections = np.full(len(sources), -1, dtype=np.int64)
+        local_connections[connections] = np.arange(len(connections))
+        self.__cell_positions = cells
+        self.__connection_positions = connections
+        self.__local_cells = local_cells
+        self.__local_connections = local_connections
+        self.__endpoints = (local_cells[sources[connections]], local_cells[targets[connections]])
+        self.__incidence = None
+        self.__geometries = {}
+        self.__spatial_index = None
+        self.__routing_graphs = {}
+        self.__transition_graphs = {}
+        self.__revision = space.revision
@@ -7,139 +7,154 @@ Author: Ziwei Xiang <knightzz1016@gmail.com>
 Create Date: 2024/4/18
 """
 
+import numpy as np
 import plotly.graph_objs as go
+import shapely
 from plotly.offline import plot
-from shapely import geometry as geo
-from shapely.wkt import loads
+from typing import List, Optional, Tuple
 
 from indoorjson3.indoorspace import IndoorSpace
+from indoorjson3.instrumentation import timed_stage
 
 
-def graph_visualize(indoorSpace: IndoorSpace, filename: str = 'graph.html'):
-    fig = go.Figure()
-
-    for cell in indoorSpace.cells:
-        cell_space = geo.Polygon(cell.space)
-        cell_node = geo.Point(cell.node)
-        x1, y1 = cell_space.exterior.xy
-        x2, y2 = cell_node.xy
+def graph_figure(indoorSpace: IndoorSpace, webgl: bool = False) -> go.Figure:
+    """Figure with one trace each for cell spaces, cell nodes, connection bounds and edges.
 
-        fig.add_trace(
-            go.Scatter(x=list(x1),
-                       y=list(y1),
-                       fill='toself',
-                       fillcolor='#C1DDDB',
-                       line=dict(color='#81B3A9', width=2),
-                       name='Space'))
-        fig.add_trace(
-            go.Scatter(x=list(x2),
-                       y=list(y2),
-                       mode='markers',
-                       marker=dict(size=10, color='#81B3A9'),
-                       name='Cell',
-                       text=str(cell.properties),
-                       hoverinfo='text'))
-
-    for connection in indoorSpace.connections:
-        connection_bound = geo.LineString(connection.bound)
-        connection_edge = geo.LineString(connection.edge)
-        x1, y1 = connection_bound.xy
-        x2, y2 = connection_edge.xy
+    Geometries of a kind are joined into a single trace separated by gaps, so
+    the trace count does not grow with the model. ``webgl=True`` renders with
+    ``Scattergl`` for very large models.
+    """
+    scatter = go.Scattergl if webgl else go.Scatter
+    fig = go.Figure()
 
+    cell_text = [str(cell.properties) for cell in indoorSpace.cells]
+    connection_text = [str(connection.properties) for connection in indoorSpace.connections]
+
+    x, y, _ = _joined_coordinates(shapely.get_exterior_ring(indoorSpace.get_geometry_array('space').values))
+    fig.add_trace(
+        scatter(x=x,
+                y=y,
+                fill='toself',
+                fillcolor='#C1DDDB',
+                line=dict(color='#81B3A9', width=2),
+                name='Space'))
+    nodes = indoorSpace.get_geometry_array('node').values
+    fig.add_trace(
+        scatter(x=shapely.get_x(nodes),
+                y=shapely.get_y(nodes),
+                mode='markers',
+                marker=dict(size=10, color='#81B3A9'),
+                name='Cell',
+                text=cell_text,
+                hoverinfo='text'))
+
+    for field, name in (('bound', 'Boundary'), ('edge', 'Edge')):
+        x, y, text = _joined_coordinates(indoorSpace.get_geometry_array(field).values, connection_text)
         fig.add_trace(
-            go.Scatter(x=list(x1),
-                       y=list(y1),
-                       mode='lines',
-                       line=dict(color='#81B3A9', width=2),
-                       name='Boundary',
-                       text=str(connection.properties),
-                       hoverinfo='text'))
-        fig.add_trace(
-            go.Scatter(x=list(x2),
-                       y=list(y2),
-                       mode='lines',
-                       line=dict(color='#81B3A9', width=2),
-                       name='Edge',
-                       text=str(connection.properties),
-                       hoverinfo='text'))
+            scatter(x=x,
+                    y=y,
+                    mode='lines',
+                    line=dict(color='#81B3A9', width=2),
+                    name=name,
+                    text=text,
+                    hoverinfo='text'))
 
     fig.update_layout(showlegend=False)
+    return fig
+
+
+def graph_visualize(indoorSpace: IndoorSpace, filename: str = 'graph.html', webgl: bool = False):
+    with timed_stage('visualization.graph_figure', len(indoorSpace.cells), webgl=webgl):
+        fig = graph_figure(indoorSpace, webgl)
+    with timed_stage('visualization.write_html', len(indoorSpace.cells)):
+        plot(fig, filename=filename)
 
-    plot(fig, filename=filename)
 
+def hypergraph_figure(indoorSpace: IndoorSpace, webgl: bool = False) -> go.Figure:
+    """Figure of rline groups, the rlines between their doors and the connection points.
 
-def hypergraph_visualize(indoorSpace: IndoorSpace, filename: str = 'hypergraph.html'):
+    An rline joins the centroids of an in and an out connection of a cell,
+    except for pairs listed in the cell's closure. All rlines share one
+    trace, as do all groups and all connection points.
+    """
+    scatter = go.Scattergl if webgl else go.Scatter
     fig = go.Figure()
 
     hypergraph = indoorSpace.get_hypergraph()
-
+    centroids = indoorSpace.get_connection_centroids()
+    connection_index = indoorSpace.get_connection_index
+
+    cells = [indoorSpace.get_cell_index(hyperEdge['id']) for hyperEdge in hypergraph['hyperEdges']]
+    spaces = indoorSpace.get_geometry_array('space').values[cells]
+    x, y, text = _joined_coordinates(shapely.get_exterior_ring(spaces),
+                                     [str(hyperEdge['properties']) for hyperEdge in hypergraph['hyperEdges']])
+    fig.add_trace(
+        scatter(x=x,
+                y=y,
+                fill='toself',
+                fillcolor='#C1DDDB',
+                line=dict(color='#81B3A9', width=2),
+                name='Rline Group',
+                text=text,
+                hoverinfo='text'))
+
+    starts = []
+    ends = []
     for hyperEdge in hypergraph['hyperEdges']:
-        cell = indoorSpace.get_cell_from_id(hyperEdge['id'])
-        ins = hyperEdge['inner_nodeset']['ins']
-        outs = hyperEdge['inner_nodeset']['outs']
-        rlines = []
-        rlines_group = geo.Polygon(cell.space)
-
-        x_rlinesGroup, y_rlinesGroup = rlines_group.exterior.xy
-
-        fig.add_trace(
-            go.Scatter(x=list(x_rlinesGroup),
-                       y=list(y_rlinesGroup),
-                       fill='toself',
-                       fillcolor='#C1DDDB',
-                       line=dict(color='#81B3A9', width=2),
-                       name='Rline Group',
-                       text=str(cell.properties),
-                       hoverinfo='text'))
-
-        for ins_id in ins:
-            insConnectionPoint = indoorSpace.get_connection_from_id(
-                ins_id).bound.centroid
-
-            for outs_id in outs:
-                outsConnectionPoint = indoorSpace.get_connection_from_id(
-                    outs_id).bound.centroid
-                rline = geo.LineString(
-                    [insConnectionPoint, outsConnectionPoint])
-                rlines.append(rline)
-
-        if 'closure' in hyperEdge:
-            rlines_closure = hyperEdge['closure']
-            for rlines_pairs in rlines_closure:
-                insConnectionPoint = indoorSpace.get_connection_from_id(
-                    rlines_pairs[0]).bound.centroid
-                outsConnectionPoint = indoorSpace.get_connection_from_id(
-                    rlines_pairs[1]).bound.centroid
-                rline_closure = geo.LineString(
-                    [insConnectionPoint, outsConnectionPoint])
-
-                for rline in rlines:
-                    if rline == rline_closure:
-                        rlines.remove(rline)
-                        break
-
-        for rline in rlines:
-            x_rline, y_rline = rline.xy
-            fig.add_trace(
-                go.Scatter(x=list(x_rline),
-                           y=list(y_rline),
-                           mode='lines',
-                           line=dict(color='#81B3A9'),
-                           name='Rline'))
-
-    for hyperNode in hypergraph['hyperNodes']:
-        connectionPoint = loads(hyperNode['bound'])
-        x_hyperNode, y_hyperNode = geo.LineString(connectionPoint).centroid.xy
-
-        fig.add_trace(
-            go.Scatter(x=list(x_hyperNode),
-                       y=list(y_hyperNode),
-                       mode='markers',
-                       marker=dict(size=10, color='#81B3A9'),
-                       name='Connection Point',
-                       text=str(hyperNode['properties']),
-                       hoverinfo='text'))
+        closure = {tuple(pair) for pair in hyperEdge.get('closure', ())}
+        outs = [(outs_id, connection_index(outs_id)) for outs_id in hyperEdge['inner_nodeset']['outs']]
+        for ins_id in hyperEdge['inner_nodeset']['ins']:
+            ins = connection_index(ins_id)
+            for outs_id, out in outs:
+                if (ins_id, outs_id) not in closure:
+                    starts.append(ins)
+                    ends.append(out)
+    # Each rline is start, end, gap.
+    segments = np.full((len(starts), 3, 2), np.nan)
+    segments[:, 0] = centroids[starts]
+    segments[:, 1] = centroids[ends]
+    fig.add_trace(
+        scatter(x=segments[:, :, 0].ravel(),
+                y=segments[:, :, 1].ravel(),
+                mode='lines',
+                line=dict(color='#81B3A9'),
+                name='Rline'))
+
+    hyperNodes = hypergraph['hyperNodes']
+    points = centroids[[connection_index(hyperNode['$id']) for hyperNode in hyperNodes]]
+    fig.add_trace(
+        scatter(x=points[:, 0],
+                y=points[:, 1],
+                mode='markers',
+                marker=dict(size=10, color='#81B3A9'),
+                name='Connection Point',
+                text=[str(hyperNode['properties']) for hyperNode in hyperNodes],
+                hoverinfo='text'))
 
     fig.update_layout(showlegend=False)
-
-    plot(fig, filename=filename)
+    return fig
+
+
+def hypergraph_visualize(indoorSpace: IndoorSpace, filename: str = 'hypergraph.html', webgl: bool = False):
+    with timed_stage('visualization.hypergraph_figure', len(indoorSpace.cells), webgl=webgl):
+        fig = hypergraph_figure(indoorSpace, webgl)
+    with timed_stage('visualization.write_html', len(indoorSpace.cells)):
+        plot(fig, filename=filename)
+
+
+def _joined_coordinates(geometries: np.ndarray,
+                        labels: Optional[List[str]] = None) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    """x and y of all geometries in one array, with a NaN gap after each geometry, plus per-point labels."""
+    coordinates, index = shapely.get_coordinates(geometries, return_index=True)
+    # Every geometry before a point adds one gap ahead of it.
+    positions = np.arange(len(index)) + index
+    size = len(index) + len(geometries)
+    x = np.full(size, np.nan)
+    y = np.full(size, np.nan)
+    x[positions] = coordinates[:, 0]
+    y[positions] = coordinates[:, 1]
+    if labels is None:
+        return x, y, None
+    text = np.full(size, None, dtype=object)
+    text[positions] = np.asarray(labels, dtype=object)[index]
+    return x, y, text
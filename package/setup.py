@@ -21,7 +21,7 @@ setup(
     author_email='knightzz1016@gmail.com',
     url='https://github.com/Knight0132/indoorjson3-python',
     install_requires=[
-        'shapely',
+        'shapely>=2.0',
         'typing',
         'numpy',
         'plotly'
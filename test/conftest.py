@@ -0,0 +1,61 @@
+"""
+File Name: conftest.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import os
+import pytest
+from shapely.geometry import LineString, Point, box
+
+from indoorjson3 import (Cell, Connection, IndoorSpace, Layer, Rlines, deserialization, register_section,
+                         registered_sections, unregister_section)
+
+EXAMPLE = os.path.join(os.path.dirname(__file__), 'example.json')
+
+
+class PointOfInterest:
+    """Minimal feature type for a registered ``pois`` extension section."""
+
+    def __init__(self, json_dict):
+        self.json_dict = json_dict
+
+    def to_json(self):
+        return self.json_dict
+
+    @classmethod
+    def from_json_batch(cls, json_dicts, lazy=False, trusted=False):
+        return [cls(json_dict) for json_dict in json_dicts]
+
+
+@pytest.fixture
+def example_space() -> IndoorSpace:
+    return deserialization(EXAMPLE)
+
+
+@pytest.fixture
+def unusual_space() -> IndoorSpace:
+    """Non-ASCII and nested properties, a buffered cell, a door pair, a layer and an Rlines closure."""
+    space = IndoorSpace()
+    space.set_properties({'name': 'Bâtiment «Ost»', 'levels': [1, 2.5, None], 'nested': {'empty': {}, 'list': []}})
+    space.add_cell(Cell('a', {'名前': '部屋', 'quote': 'say "hi"\n'}, box(0, 0, 1, 1), Point(0.5, 0.5)))
+    space.add_cell(Cell('b', {}, box(1, 0, 2, 1).buffer(0.1), Point(1.5, 0.5)))
+    space.add_connection(Connection('a>b', {'weight': 1e-9}, 'a', 'b', LineString([(1, 0), (1, 1)]),
+                                    LineString([(0.5, 0.5), (1.5, 0.5)])))
+    space.add_connection(Connection('b>a', {}, 'b', 'a', LineString([(1, 0), (1, 1)]),
+                                    LineString([(1.5, 0.5), (0.5, 0.5)])))
+    space.set_layers(Layer('ground', ['a', 'b']))
+    space.set_rlineses(Rlines('r-b', 'b', ['a>b'], ['b>a'], [['a>b', 'b>a']]))
+    return space
+
+
+@pytest.fixture
+def poi_section():
+    """Register ``pois`` for the duration of a test; the test may unregister it earlier."""
+    register_section('pois', PointOfInterest)
+    yield PointOfInterest
+    if 'pois' in registered_sections():
+        unregister_section('pois')
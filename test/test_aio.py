@@ -0,0 +1,58 @@
+"""
+File Name: test_aio.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+import pytest
+
+from indoorjson3 import (async_deserialization, async_load_buildings, async_serialization, deserialization,
+                         landmark_path)
+
+
+@pytest.mark.parametrize('name', ['out.json', 'out.json.gz', 'out.ij3b'])
+def test_round_trip(tmp_path, unusual_space, name):
+    space = unusual_space
+    path = tmp_path / name
+    asyncio.run(async_serialization(path, space))
+    assert os.listdir(tmp_path) == [name]
+    assert deserialization(path).to_json() == space.to_json()
+    for lazy in (False, True):
+        assert asyncio.run(async_deserialization(path, lazy=lazy)).to_json() == space.to_json()
+    with ProcessPoolExecutor(1) as executor:
+        loaded = asyncio.run(async_deserialization(str(path), executor=executor))
+    assert loaded.to_json() == space.to_json()
+    assert loaded.get_hypergraph() == space.get_hypergraph()
+
+
+def test_landmarks_are_picked_up(tmp_path, example_space):
+    path = str(tmp_path / 'out.json')
+    asyncio.run(async_serialization(path, example_space))
+    example_space.build_landmark_index(count=2, processes=1).save(landmark_path(path))
+    assert asyncio.run(async_deserialization(path)).get_routing_graph().landmarks is None
+    loaded = asyncio.run(async_deserialization(path, landmarks=True))
+    assert loaded.get_routing_graph().landmarks is not None
+
+
+def test_failed_write_leaves_no_file(tmp_path, unusual_space):
+    with pytest.raises(ValueError):
+        asyncio.run(async_serialization(tmp_path / 'out.json', unusual_space, fmt='xml'))
+    assert os.listdir(tmp_path) == []
+
+
+def test_load_buildings(tmp_path, example_space, unusual_space):
+    asyncio.run(async_serialization(tmp_path / 'a.json', example_space))
+    asyncio.run(async_serialization(tmp_path / 'b.ij3b', unusual_space))
+    (tmp_path / 'c.json').write_text('[', encoding='utf-8')
+    results = asyncio.run(async_load_buildings(tmp_path, concurrency=2))
+    assert [os.path.basename(path) for path in results] == ['a.json', 'b.ij3b', 'c.json']
+    a, b, c = results.values()
+    assert a.indoorspace.to_json() == example_space.to_json()
+    assert b.indoorspace.to_json() == unusual_space.to_json()
+    assert not c.ok and c.indoorspace is None
@@ -0,0 +1,123 @@
+"""
+File Name: test_binary.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import io
+import json
+import os
+import struct
+import pytest
+from shapely.geometry import LineString
+
+from indoorjson3 import (BINARY_MAGIC, Cell, Connection, IndoorSpace, deserialization, dump_binary, dump_snapshot,
+                         is_binary, load_binary, load_snapshot, read_container, serialization, unregister_section)
+
+EXAMPLE = os.path.join(os.path.dirname(__file__), 'example.json')
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_round_trip_through_file(tmp_path, example_space, unusual_space, lazy):
+    for i, space in enumerate([example_space, unusual_space, IndoorSpace()]):
+        path = str(tmp_path / f'{i}.ij3b')
+        serialization(path, space)
+        assert is_binary(path)
+        loaded = deserialization(path, lazy=lazy)
+        assert loaded.to_json() == space.to_json()
+        assert [c.id for c in loaded.cells] == [c.id for c in space.cells]
+        assert loaded.get_incident_matrix(dense=True).tolist() == space.get_incident_matrix(dense=True).tolist()
+        assert loaded.get_hypergraph() == space.get_hypergraph()
+
+
+def test_round_trip_through_stream_and_bytes(example_space):
+    space = example_space
+    buffer = io.BytesIO()
+    dump_binary(buffer, space)
+    assert load_binary(buffer.getvalue()).to_json() == space.to_json()
+    buffer.seek(0)
+    assert load_binary(buffer).to_json() == space.to_json()
+    assert load_binary(memoryview(buffer.getvalue())).to_json() == space.to_json()
+
+
+def test_format_is_detected_by_magic_not_suffix(tmp_path, unusual_space):
+    path = str(tmp_path / 'building.dat')
+    serialization(path, unusual_space, fmt='binary')
+    with open(path, 'rb') as file:
+        assert file.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+    assert deserialization(path).to_json() == unusual_space.to_json()
+
+
+def test_sections_are_aligned(example_space):
+    buffer = io.BytesIO()
+    dump_binary(buffer, example_space)
+    for name, array in read_container(buffer.getvalue()).items():
+        assert array.ctypes.data % 8 == 0 or len(array) == 0, name
+
+
+def test_invalid_containers_are_rejected(unusual_space):
+    buffer = io.BytesIO()
+    dump_binary(buffer, unusual_space)
+    data = buffer.getvalue()
+    with pytest.raises(ValueError):
+        load_binary(b'XXXX' + data[4:])
+    newer = data[:4] + struct.pack('<I', 99) + data[8:]
+    with pytest.raises(ValueError):
+        load_binary(newer)
+
+
+def test_extension_sections_round_trip(tmp_path, poi_section):
+    document = json.load(open(EXAMPLE, encoding='utf-8'))
+    document['pois'] = [{'id': 'entrance'}, {'id': 'lift', 'floors': [0, 1]}]
+    space = IndoorSpace.from_json(json.dumps(document))
+    path = str(tmp_path / 'pois.ij3b')
+    serialization(path, space)
+    assert [poi.to_json() for poi in deserialization(path).extensions['pois']] == document['pois']
+
+    snapshot_path = str(tmp_path / 'pois.ij3s')
+    dump_snapshot(snapshot_path, space)
+    snapshot = load_snapshot(snapshot_path)
+    assert [poi.to_json() for poi in snapshot.get_section('pois')] == document['pois']
+    assert snapshot.to_indoorspace().to_json() == space.to_json()
+
+    unregister_section('pois')
+    assert deserialization(path).extensions == {}
+    with pytest.raises(ValueError):
+        deserialization(path, strict=True)
+
+
+def test_geometries_survive_exactly(unusual_space):
+    space = unusual_space
+    buffer = io.BytesIO()
+    dump_binary(buffer, space)
+    loaded = load_binary(buffer.getvalue())
+    for field in ('space', 'node'):
+        for before, after in zip(space.cells, loaded.cells):
+            assert getattr(before, field).equals_exact(getattr(after, field), 0)
+
+
+@pytest.mark.parametrize('trusted', [False, True])
+def test_connections_are_linked_like_a_rebuild(unusual_space, trusted):
+    unusual_space.add_connection(Connection('a>a', {}, 'a', 'a', LineString([(0, 0), (0, 1)]),
+                                            LineString([(0.5, 0.5), (0.5, 0.6)])))
+    buffer = io.BytesIO()
+    dump_binary(buffer, unusual_space)
+    loaded = load_binary(buffer.getvalue(), trusted=trusted)
+    assert loaded.get_hypergraph() == unusual_space.get_hypergraph()
+    assert loaded.get_hypergraph()['hyperEdges'][0]['inner_nodeset'] == {'ins': ['b>a', 'a>a'], 'outs': ['a>b']}
+    loaded.remove_connection('a>a')
+    loaded.remove_connection('b>a')
+    assert loaded.get_hypergraph()['hyperEdges'][0]['inner_nodeset'] == {'ins': [], 'outs': ['a>b']}
+
+
+def test_property_records_are_type_checked(unusual_space):
+    cell = unusual_space.cells[0]
+    unusual_space.add_cell(Cell.from_raw('c', ['not', 'a', 'dict'], cell.space, cell.node))
+    buffer = io.BytesIO()
+    dump_binary(buffer, unusual_space)
+    with pytest.raises(TypeError):
+        load_binary(buffer.getvalue())
+    assert load_binary(buffer.getvalue(), trusted=True).get_cell_from_id('c').properties == ['not', 'a', 'dict']
@@ -0,0 +1,75 @@
+"""
+File Name: test_bulk.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import json
+import os
+import pytest
+
+from indoorjson3 import IndoorSpace, deserialization, load_buildings, serialization, unregister_section
+
+EXAMPLE = os.path.join(os.path.dirname(__file__), 'example.json')
+
+
+@pytest.fixture
+def building_dir(tmp_path, example_space, unusual_space):
+    for name, space in [('a.json', example_space), ('b.json.gz', unusual_space), ('c.ij3b', example_space),
+                        ('d.ij3b', unusual_space), ('e.json', IndoorSpace())]:
+        serialization(str(tmp_path / name), space)
+    return tmp_path
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+@pytest.mark.parametrize('defer', [False, True])
+def test_parallel_loads_match_sequential_deserialization(building_dir, lazy, defer):
+    results = load_buildings(building_dir, processes=2, lazy=lazy, defer=defer)
+    assert [os.path.basename(path) for path in results] == ['a.json', 'b.json.gz', 'c.ij3b', 'd.ij3b', 'e.json']
+    for path, result in results.items():
+        assert result.ok, result.error
+        assert result.decoded is not defer
+        expected = deserialization(path, lazy=lazy)
+        assert result.indoorspace.to_json() == expected.to_json()
+        assert result.indoorspace.get_hypergraph() == expected.get_hypergraph()
+        assert result.decoded
+    assert load_buildings(building_dir, processes=1, lazy=lazy).keys() == results.keys()
+
+
+def test_one_bad_file_does_not_stop_the_others(building_dir):
+    (building_dir / 'broken.json').write_text('{"cells": [', encoding='utf-8')
+    for processes in (1, 2):
+        results = load_buildings(str(building_dir), processes=processes)
+        broken = results[str(building_dir / 'broken.json')]
+        assert not broken.ok and broken.error.startswith('JSONDecodeError')
+        assert sum(result.ok for result in results.values()) == 5
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_strict_and_trusted_reach_the_workers(tmp_path, poi_section, processes):
+    document = json.load(open(EXAMPLE, encoding='utf-8'))
+    document['pois'] = [{'id': 'entrance'}]
+    space = IndoorSpace.from_json(json.dumps(document))
+    paths = [str(tmp_path / 'pois.json'), str(tmp_path / 'pois.ij3b')]
+    for path in paths:
+        serialization(path, space)
+    for result in load_buildings(paths, processes=processes, strict=True).values():
+        assert [poi.to_json() for poi in result.indoorspace.extensions['pois']] == document['pois']
+
+    unregister_section('pois')
+    assert all(result.ok for result in load_buildings(paths, processes=processes).values())
+    for result in load_buildings(paths, processes=processes, strict=True).values():
+        assert not result.ok and result.error.startswith('ValueError')
+
+    document['cells'][0]['properties'] = ['not', 'a', 'dict']
+    text = json.dumps({key: document[key] for key in document if key != 'pois'})
+    with open(paths[0], 'w', encoding='utf-8') as file:
+        file.write(text)
+    serialization(paths[1], IndoorSpace.from_json(text, trusted=True))
+    for result in load_buildings(paths, processes=processes).values():
+        assert not result.ok and result.error.startswith('TypeError')
+    for result in load_buildings(paths, processes=processes, trusted=True).values():
+        assert result.indoorspace.cells[0].properties == ['not', 'a', 'dict']
@@ -0,0 +1,112 @@
+"""
+File Name: test_indoorspace.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import random
+import pytest
+from shapely.geometry import LineString, Point, box
+
+from indoorjson3 import Cell, Connection, IndoorSpace, Rlines
+
+
+def make_cell(i: int) -> Cell:
+    return Cell(f'c{i}', {'n': i}, box(i, 0, i + 1, 1), Point(i + 0.5, 0.5))
+
+
+def make_connection(j: int, source: str, target: str) -> Connection:
+    return Connection(f'd{j}', {}, source, target, LineString([(j, 0), (j, 1)]), LineString([(j, 0), (j + 1, 1)]))
+
+
+def rebuild(space: IndoorSpace) -> IndoorSpace:
+    """The same features added one by one to a space that has never been queried."""
+    fresh = IndoorSpace()
+    for cell in space.cells:
+        fresh.add_cell(cell)
+    for connection in space.connections:
+        fresh.add_connection(connection)
+    for rlines in space.rlineses:
+        fresh.set_rlineses(rlines)
+    return fresh
+
+
+def assert_matches_rebuild(space: IndoorSpace):
+    fresh = rebuild(space)
+    assert space.get_hypergraph() == fresh.get_hypergraph()
+    assert space.get_incident_matrix(dense=True).tolist() == fresh.get_incident_matrix(dense=True).tolist()
+    assert space.get_hypergraph_incidence_matrix(dense=True).tolist() == \
+        fresh.get_hypergraph_incidence_matrix(dense=True).tolist()
+    for actual, expected in zip(space.get_connection_endpoints(), fresh.get_connection_endpoints()):
+        assert actual.tolist() == expected.tolist()
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_interleaved_edits_match_rebuild(seed):
+    rng = random.Random(seed)
+    space = IndoorSpace()
+    next_cell, next_connection = 0, 0
+    for step in range(120):
+        cells, connections = space.cells, space.connections
+        action = rng.random()
+        if action < 0.3 or len(cells) < 2:
+            space.add_cell(make_cell(next_cell))
+            next_cell += 1
+        elif action < 0.65:
+            source, target = rng.choice(cells), rng.choice(cells)
+            space.add_connection(make_connection(next_connection, source.id, target.id))
+            next_connection += 1
+        elif action < 0.85 and connections:
+            space.remove_connection(rng.choice(connections).id)
+        else:
+            referenced = {c.source for c in connections} | {c.target for c in connections}
+            free = [cell for cell in cells if cell.id not in referenced]
+            if free:
+                space.remove_cell(rng.choice(free).id)
+        if step % 7 == 0:
+            assert_matches_rebuild(space)
+        elif step % 3 == 0:
+            space.get_hypergraph()
+            space.get_incident_matrix()
+    assert_matches_rebuild(space)
+
+
+def test_removing_a_connection_named_in_a_closure():
+    space = IndoorSpace()
+    for i in range(3):
+        space.add_cell(make_cell(i))
+    space.add_connection(make_connection(0, 'c0', 'c1'))
+    space.add_connection(make_connection(1, 'c1', 'c2'))
+    space.add_connection(make_connection(2, 'c2', 'c1'))
+    space.set_rlineses(Rlines('r1', 'c1', ['d0', 'd2'], ['d1'], [['d0', 'd1']]))
+    assert_matches_rebuild(space)
+
+    space.remove_connection('d0')
+    assert_matches_rebuild(space)
+    assert space.get_hypergraph()['hyperEdges'][1]['inner_nodeset'] == {'ins': ['d2'], 'outs': ['d1']}
+
+    space.remove_connection('d1')
+    space.add_connection(make_connection(0, 'c0', 'c1'))
+    space.remove_rlines('r1')
+    assert_matches_rebuild(space)
+    assert 'closure' not in space.get_hypergraph()['hyperEdges'][1]
+
+    space.remove_connection('d0')
+    space.remove_connection('d2')
+    space.remove_cell('c1')
+    assert_matches_rebuild(space)
+    assert [e['id'] for e in space.get_hypergraph()['hyperEdges']] == ['c0', 'c2']
+
+
+def test_removing_a_referenced_cell_is_rejected():
+    space = IndoorSpace()
+    space.add_cell(make_cell(0))
+    space.add_cell(make_cell(1))
+    space.add_connection(make_connection(0, 'c0', 'c1'))
+    space.get_hypergraph()
+    with pytest.raises(ValueError):
+        space.remove_cell('c1')
+    assert_matches_rebuild(space)
@@ -0,0 +1,104 @@
+"""
+File Name: test_instrumentation.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import logging
+import os
+import pytest
+
+from indoorjson3 import (LoggingSink, add_sink, clear_sinks, collect_metrics, deserialization,
+                         instrumentation_enabled, remove_sink, timed_stage, trace_allocations)
+
+EXAMPLE = os.path.join(os.path.dirname(__file__), 'example.json')
+
+
+@pytest.fixture
+def events():
+    recorded = []
+    add_sink(recorded.append)
+    yield recorded
+    clear_sinks()
+
+
+def test_stages_are_free_without_sinks():
+    assert not instrumentation_enabled()
+    with timed_stage('a', 3, tag=1) as stage:
+        stage.add(2)
+    assert timed_stage('a') is timed_stage('b')
+
+
+def test_timed_stage_records_an_event(events):
+    assert instrumentation_enabled()
+    with timed_stage('load', 3, lazy=True) as stage:
+        stage.add(2)
+    assert len(events) == 1
+    event = events[0]
+    assert (event['stage'], event['count'], event['lazy']) == ('load', 5, True)
+    assert event['seconds'] >= 0
+    assert 'error' not in event and 'allocated_bytes' not in event
+
+    with pytest.raises(KeyError):
+        with timed_stage('fail'):
+            raise KeyError('x')
+    assert events[1]['stage'] == 'fail' and events[1]['error'] == 'KeyError'
+
+
+def test_allocations_are_traced_on_request(events):
+    trace_allocations()
+    try:
+        with timed_stage('allocate'):
+            block = [0] * 100000
+    finally:
+        trace_allocations(False)
+    assert events[0]['allocated_bytes'] >= 8 * len(block)
+    with timed_stage('untraced'):
+        pass
+    assert 'allocated_bytes' not in events[1]
+
+
+def test_sinks_are_added_once_and_removed():
+    recorded = []
+    add_sink(recorded.append)
+    add_sink(recorded.append)
+    with timed_stage('once'):
+        pass
+    remove_sink(recorded.append)
+    remove_sink(recorded.append)
+    with timed_stage('after'):
+        pass
+    assert [event['stage'] for event in recorded] == ['once']
+    assert not instrumentation_enabled()
+
+
+def test_collect_metrics_aggregates_loader_stages():
+    with collect_metrics() as registry:
+        deserialization(EXAMPLE)
+        deserialization(EXAMPLE)
+        with pytest.raises(ValueError):
+            with timed_stage('broken', 4):
+                raise ValueError
+    assert not instrumentation_enabled()
+    stats = registry.stats()
+    for stage in ('deserialization.read', 'deserialization.json', 'from_json.parse', 'from_json.decode.cells'):
+        assert stats[stage]['calls'] == 2, stage
+        assert stats[stage]['min_seconds'] <= stats[stage]['max_seconds'] <= stats[stage]['seconds']
+    assert stats['from_json.decode.cells']['count'] == 2 * len(deserialization(EXAMPLE).cells)
+    assert (stats['broken']['calls'], stats['broken']['count'], stats['broken']['errors']) == (1, 4, 1)
+    assert registry.report().splitlines()[0].split() == ['stage', 'calls', 'seconds', 'items']
+    registry.reset()
+    assert registry.stats() == {}
+
+
+def test_logging_sink(caplog, events):
+    add_sink(LoggingSink(level=logging.INFO))
+    with caplog.at_level(logging.INFO, logger='indoorjson3'):
+        with timed_stage('logged', 7, fmt='json'):
+            pass
+    assert len(caplog.records) == 1
+    assert caplog.records[0].getMessage().startswith('logged took ')
+    assert 'for 7 items fmt=json' in caplog.records[0].getMessage()
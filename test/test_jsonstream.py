@@ -0,0 +1,92 @@
+"""
+File Name: test_jsonstream.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import io
+import json
+import os
+import pytest
+
+from indoorjson3 import IndoorSpace, deserialization, iter_deserialization
+from indoorjson3.jsonstream import JsonStreamReader
+
+EXAMPLE = os.path.join(os.path.dirname(__file__), 'example.json')
+CHUNK_SIZES = [1, 2, 3, 5, 7, 64, 1 << 16]
+
+
+def flatten(document: dict):
+    """The ``(key, value)`` pairs JsonStreamReader should yield, array members one by one."""
+    for key, value in document.items():
+        if isinstance(value, list):
+            yield from ((key, element) for element in value)
+        else:
+            yield key, value
+
+
+def read(text: str, chunk_size: int):
+    return list(JsonStreamReader(io.StringIO(text), chunk_size).items())
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+def test_example_matches_json_load(chunk_size):
+    with open(EXAMPLE, encoding='utf-8') as file:
+        text = file.read()
+    assert read(text, chunk_size) == list(flatten(json.loads(text)))
+
+
+@pytest.mark.parametrize('chunk_size', CHUNK_SIZES)
+@pytest.mark.parametrize('indent', [None, 4])
+def test_values_split_across_chunks(chunk_size, indent):
+    document = {
+        'properties': {'name': 'Café “Nord”', 'escaped': 'a\\"b\\n\\u00e9', 'emoji': '\U0001F3E2'},
+        'numbers': [0, -1, 12345678901234567890, 3.25, -1.5e-7, 6.02e+23, 1e300],
+        'literals': [True, False, None, 'true', ''],
+        'nested': [{'a': [1, [2, [3]]], 'b': {}}, [], [[]], {'c': '}],{['}],
+        'empty': [],
+        'count': 1024,
+        'flag': False,
+        'nothing': None,
+    }
+    text = json.dumps(document, indent=indent, ensure_ascii=False)
+    assert read(text, chunk_size) == list(flatten(document))
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3])
+def test_empty_document(chunk_size):
+    assert read('  {  }  ', chunk_size) == []
+    assert read('{"cells": []}', chunk_size) == []
+
+
+@pytest.mark.parametrize('text', ['', '[1, 2]', '{"cells": [1, 2', '{"cells" [1]}', '{"a": 1 "b": 2}', '{1: 2}',
+                                  '{"cells": [1 2]}'])
+@pytest.mark.parametrize('chunk_size', [1, 4, 64])
+def test_malformed_documents_raise(text, chunk_size):
+    with pytest.raises(ValueError):
+        read(text, chunk_size)
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_streaming_deserialization_matches_default(lazy):
+    expected = deserialization(EXAMPLE).to_json()
+    assert deserialization(EXAMPLE, streaming=True, lazy=lazy).to_json() == expected
+
+
+@pytest.mark.parametrize('chunk_size', [1, 13])
+def test_from_json_items_with_small_chunks(chunk_size):
+    with open(EXAMPLE, encoding='utf-8') as file:
+        text = file.read()
+    streamed = IndoorSpace.from_json_items(JsonStreamReader(io.StringIO(text), chunk_size).items())
+    assert streamed.to_json() == IndoorSpace.from_json(text).to_json()
+
+
+def test_iter_deserialization_yields_features_in_file_order():
+    space = deserialization(EXAMPLE)
+    features = list(iter_deserialization(EXAMPLE))
+    assert [f.id for f in features] == [c.id for c in space.cells] + [c.id for c in space.connections]
+    assert [f.id for f in iter_deserialization(EXAMPLE, sections=('connections',))] == \
+        [c.id for c in space.connections]
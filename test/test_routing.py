@@ -0,0 +1,244 @@
+"""
+File Name: test_routing.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import os
+import random
+import numpy as np
+import pytest
+from shapely.geometry import LineString, Point, box
+
+from indoorjson3 import (Cell, Connection, IndoorSpace, LandmarkIndex, Rlines, RoutingGraph, deserialization,
+                         distance_matrix, serialization)
+
+EXAMPLE = os.path.join(os.path.dirname(__file__), 'example.json')
+
+
+def random_space(seed: int, cell_count: int = 9, connection_count: int = 24, closure_ratio: float = 0.3):
+    """Small building with random doors, a random 'cost' per door and random Rlines closures."""
+    rng = random.Random(seed)
+    space = IndoorSpace()
+    for i in range(cell_count):
+        x, y = rng.uniform(0, 20), rng.uniform(0, 20)
+        space.add_cell(Cell(f'c{i}', {}, box(x, y, x + 2, y + 2), Point(x + 1, y + 1)))
+    for j in range(connection_count):
+        source, target = rng.sample(space.cells, 2)
+        x, y = rng.uniform(0, 20), rng.uniform(0, 20)
+        space.add_connection(Connection(f'd{j}', {'cost': rng.uniform(1, 5)}, source.id, target.id,
+                                        LineString([(x, y), (x + 1, y)]), LineString([source.node, target.node])))
+    for cell in space.cells:
+        ins = [c.id for c in space.connections if c.target == cell.id]
+        outs = [c.id for c in space.connections if c.source == cell.id]
+        closure = [[i, o] for i in ins for o in outs if rng.random() < closure_ratio]
+        space.set_rlineses(Rlines(f'r-{cell.id}', cell.id, ins, outs, closure))
+    return space
+
+
+def floyd_warshall(space: IndoorSpace, weight=None, directed: bool = True) -> np.ndarray:
+    count = len(space.cells)
+    lengths = space.get_connection_lengths()
+    dist = np.full((count, count), np.inf)
+    np.fill_diagonal(dist, 0.0)
+    for i, connection in enumerate(space.connections):
+        w = lengths[i] if weight is None else connection.properties[weight]
+        s, t = space.get_cell_index(connection.source), space.get_cell_index(connection.target)
+        dist[s, t] = min(dist[s, t], w)
+        if not directed:
+            dist[t, s] = min(dist[t, s], w)
+    for k in range(count):
+        dist = np.minimum(dist, dist[:, k, None] + dist[None, k, :])
+    return dist
+
+
+def assert_distances_equal(actual, expected):
+    actual, expected = np.asarray(actual, dtype=float), np.asarray(expected, dtype=float)
+    assert np.array_equal(np.isinf(actual), np.isinf(expected))
+    finite = ~np.isinf(expected)
+    assert np.allclose(actual[finite], expected[finite])
+
+
+def spaces():
+    return [deserialization(EXAMPLE)] + [random_space(seed) for seed in range(4)]
+
+
+@pytest.mark.parametrize('weight', [None, 'cost'])
+@pytest.mark.parametrize('directed', [True, False])
+def test_shortest_paths_match_floyd_warshall(weight, directed):
+    for space in spaces():
+        if weight is not None and not all(weight in c.properties for c in space.connections):
+            continue
+        expected = floyd_warshall(space, weight, directed)
+        ids = [cell.id for cell in space.cells]
+        actual = [[space.shortest_path(a, b, weight, directed)[0] for b in ids] for a in ids]
+        assert_distances_equal(actual, expected)
+
+        for i, source in enumerate(ids):
+            dist = space.shortest_distances(source, weight=weight, directed=directed)
+            assert_distances_equal([dist.get(cell_id, np.inf) for cell_id in ids], expected[i])
+            nearest = space.nearest_reachable_cells(source, 3, weight, directed)
+            others = np.sort(np.delete(expected[i], i))
+            assert np.allclose([d for _, d in nearest], others[:len(nearest)])
+            assert len(nearest) == min(3, int(np.isfinite(others).sum()))
+
+
+def test_shortest_path_is_a_walk():
+    space = random_space(7)
+    lengths = space.get_connection_lengths()
+    arcs = {}
+    for i, connection in enumerate(space.connections):
+        key = (connection.source, connection.target)
+        arcs[key] = min(arcs.get(key, np.inf), lengths[i])
+    for a in space.cells:
+        for b in space.cells:
+            distance, path = space.shortest_path(a.id, b.id)
+            if np.isinf(distance):
+                assert path == []
+                continue
+            assert path[0] == a.id and path[-1] == b.id
+            assert np.isclose(sum(arcs[pair] for pair in zip(path, path[1:])), distance)
+
+
+def test_property_weights_keep_lazy_geometries_unparsed(tmp_path):
+    space = random_space(3)
+    path = str(tmp_path / 'building.json')
+    serialization(path, space)
+    lazy = deserialization(path, lazy=True)
+    ids = [cell.id for cell in space.cells]
+    for target in ids:
+        assert lazy.shortest_path(ids[0], target, 'cost') == space.shortest_path(ids[0], target, 'cost')
+    assert all(isinstance(c._Connection__edge, str) for c in lazy.connections)
+
+
+def brute_force_rlines(space: IndoorSpace, source_id: str, target_id: str) -> float:
+    """Cheapest route over every sequence of distinct doors, skipping closed in/out pairs."""
+    if source_id == target_id:
+        return 0.0
+    door_points = space.get_connection_centroids()
+    cell_points = space.get_geometry_array('node').centroid()
+    connections = space.connections
+    closed = {(i, o) for rlines in space.rlineses for i, o in rlines.closure}
+    best = np.inf
+
+    def walk(door: int, cost: float, used: set):
+        nonlocal best
+        cell = connections[door].target
+        if cell == target_id:
+            arrival = np.hypot(*(cell_points[space.get_cell_index(cell)] - door_points[door]))
+            best = min(best, cost + arrival)
+        for nxt, candidate in enumerate(connections):
+            if candidate.source != cell or nxt in used or (connections[door].id, candidate.id) in closed:
+                continue
+            used.add(nxt)
+            walk(nxt, cost + np.hypot(*(door_points[nxt] - door_points[door])), used)
+            used.remove(nxt)
+
+    source = space.get_cell_index(source_id)
+    for door, connection in enumerate(connections):
+        if connection.source == source_id:
+            walk(door, np.hypot(*(door_points[door] - cell_points[source])), {door})
+    return best
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_rlines_routes_match_brute_force(seed):
+    space = random_space(seed, cell_count=6, connection_count=12, closure_ratio=0.4)
+    closed = {(i, o) for rlines in space.rlineses for i, o in rlines.closure}
+    for a in space.cells:
+        for b in space.cells:
+            distance, cells, doors = space.shortest_rlines_path(a.id, b.id)
+            expected = brute_force_rlines(space, a.id, b.id)
+            assert_distances_equal([distance], [expected])
+            if doors:
+                assert cells[0] == a.id and cells[-1] == b.id
+                hops = [space.get_connection_from_id(door) for door in doors]
+                assert all(hop.source == cell for hop, cell in zip(hops, cells))
+                assert all(hop.target == cell for hop, cell in zip(hops, cells[1:]))
+                assert not closed.intersection(zip(doors, doors[1:]))
+
+
+def test_rlines_routes_on_example():
+    space = deserialization(EXAMPLE)
+    for a in space.cells:
+        for b in space.cells:
+            assert_distances_equal([space.shortest_rlines_path(a.id, b.id)[0]],
+                                   [brute_force_rlines(space, a.id, b.id)])
+
+
+def test_distance_matrix_in_parallel_and_to_file(tmp_path):
+    space = random_space(11, cell_count=30, connection_count=90)
+    expected = floyd_warshall(space)
+    assert_distances_equal(space.get_distance_matrix(processes=1), expected)
+    assert_distances_equal(space.get_distance_matrix(processes=2), expected)
+
+    out = str(tmp_path / 'matrix.f64')
+    matrix = space.get_distance_matrix(processes=2, out=out)
+    assert isinstance(matrix, np.memmap)
+    assert_distances_equal(matrix, expected)
+    assert_distances_equal(np.fromfile(out, dtype=np.float64).reshape(expected.shape), expected)
+
+    ids = [cell.id for cell in space.cells]
+    rows, columns = ids[3:9], ids[::4]
+    subset = space.get_distance_matrix(rows, columns, processes=2, out=str(tmp_path / 'subset.f64'))
+    positions = [space.get_cell_index(i) for i in rows], [space.get_cell_index(i) for i in columns]
+    assert_distances_equal(subset, expected[np.ix_(*positions)])
+
+
+def test_distance_matrix_with_repeated_ids(tmp_path):
+    space = deserialization(EXAMPLE)
+    ids = [cell.id for cell in space.cells]
+    rows, columns = [ids[0], ids[1], ids[0]], [ids[1], ids[1], ids[0], ids[2], ids[1]]
+    expected = floyd_warshall(space)[np.ix_([space.get_cell_index(i) for i in rows],
+                                            [space.get_cell_index(i) for i in columns])]
+    assert_distances_equal(space.get_distance_matrix(rows, columns, processes=1), expected)
+    assert_distances_equal(space.get_distance_matrix(rows, columns, processes=2), expected)
+    assert_distances_equal(space.get_distance_matrix(rows, columns, processes=2, out=str(tmp_path / 'm.f64')),
+                           expected)
+
+
+def grid_graph(size: int, seed: int, directed: bool) -> RoutingGraph:
+    index = np.arange(size * size).reshape(size, size)
+    sources = np.concatenate((index[:, :-1].ravel(), index[:-1, :].ravel()))
+    targets = np.concatenate((index[:, 1:].ravel(), index[1:, :].ravel()))
+    rng = np.random.default_rng(seed)
+    keep = rng.random(len(sources)) < 0.9
+    weights = rng.uniform(1, 3, keep.sum())
+    return RoutingGraph.from_endpoints(sources[keep], targets[keep], weights, size * size, directed)
+
+
+@pytest.mark.parametrize('directed', [True, False])
+def test_alt_matches_dijkstra(tmp_path, directed):
+    graph = grid_graph(25, 0, directed)
+    reference = grid_graph(25, 0, directed)
+    index = LandmarkIndex.build(graph, 8)
+    path = str(tmp_path / 'grid.alt')
+    index.save(path)
+    graph.set_landmarks(LandmarkIndex.load(path))
+    assert graph.landmarks.matches(graph)
+
+    pairs = np.random.default_rng(1).integers(graph.node_count, size=(200, 2)).tolist()
+    for source, target in pairs:
+        distance, nodes, _ = graph.shortest_path(source, target)
+        expected, _, _ = reference.shortest_path(source, target)
+        assert_distances_equal([distance], [expected])
+        if nodes:
+            assert nodes[0] == source and nodes[-1] == target
+
+
+def test_alt_on_indoorspace_matches_distance_matrix():
+    space = random_space(5, cell_count=40, connection_count=120)
+    expected = space.get_distance_matrix(processes=1)
+    space.build_landmark_index(count=4)
+    ids = [cell.id for cell in space.cells]
+    actual = [[space.shortest_path(a, b)[0] for b in ids] for a in ids]
+    assert_distances_equal(actual, expected)
+
+
+def test_distance_matrix_of_graph_without_arcs():
+    graph = RoutingGraph.from_endpoints(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64),
+                                        np.zeros(0), 3)
+    assert_distances_equal(distance_matrix(graph, [0, 1, 2], processes=2), np.where(np.eye(3), 0.0, np.inf))
@@ -0,0 +1,114 @@
+"""
+File Name: test_sections.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import asyncio
+import json
+import os
+import pytest
+
+from indoorjson3 import (FEATURE_TYPES, IndoorSpace, async_deserialization, async_load_buildings, deserialization,
+                         load_buildings, register_section, registered_sections, serialization, unregister_section)
+
+EXAMPLE = os.path.join(os.path.dirname(__file__), 'example.json')
+
+
+def example_document() -> dict:
+    with open(EXAMPLE, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def load_json(path: str, strict: bool = False, trusted: bool = False, lazy: bool = False):
+    """Zero-argument calls that load ``path`` through each JSON loader, keyed by name."""
+    return {
+        'from_json': lambda: IndoorSpace.from_json(open(path, encoding='utf-8').read(), lazy, strict, trusted),
+        'deserialization': lambda: deserialization(path, lazy=lazy, strict=strict, trusted=trusted),
+        'streaming': lambda: deserialization(path, streaming=True, lazy=lazy, strict=strict, trusted=trusted),
+        'async': lambda: asyncio.run(async_deserialization(path, lazy=lazy, strict=strict, trusted=trusted)),
+    }
+
+
+LOADERS = ['from_json', 'deserialization', 'streaming', 'async']
+
+
+def test_registry(poi_section):
+    assert registered_sections() == {'pois': poi_section}
+    assert FEATURE_TYPES['pois'] is poi_section
+    for key in ('properties', 'cells', 'rlineses'):
+        with pytest.raises(ValueError):
+            register_section(key, poi_section)
+        with pytest.raises(ValueError):
+            unregister_section(key)
+    unregister_section('pois')
+    assert registered_sections() == {}
+    assert 'cells' in FEATURE_TYPES
+    with pytest.raises(ValueError):
+        unregister_section('pois')
+
+
+@pytest.mark.parametrize('loader', LOADERS)
+def test_registered_sections_are_decoded(tmp_path, poi_section, loader):
+    document = example_document()
+    document['pois'] = [{'id': 'entrance'}, {'id': 'lift'}]
+    path = str(tmp_path / 'pois.json')
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(document, file)
+    space = load_json(path, strict=True)[loader]()
+    assert [type(poi) for poi in space.get_section('pois')] == [poi_section, poi_section]
+    assert space.to_json() == dict(deserialization(EXAMPLE).to_json(), pois=document['pois'])
+
+
+@pytest.mark.parametrize('loader', LOADERS)
+@pytest.mark.parametrize('unknown', [[], [{'id': 1}], {'a': 1}, 'text'])
+def test_strict_rejects_unknown_sections(tmp_path, loader, unknown):
+    document = example_document()
+    document['foo'] = unknown
+    path = str(tmp_path / 'foo.json')
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(document, file)
+    assert load_json(path)[loader]().to_json() == deserialization(EXAMPLE).to_json()
+    with pytest.raises(ValueError, match='foo'):
+        load_json(path, strict=True)[loader]()
+
+
+def test_strict_rejects_unknown_sections_in_bulk_loads(tmp_path):
+    document = example_document()
+    document['foo'] = []
+    paths = [str(tmp_path / 'a.json'), str(tmp_path / 'b.json')]
+    for path in paths:
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(document, file)
+    for results in (load_buildings(paths, processes=2, strict=True),
+                    load_buildings(paths, processes=1, streaming=True, strict=True),
+                    asyncio.run(async_load_buildings(paths, strict=True))):
+        assert [result.error.split(':')[0] for result in results.values()] == ['ValueError', 'ValueError']
+    assert all(result.ok for result in load_buildings(paths, processes=2).values())
+
+
+@pytest.mark.parametrize('loader', LOADERS)
+@pytest.mark.parametrize('lazy', [False, True])
+def test_trusted_skips_type_checks(tmp_path, loader, lazy):
+    document = example_document()
+    document['cells'][0]['properties'] = ['not', 'a', 'dict']
+    path = str(tmp_path / 'untyped.json')
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(document, file)
+    with pytest.raises(TypeError):
+        load_json(path, lazy=lazy)[loader]()
+    space = load_json(path, trusted=True, lazy=lazy)[loader]()
+    assert space.cells[0].properties == ['not', 'a', 'dict']
+    assert space.to_json()['cells'][1:] == deserialization(EXAMPLE).to_json()['cells'][1:]
+
+
+def test_trusted_loads_match_checked_loads(tmp_path, unusual_space):
+    for name in ('out.json', 'out.ij3b'):
+        path = str(tmp_path / name)
+        serialization(path, unusual_space)
+        trusted = deserialization(path, trusted=True)
+        assert trusted.to_json() == deserialization(path).to_json()
+        assert trusted.get_hypergraph() == unusual_space.get_hypergraph()
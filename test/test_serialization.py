@@ -0,0 +1,87 @@
+"""
+File Name: test_serialization.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import gzip
+import io
+import json
+import os
+import pytest
+
+from indoorjson3 import IndoorSpace, deserialization, iter_deserialization, serialization
+
+EXAMPLE = os.path.join(os.path.dirname(__file__), 'example.json')
+
+
+def previous_text(space: IndoorSpace) -> str:
+    """What serialization() wrote before it streamed: one json.dumps of the whole document."""
+    return json.dumps(space.to_json(), indent=4, ensure_ascii=False)
+
+
+@pytest.fixture
+def empty_space() -> IndoorSpace:
+    return IndoorSpace()
+
+
+@pytest.mark.parametrize('fixture', ['example_space', 'unusual_space', 'empty_space'])
+def test_output_matches_previous_text(tmp_path, request, fixture):
+    space = request.getfixturevalue(fixture)
+    path = str(tmp_path / 'out.json')
+    serialization(path, space)
+    with open(path, encoding='utf-8') as file:
+        assert file.read() == previous_text(space)
+
+    stream = io.StringIO()
+    serialization(stream, space)
+    assert stream.getvalue() == previous_text(space)
+
+    serialization(path + '.gz', space)
+    with gzip.open(path + '.gz', 'rt', encoding='utf-8') as file:
+        assert file.read() == previous_text(space)
+
+
+@pytest.mark.parametrize('indent', [None, 2])
+def test_other_indents_round_trip(tmp_path, unusual_space, indent):
+    space = unusual_space
+    path = str(tmp_path / 'out.json')
+    serialization(path, space, indent=indent)
+    with open(path, encoding='utf-8') as file:
+        text = file.read()
+    if indent is None:
+        assert text == json.dumps(space.to_json(), ensure_ascii=False, separators=(',', ':'))
+    else:
+        assert text == json.dumps(space.to_json(), indent=indent, ensure_ascii=False)
+    assert deserialization(path).to_json() == space.to_json()
+
+
+def test_extension_sections_are_written(tmp_path, poi_section):
+    document = json.load(open(EXAMPLE, encoding='utf-8'))
+    document['pois'] = [{'id': 'entrance', 'cell': document['cells'][0]['$id']}]
+    space = IndoorSpace.from_json(json.dumps(document))
+    path = str(tmp_path / 'out.json')
+    serialization(path, space)
+    with open(path, encoding='utf-8') as file:
+        assert file.read() == previous_text(space)
+    assert json.load(open(path, encoding='utf-8'))['pois'] == document['pois']
+
+
+@pytest.mark.parametrize('name', ['out.json', 'out.json.gz', 'out.ij3b'])
+def test_path_objects_are_accepted(tmp_path, unusual_space, name):
+    space = unusual_space
+    path = tmp_path / name
+    serialization(path, space)
+    assert path.is_file()
+    assert deserialization(path).to_json() == space.to_json()
+    if not name.endswith('.ij3b'):
+        assert deserialization(path, streaming=True).to_json() == space.to_json()
+        assert [f.id for f in iter_deserialization(path)] == ['a', 'b', 'a>b', 'b>a']
+
+
+def test_unknown_format_is_rejected(tmp_path, unusual_space):
+    with pytest.raises(ValueError):
+        serialization(str(tmp_path / 'out.json'), unusual_space, fmt='xml')
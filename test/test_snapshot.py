@@ -0,0 +1,74 @@
+"""
+File Name: test_snapshot.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import os
+import numpy as np
+import pytest
+
+from indoorjson3 import (SNAPSHOT_MAGIC, dump_snapshot, load_snapshot, read_container, serialization,
+                         write_container)
+
+
+@pytest.mark.parametrize('fixture', ['example_space', 'unusual_space'])
+def test_snapshot_answers_like_its_source(tmp_path, request, fixture):
+    space = request.getfixturevalue(fixture)
+    path = tmp_path / 'building.ij3s'
+    dump_snapshot(path, space)
+    snapshot = load_snapshot(path)
+
+    assert snapshot.to_json() == space.to_json()
+    assert snapshot.to_indoorspace(lazy=True).to_json() == space.to_json()
+    assert snapshot.get_hypergraph() == space.get_hypergraph()
+    assert snapshot.get_incident_matrix(dense=True).tolist() == space.get_incident_matrix(dense=True).tolist()
+    assert snapshot.get_hypergraph_incidence_matrix(dense=True).tolist() == \
+        space.get_hypergraph_incidence_matrix(dense=True).tolist()
+    for actual, expected in zip(snapshot.get_connection_endpoints(), space.get_connection_endpoints()):
+        assert actual.tolist() == expected.tolist()
+
+    ids = [cell.id for cell in space.cells]
+    assert [cell.id for cell in snapshot.cells] == ids
+    for i, cell_id in enumerate(ids):
+        assert snapshot.get_cell_index(cell_id) == i
+        assert snapshot.get_cell_from_id(cell_id).to_json() == space.get_cell_from_id(cell_id).to_json()
+    assert snapshot.get_cell_from_id('missing') is None
+    for directed in (True, False):
+        for source in ids:
+            for target in ids:
+                assert snapshot.shortest_path(source, target, directed=directed) == \
+                    space.shortest_path(source, target, directed=directed)
+    points = np.random.default_rng(0).uniform(-5, 20, size=(100, 2))
+    assert [c and c.id for c in snapshot.locate_cells(points)] == [c and c.id for c in space.locate_cells(points)]
+
+
+def test_snapshot_older_than_its_source_is_rejected(tmp_path, unusual_space):
+    source, path = tmp_path / 'building.json', tmp_path / 'building.ij3s'
+    serialization(source, unusual_space)
+    dump_snapshot(path, unusual_space)
+    os.utime(source, (1_000_000, 1_000_000))
+    os.utime(path, (2_000_000, 2_000_000))
+    assert load_snapshot(path, source=source).to_json() == unusual_space.to_json()
+
+    os.utime(source, (3_000_000, 3_000_000))
+    with pytest.raises(ValueError):
+        load_snapshot(path, source=source)
+
+
+def test_snapshot_without_derived_sections_is_rejected(tmp_path, unusual_space):
+    path = tmp_path / 'building.ij3s'
+    dump_snapshot(path, unusual_space)
+    sections = dict(read_container(path.read_bytes(), SNAPSHOT_MAGIC))
+    del sections['routing.edges']
+    with open(path, 'wb') as file:
+        write_container(file, sections, SNAPSHOT_MAGIC)
+    with pytest.raises(ValueError):
+        load_snapshot(path)
+
+    serialization(path, unusual_space, fmt='binary')
+    with pytest.raises(ValueError):
+        load_snapshot(path)
@@ -0,0 +1,79 @@
+"""
+File Name: test_spatial.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import numpy as np
+import pytest
+from shapely.geometry import LineString, Point, box
+
+from indoorjson3 import Cell, Connection, IndoorSpace
+
+
+def scattered_space(seed: int) -> IndoorSpace:
+    """Overlapping rooms of random size, and a door between each pair of consecutive rooms."""
+    rng = np.random.default_rng(seed)
+    space = IndoorSpace()
+    for i, (x, y, w, h) in enumerate(zip(*rng.uniform(0, 10, (2, 40)), *rng.uniform(0.5, 3, (2, 40)))):
+        space.add_cell(Cell(f'c{i}', {}, box(x, y, x + w, y + h), Point(x + w / 2, y + h / 2)))
+    for i in range(39):
+        a, b = space.cells[i].node, space.cells[i + 1].node
+        space.add_connection(Connection(f'd{i}', {}, f'c{i}', f'c{i + 1}', LineString([a, (a.x, a.y + 0.2)]),
+                                        LineString([a, b])))
+    return space
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_locate_cells_matches_brute_force(seed):
+    space = scattered_space(seed)
+    points = np.random.default_rng(seed + 100).uniform(-1, 14, size=(300, 2))
+    expected = [next((cell for cell in space.cells if cell.space.intersects(Point(p))), None) for p in points]
+    assert space.locate_cells(points) == expected
+    assert space.locate_cell(*points[0]) is expected[0]
+    assert space.get_spatial_index().locate_points(np.empty((0, 2))).tolist() == []
+
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('target', ['cells', 'connections'])
+def test_nearest_matches_brute_force(seed, target):
+    space = scattered_space(seed)
+    features = space.cells if target == 'cells' else space.connections
+    geometries = [f.space if target == 'cells' else f.bound for f in features]
+    points = np.random.default_rng(seed + 200).uniform(-5, 18, size=(200, 2))
+    positions, distances = space.get_spatial_index().nearest(points, target)
+    for point, position, distance in zip(points, positions, distances):
+        brute = [geometry.distance(Point(point)) for geometry in geometries]
+        assert distance == pytest.approx(min(brute))
+        assert brute[position] == pytest.approx(distance)
+
+    positions, distances = space.get_spatial_index().nearest(points, target, max_distance=0.5)
+    for point, position, distance in zip(points, positions, distances):
+        nearest = min(geometry.distance(Point(point)) for geometry in geometries)
+        if nearest <= 0.5:
+            assert distance == pytest.approx(nearest)
+        else:
+            assert (position, distance) == (-1, np.inf)
+
+
+def test_intersects_bbox_matches_brute_force():
+    space = scattered_space(0)
+    bboxes = np.array([[0, 0, 2, 2], [4, 4, 4.5, 9], [20, 20, 21, 21]])
+    pairs = space.get_spatial_index().intersects_bbox(bboxes)
+    found = {(int(i), int(j)) for i, j in zip(*pairs)}
+    assert found == {(i, j) for i, bbox in enumerate(bboxes) for j, cell in enumerate(space.cells)
+                     if cell.space.intersects(box(*bbox))}
+    with pytest.raises(ValueError):
+        space.get_spatial_index().tree('layers')
+
+
+def test_index_follows_edits():
+    space = scattered_space(1)
+    assert space.locate_cell(50, 50) is None
+    space.add_cell(Cell('far', {}, box(49, 49, 51, 51), Point(50, 50)))
+    assert space.locate_cell(50, 50).id == 'far'
+    space.remove_cell('far')
+    assert space.locate_cell(50, 50) is None
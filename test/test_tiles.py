@@ -0,0 +1,88 @@
+"""
+File Name: test_tiles.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import json
+import os
+import pytest
+from shapely.geometry import LineString, Point, box
+
+from indoorjson3 import Cell, Connection, IndoorSpace, export_tiles
+
+
+def grid_space() -> IndoorSpace:
+    """10 x 10 rooms of 0.9 with a door to the east, and three tiny rooms, two in one zoom 0 pixel."""
+    space = IndoorSpace()
+    for i in range(100):
+        x, y = 0.05 + i % 10, 0.05 + i // 10
+        space.add_cell(Cell(f'r{i}', {}, box(x, y, x + 0.9, y + 0.9), Point(x + 0.45, y + 0.45)))
+    for i, (x, y) in enumerate([(0.21, 0.2), (0.22, 0.2), (0.6, 0.6)]):
+        space.add_cell(Cell(f't{i}', {}, box(x, y, x + 0.005, y + 0.005), Point(x, y)))
+    for i in range(100):
+        if i % 10 < 9:
+            a, b = space.cells[i].node, space.cells[i + 1].node
+            space.add_connection(Connection(f'd{i}', {}, f'r{i}', f'r{i + 1}', LineString([(a.x + 0.5, a.y),
+                                            (a.x + 0.5, a.y + 0.1)]), LineString([a, b])))
+    return space
+
+
+def written_files(directory) -> set:
+    return {os.path.relpath(os.path.join(root, name), directory)
+            for root, _, names in os.walk(directory) for name in names}
+
+
+def in_tile(bounds, metadata, zoom, x, y) -> bool:
+    size = metadata['extent'] / (1 << zoom)
+    left, bottom = metadata['origin'][0] + x * size, metadata['origin'][1] + y * size
+    return box(*bounds).intersects(box(left, bottom, left + size, bottom + size))
+
+
+def test_written_tiles_match_the_metadata(tmp_path):
+    space = grid_space()
+    metadata = export_tiles(space, str(tmp_path), max_zoom=2)
+    with open(tmp_path / 'tiles.json', encoding='utf-8') as file:
+        assert json.load(file) == json.loads(json.dumps(metadata))
+    assert metadata['tiles'] == {0: [[0, 0]], 1: [[0, 0], [0, 1], [1, 0], [1, 1]],
+                                 2: [[x, y] for x in range(4) for y in range(4)]}
+    expected = {'index.html', 'tiles.json'} | {os.path.join('tiles', str(zoom), str(x), f'{y}.json')
+                                               for zoom, keys in metadata['tiles'].items() for x, y in keys}
+    assert written_files(tmp_path) == expected
+
+
+def test_tiles_hold_the_features_they_cover(tmp_path):
+    space = grid_space()
+    metadata = export_tiles(space, str(tmp_path), max_zoom=2)
+
+    def tile(zoom, x, y):
+        with open(tmp_path / 'tiles' / str(zoom) / str(x) / f'{y}.json', encoding='utf-8') as file:
+            return json.load(file)
+
+    shown = set()
+    for x, y in metadata['tiles'][2]:
+        content = tile(2, x, y)
+        assert set(content['cells']['ids']) == {cell.id for cell in space.cells
+                                                 if in_tile(cell.space.bounds, metadata, 2, x, y)}
+        assert set(content['edges']['ids']) == {c.id for c in space.connections
+                                                 if in_tile(c.edge.bounds, metadata, 2, x, y)}
+        assert content['dots'] == []
+        shown.update(content['cells']['ids'])
+    assert shown == {cell.id for cell in space.cells}
+
+    # A pixel at zoom 0 is extent / 256, much larger than the tiny rooms: they turn into dots.
+    coarse = tile(0, 0, 0)
+    assert set(coarse['cells']['ids']) == {f'r{i}' for i in range(100)}
+    assert len(coarse['dots']) == 2 * 2
+    assert all(len(ring) >= 8 for ring in coarse['cells']['rings'])
+
+
+def test_default_levels_follow_tile_features(tmp_path):
+    space = grid_space()
+    assert export_tiles(space, str(tmp_path / 'a'))['max_zoom'] == 0
+    assert export_tiles(space, str(tmp_path / 'b'), tile_features=10)['max_zoom'] == 2
+    with pytest.raises(ValueError):
+        export_tiles(IndoorSpace(), str(tmp_path / 'c'))
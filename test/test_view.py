@@ -0,0 +1,125 @@
+"""
+File Name: test_view.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import random
+import numpy as np
+import pytest
+from shapely.geometry import LineString, Point, box
+
+from indoorjson3 import Cell, Connection, IndoorSpace, Layer, Rlines
+
+
+def make_connection(connection_id: str, source: Cell, target: Cell, cost: float) -> Connection:
+    middle = ((source.node.x + target.node.x) / 2, (source.node.y + target.node.y) / 2)
+    return Connection(connection_id, {'cost': cost}, source.id, target.id,
+                      LineString([middle, (middle[0] + 0.1, middle[1] + 0.1)]), LineString([source.node, target.node]))
+
+
+def layered_space(seed: int) -> IndoorSpace:
+    """A 4x4 grid of rooms with random doors; 'even' holds the rooms of even index, plus some closures."""
+    rng = random.Random(seed)
+    space = IndoorSpace()
+    for i in range(16):
+        x, y = 2 * (i % 4), 2 * (i // 4)
+        space.add_cell(Cell(f'c{i}', {}, box(x, y, x + 2, y + 2), Point(x + 1, y + 1)))
+    for j in range(60):
+        source, target = rng.sample(space.cells, 2)
+        space.add_connection(make_connection(f'd{j}', source, target, rng.uniform(1, 5)))
+    space.set_layers(Layer('even', [f'c{i}' for i in range(0, 16, 2)]))
+    space.set_layers(Layer('all', [cell.id for cell in space.cells]))
+    for cell in space.cells:
+        ins = [c.id for c in space.connections if c.target == cell.id]
+        outs = [c.id for c in space.connections if c.source == cell.id]
+        space.set_rlineses(Rlines(f'r-{cell.id}', cell.id, ins, outs,
+                                  [[i, o] for i in ins for o in outs if rng.random() < 0.3]))
+    return space
+
+
+def assert_same_answers(view, space: IndoorSpace):
+    """``view`` answers every read query as the standalone ``space`` holding the same features."""
+    ids = [cell.id for cell in space.cells]
+    door_ids = [connection.id for connection in space.connections]
+    assert [cell.id for cell in view.cells] == ids
+    assert [connection.id for connection in view.connections] == door_ids
+    assert view.get_incident_matrix(dense=True).tolist() == space.get_incident_matrix(dense=True).tolist()
+    for weight in (None, 'cost'):
+        for directed in (True, False):
+            assert np.array_equal(view.get_distance_matrix(weight=weight, directed=directed, processes=1),
+                                  space.get_distance_matrix(weight=weight, directed=directed, processes=1))
+            for source in ids:
+                assert view.shortest_distances(source, weight=weight, directed=directed) == \
+                    space.shortest_distances(source, weight=weight, directed=directed)
+                assert view.shortest_distances(source, ids[::-1], weight, directed) == \
+                    space.shortest_distances(source, ids[::-1], weight, directed)
+                assert view.nearest_reachable_cells(source, 3, weight, directed) == \
+                    space.nearest_reachable_cells(source, 3, weight, directed)
+                for target in ids:
+                    assert view.shortest_path(source, target, weight, directed) == \
+                        space.shortest_path(source, target, weight, directed)
+        for source in ids:
+            for target in ids:
+                assert view.shortest_rlines_path(source, target, weight) == \
+                    space.shortest_rlines_path(source, target, weight)
+        for source in door_ids[:5]:
+            for target in door_ids:
+                assert view.shortest_door_path(source, target, weight) == \
+                    space.shortest_door_path(source, target, weight)
+    points = np.random.default_rng(0).uniform(-1, 9, size=(200, 2))
+    assert [c and c.id for c in view.locate_cells(points)] == [c and c.id for c in space.locate_cells(points)]
+
+
+def standalone(view) -> IndoorSpace:
+    """The view's features in a new IndoorSpace, with closures trimmed to the view's connections."""
+    members = {connection.id for connection in view.connections}
+    space = IndoorSpace.from_features(view.properties, list(view.cells), list(view.connections), view.layers, [])
+    for rlines in view.rlineses:
+        space.set_rlineses(Rlines(rlines.id, rlines.cell, rlines.ins, rlines.outs,
+                                  [pair for pair in rlines.closure if pair[0] in members and pair[1] in members]))
+    return space
+
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('layer_id', ['even', 'all'])
+def test_view_answers_like_a_standalone_space(seed, layer_id):
+    view = layered_space(seed).get_layer_view(layer_id)
+    assert_same_answers(view, standalone(view))
+
+
+def test_view_follows_parent_edits():
+    space = layered_space(1)
+    view = space.get_layer_view('even')
+    assert_same_answers(view, standalone(view))
+    before = len(view.connections)
+
+    c0, c2 = space.get_cell_from_id('c0'), space.get_cell_from_id('c2')
+    space.add_connection(make_connection('new', c0, c2, 0.5))
+    assert len(view.connections) == before + 1
+    assert view.shortest_path('c0', 'c2', 'cost') == (0.5, ['c0', 'c2'])
+    assert_same_answers(view, standalone(view))
+
+    space.set_rlineses(Rlines('r-new', 'c2', ['new'], [c.id for c in view.connections if c.source == 'c2'],
+                              [['new', c.id] for c in view.connections if c.source == 'c2']))
+    assert_same_answers(view, standalone(view))
+    space.remove_rlines('r-new')
+    assert_same_answers(view, standalone(view))
+
+    space.remove_connection('new')
+    assert len(view.connections) == before
+    space.get_layer('even').cells.append('c16')
+    space.add_cell(Cell('c16', {}, box(8, 0, 10, 2), Point(9, 1)))
+    space.add_connection(make_connection('to16', c0, space.get_cell_from_id('c16'), 1.0))
+    assert view.get_cell_index('c16') == len(view.cells) - 1
+    assert view.locate_cell(9, 1).id == 'c16'
+    assert view.shortest_distances('c0', ['c16'], 'cost') == {'c16': 1.0}
+    assert_same_answers(view, standalone(view))
+
+    odd = [cell.id for cell in space.cells if cell.id not in space.get_layer('even').cells]
+    assert view.get_cell_from_id(odd[0]) is None
+    with pytest.raises(KeyError):
+        view.get_cell_index(odd[0])
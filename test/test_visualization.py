@@ -0,0 +1,74 @@
+"""
+File Name: test_visualization.py
+
+Copyright (c) 2023 - 2026 IndoorJson
+
+Author: agent <agent@local>
+Create Date: 2026/10/18
+"""
+
+import numpy as np
+import plotly.graph_objs as go
+import pytest
+import shapely
+
+import indoorjson3.visualization
+from indoorjson3 import graph_figure, graph_visualize, hypergraph_figure, hypergraph_visualize
+
+
+def gaps(trace) -> int:
+    return int(np.isnan(np.asarray(trace.x, dtype=float)).sum())
+
+
+def expected_rlines(space):
+    """(in connection, out connection) pairs drawn as rlines, found from the connections directly."""
+    closures = {rlines.cell: {tuple(pair) for pair in rlines.closure} for rlines in reversed(space.rlineses)}
+    pairs = []
+    for cell in space.cells:
+        ins = [c.id for c in space.connections if c.target == cell.id]
+        outs = [c.id for c in space.connections if c.source == cell.id and c.target != cell.id]
+        pairs.extend((i, o) for i in ins for o in outs if (i, o) not in closures.get(cell.id, set()))
+    return pairs
+
+
+@pytest.mark.parametrize('fixture', ['example_space', 'unusual_space'])
+@pytest.mark.parametrize('webgl', [False, True])
+def test_graph_figure_has_one_trace_per_kind(request, fixture, webgl):
+    space = request.getfixturevalue(fixture)
+    fig = graph_figure(space, webgl)
+    kind = go.Scattergl if webgl else go.Scatter
+    assert [type(trace) for trace in fig.data] == [kind] * 4
+    assert [trace.name for trace in fig.data] == ['Space', 'Cell', 'Boundary', 'Edge']
+    spaces, nodes, bounds, edges = fig.data
+    assert gaps(spaces) == len(space.cells)
+    assert len(spaces.x) == len(space.cells) + sum(len(cell.space.exterior.coords) for cell in space.cells)
+    assert list(nodes.x) == [cell.node.x for cell in space.cells]
+    assert list(nodes.text) == [str(cell.properties) for cell in space.cells]
+    assert gaps(bounds) == gaps(edges) == len(space.connections)
+    assert len(edges.x) == len(space.connections) + sum(len(c.edge.coords) for c in space.connections)
+
+
+@pytest.mark.parametrize('fixture', ['example_space', 'unusual_space'])
+def test_hypergraph_figure_draws_every_rline(request, fixture):
+    space = request.getfixturevalue(fixture)
+    groups, rlines, points = hypergraph_figure(space).data
+    assert [groups.name, rlines.name, points.name] == ['Rline Group', 'Rline', 'Connection Point']
+    assert gaps(groups) == len(space.cells)
+
+    centroids = {c.id: shapely.centroid(c.bound).coords[0] for c in space.connections}
+    pairs = expected_rlines(space)
+    segments = np.column_stack([rlines.x, rlines.y]).reshape(-1, 3, 2)
+    assert len(segments) == len(pairs)
+    assert np.isnan(segments[:, 2]).all()
+    for segment, (ins, outs) in zip(segments, pairs):
+        assert segment[:2].tolist() == [list(centroids[ins]), list(centroids[outs])]
+    assert list(zip(points.x, points.y)) == [centroids[c.id] for c in space.connections]
+
+
+def test_visualize_writes_the_figure(monkeypatch, example_space):
+    written = []
+    monkeypatch.setattr(indoorjson3.visualization, 'plot', lambda fig, filename: written.append((fig, filename)))
+    graph_visualize(example_space, 'g.html')
+    hypergraph_visualize(example_space, 'h.html', webgl=True)
+    assert [(len(fig.data), filename) for fig, filename in written] == [(4, 'g.html'), (3, 'h.html')]
+    assert isinstance(written[1][0].data[0], go.Scattergl)